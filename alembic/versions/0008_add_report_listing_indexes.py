@@ -0,0 +1,35 @@
+"""add composite indexes for report listing and history queries
+
+Revision ID: 0008_report_listing_indexes
+Revises: 0007_merge_heads
+Create Date: 2026-10-17
+"""
+from __future__ import annotations
+
+from alembic import op
+
+revision = "0008_report_listing_indexes"
+down_revision = "0007_merge_heads"
+branch_labels = None
+depends_on = None
+
+# Column order follows the WHERE/ORDER BY of the repository queries; id is the keyset tiebreaker.
+INDEXES = [
+    ("ix_reports_site_id_report_date_created_at", "reports", ["site_id", "report_date", "created_at", "id"]),
+    ("ix_reports_user_id_created_at", "reports", ["user_id", "created_at", "id"]),
+    ("ix_reports_created_at_id", "reports", ["created_at", "id"]),
+    ("ix_report_work_items_work_type_id_report_id", "report_work_items", ["work_type_id", "report_id"]),
+]
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block.
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,49 @@
+"""add per-site report summary table
+
+Revision ID: 0009_site_report_stats
+Revises: 0008_report_listing_indexes
+Create Date: 2026-10-17
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0009_site_report_stats"
+down_revision = "0008_report_listing_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "site_report_stats",
+        sa.Column(
+            "site_id",
+            sa.String(length=64),
+            sa.ForeignKey("sites.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("last_report_date", sa.Date(), nullable=True),
+        sa.Column("recent_report_dates", postgresql.ARRAY(sa.Date()), nullable=False, server_default="{}"),
+    )
+
+    op.execute(
+        """
+        INSERT INTO site_report_stats (site_id, last_report_date, recent_report_dates)
+        SELECT site_id, MAX(report_date), ARRAY_AGG(report_date ORDER BY report_date DESC)
+        FROM (
+            SELECT site_id, report_date,
+                   ROW_NUMBER() OVER (PARTITION BY site_id ORDER BY report_date DESC) AS row_num
+            FROM reports
+            WHERE site_id IS NOT NULL
+        ) ranked
+        WHERE row_num <= 7
+        GROUP BY site_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("site_report_stats")
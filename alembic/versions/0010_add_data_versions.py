@@ -0,0 +1,43 @@
+"""add data versions for conditional GETs
+
+Revision ID: 0010_data_versions
+Revises: 0009_site_report_stats
+Create Date: 2026-10-17
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0010_data_versions"
+down_revision = "0009_site_report_stats"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE SEQUENCE data_version_seq")
+    op.create_table(
+        "data_versions",
+        sa.Column("scope", sa.String(length=64), primary_key=True),
+        sa.Column("version", sa.BigInteger(), nullable=False),
+    )
+    op.execute(
+        """
+        INSERT INTO data_versions (scope, version)
+        SELECT scope, nextval('data_version_seq')
+        FROM (VALUES ('work_types'), ('sites'), ('users')) AS scopes (scope)
+        """
+    )
+
+    op.add_column(
+        "site_report_stats",
+        sa.Column("version", sa.BigInteger(), nullable=False, server_default="0"),
+    )
+    op.execute("UPDATE site_report_stats SET version = nextval('data_version_seq')")
+
+
+def downgrade() -> None:
+    op.drop_column("site_report_stats", "version")
+    op.drop_table("data_versions")
+    op.execute("DROP SEQUENCE data_version_seq")
@@ -0,0 +1,32 @@
+"""add resized photo variants to reports
+
+Revision ID: 0011_report_photo_variants
+Revises: 0010_data_versions
+Create Date: 2026-10-17
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0011_report_photo_variants"
+down_revision = "0010_data_versions"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "reports",
+        sa.Column(
+            "photo_variants",
+            postgresql.JSONB(astext_type=sa.Text()),
+            nullable=False,
+            server_default=sa.text("'{}'::jsonb"),
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("reports", "photo_variants")
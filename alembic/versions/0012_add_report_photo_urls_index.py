@@ -0,0 +1,32 @@
+"""add GIN index on report photo URLs for shared-photo reference checks
+
+Revision ID: 0012_report_photo_urls_index
+Revises: 0011_report_photo_variants
+Create Date: 2026-10-17
+"""
+from __future__ import annotations
+
+from alembic import op
+
+revision = "0012_report_photo_urls_index"
+down_revision = "0011_report_photo_variants"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_reports_photo_urls",
+            "reports",
+            ["photo_urls"],
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_reports_photo_urls", table_name="reports", postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,220 @@
+"""Brotli and gzip compression of JSON and other text responses."""
+from __future__ import annotations
+
+import gzip
+import zlib
+from typing import Callable, List
+
+import anyio
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # Brotli is optional: without it only gzip is offered.
+    brotli = None
+
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/")
+# Nothing to gain (no body) or not allowed (a range of the identity bytes).
+UNCOMPRESSED_STATUSES = {204, 206, 304}
+
+
+def skip_compression(endpoint: Callable) -> Callable:
+    """Send this route's responses as they are, e.g. already compressed files or byte ranges."""
+
+    endpoint.skip_compression = True
+    return endpoint
+
+
+def choose_encoding(accept_encoding: str) -> str | None:
+    """``br`` or ``gzip`` from an ``Accept-Encoding`` header; Brotli wins when both are accepted."""
+
+    accepted = set()
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        quality = params.strip().removeprefix("q=")
+        try:
+            if params and float(quality) <= 0:
+                continue
+        except ValueError:
+            continue
+        accepted.add(name.strip())
+    if brotli is not None and ({"br", "*"} & accepted):
+        return "br"
+    if {"gzip", "*"} & accepted:
+        return "gzip"
+    return None
+
+
+def compress_body(data: bytes, encoding: str, *, gzip_level: int, brotli_quality: int) -> bytes:
+    if encoding == "br":
+        return brotli.compress(data, quality=brotli_quality)
+    return gzip.compress(data, compresslevel=gzip_level, mtime=0)
+
+
+class CompressionMiddleware:
+    """Compresses text responses the client accepts in ``br`` or ``gzip``.
+
+    Whole bodies below ``minimum_size`` go out as they are; bodies of at least
+    ``offload_size`` are compressed in a worker thread so a large history page
+    does not stall the event loop. Streamed bodies (NDJSON) are compressed chunk
+    by chunk and flushed after each one, so rows still reach the client as they
+    are read. Routes marked with ``skip_compression`` are never touched.
+
+    Every text response, and every 304, is one representation of a resource
+    negotiated on ``Accept-Encoding``, so all of them carry ``Vary: Accept-Encoding``
+    whether or not this one was compressed. Once the client negotiated an
+    encoding, their ``ETag`` is weak, so a 304 and the 200 it stands for share
+    one validator.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        offload_size: int = 64 * 1024,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.offload_size = offload_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        await self.app(scope, receive, _CompressingSend(self, scope, send, encoding))
+
+
+class _CompressingSend:
+    """The ``send`` of one response: decides on its first body message, then compresses or passes through."""
+
+    def __init__(self, middleware: CompressionMiddleware, scope: Scope, send: Send, encoding: str | None) -> None:
+        self._middleware = middleware
+        self._scope = scope
+        self._send = send
+        self._encoding = encoding
+        self._start: Message | None = None
+        self._compress_chunk: Callable[[bytes, bool], bytes] | None = None
+        self._decided = False
+
+    async def __call__(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self._start = message
+            return
+        if self._decided:
+            await self._send_body(message)
+            return
+
+        self._decided = True
+        if message["type"] != "http.response.body" or not self._compressible():
+            await self._pass_through(message)
+            return
+
+        body = message.get("body", b"")
+        if not message.get("more_body", False):
+            await self._send_whole(body)
+            return
+        self._compress_chunk = self._stream_compressor()
+        headers = self._encoded_headers()
+        del headers["content-length"]
+        await self._send(self._start)
+        await self._send_body(message)
+
+    def _negotiated(self) -> bool:
+        """Whether the response is a representation that varies with ``Accept-Encoding``."""
+
+        if getattr(self._scope.get("endpoint"), "skip_compression", False):
+            return False
+        if self._start["status"] == 304:
+            return True
+        headers = Headers(raw=self._start["headers"])
+        return "content-encoding" not in headers and headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES)
+
+    def _compressible(self) -> bool:
+        return (
+            self._encoding is not None
+            and self._start["status"] >= 200
+            and self._start["status"] not in UNCOMPRESSED_STATUSES
+            and self._negotiated()
+        )
+
+    async def _pass_through(self, message: Message) -> None:
+        self._compress_chunk = None
+        if self._negotiated():
+            self._mark_negotiated(MutableHeaders(scope=self._start))
+        await self._send(self._start)
+        await self._send(message)
+
+    async def _send_whole(self, body: bytes) -> None:
+        middleware = self._middleware
+        if len(body) < middleware.minimum_size:
+            await self._pass_through({"type": "http.response.body", "body": body})
+            return
+
+        def compress() -> bytes:
+            return compress_body(
+                body,
+                self._encoding,
+                gzip_level=middleware.gzip_level,
+                brotli_quality=middleware.brotli_quality,
+            )
+
+        if len(body) >= middleware.offload_size:
+            compressed = await anyio.to_thread.run_sync(compress)
+        else:
+            compressed = compress()
+        headers = self._encoded_headers()
+        headers["content-length"] = str(len(compressed))
+        await self._send(self._start)
+        await self._send({"type": "http.response.body", "body": compressed})
+
+    async def _send_body(self, message: Message) -> None:
+        if self._compress_chunk is None or message["type"] != "http.response.body":
+            await self._send(message)
+            return
+        more_body = message.get("more_body", False)
+        chunk = self._compress_chunk(message.get("body", b""), more_body)
+        if chunk or not more_body:
+            await self._send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+    def _encoded_headers(self) -> MutableHeaders:
+        headers = MutableHeaders(scope=self._start)
+        headers["content-encoding"] = self._encoding
+        self._mark_negotiated(headers)
+        return headers
+
+    def _mark_negotiated(self, headers: MutableHeaders) -> None:
+        headers.add_vary_header("Accept-Encoding")
+        if self._encoding is None:
+            return
+        # The encoded bytes differ from the identity ones; a weak validator still revalidates
+        # (If-None-Match uses weak comparison) without claiming byte equality. Identity bodies
+        # below ``minimum_size`` and 304s get it too, so the validator does not depend on size.
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["etag"] = f"W/{etag}"
+
+    def _stream_compressor(self) -> Callable[[bytes, bool], bytes]:
+        if self._encoding == "br":
+            compressor = brotli.Compressor(quality=self._middleware.brotli_quality)
+
+            def compress_br(data: bytes, more_body: bool) -> bytes:
+                parts: List[bytes] = [compressor.process(data)] if data else []
+                parts.append(compressor.flush() if more_body else compressor.finish())
+                return b"".join(parts)
+
+            return compress_br
+
+        compressor = zlib.compressobj(self._middleware.gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+        def compress_gzip(data: bytes, more_body: bool) -> bytes:
+            # A sync flush after every chunk: the client can decode each row as it arrives.
+            return compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH if more_body else zlib.Z_FINISH)
+
+        return compress_gzip
@@ -0,0 +1,36 @@
+"""HTTP helpers for conditional GETs validated by data versions."""
+from __future__ import annotations
+
+import hashlib
+
+from fastapi import Request, Response, status
+
+ETAG_HEADER = "ETag"
+
+# Shared catalogue: any cache may keep it for a few minutes.
+PUBLIC_CATALOGUE = "public, max-age=300"
+# Per-user data: browsers may store it but must revalidate with If-None-Match every time.
+PRIVATE_REVALIDATE = "private, no-cache"
+
+
+def make_etag(*parts: object) -> str:
+    """Strong validator from the data versions (and request parameters) a response depends on."""
+
+    digest = hashlib.blake2b(":".join(map(str, parts)).encode(), digest_size=12).hexdigest()
+    return f'"{digest}"'
+
+
+def not_modified(request: Request, response: Response, *, etag: str, cache_control: str) -> Response | None:
+    """Set validators on ``response``; return a bodyless 304 when the client already has ``etag``."""
+
+    headers = {ETAG_HEADER: etag, "Cache-Control": cache_control}
+    response.headers.update(headers)
+
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return None
+    # If-None-Match uses weak comparison (RFC 9110 13.1.2), so a W/ prefix still matches.
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    if "*" in candidates or etag in candidates:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return None
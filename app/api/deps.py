@@ -1,50 +1,124 @@
 """Dependency providers for FastAPI routes."""
 from __future__ import annotations
 
+from functools import lru_cache
 from typing import Annotated
 
-from fastapi import Depends
-from sqlalchemy.orm import Session
+from fastapi import Depends, HTTPException, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.schemas import ReportCreate
 from app.application import ReportHistoryService, ReportService, SiteService, WorkTypeService
+from app.application.auth import UserCache
+from app.application.photo_deletion_queue import PhotoDeletionQueue
+from app.application.upload_budget import UploadBudget
+from app.application.upload_reservation import UploadReservations
+from app.application.work_type_catalogue import WorkTypeCatalogue
 from app.config import Settings, get_settings
-from app.domain.ports import Clock, ReportRepository, SiteRepository, StoragePort, UtcClock, UserRepository, WorkTypeRepository
-from app.infrastructure import (
-    SqlAlchemyReportRepository,
-    SqlAlchemySiteRepository,
-    SqlAlchemyUserRepository,
-    SqlAlchemyWorkTypeRepository,
-    YandexStorage,
+from app.domain.ports import (
+    Clock,
+    ReportRepository,
+    SiteRepository,
+    StoragePort,
+    UnitOfWork,
+    UtcClock,
+    UserRepository,
+    WorkTypeRepository,
 )
+from app.infrastructure import SqlAlchemyUnitOfWork
 from app.infrastructure.database import get_db
+from app.infrastructure.storage import LocalFileStorage
 
 SettingsDep = Annotated[Settings, Depends(get_settings)]
-SessionDep = Annotated[Session, Depends(get_db)]
+SessionDep = Annotated[AsyncSession, Depends(get_db)]
 
 
 def get_clock() -> Clock:
     return UtcClock()
 
 
-def get_storage(settings: SettingsDep) -> StoragePort:
-    return YandexStorage(settings)
+def get_configured_storage(request: Request) -> StoragePort | None:
+    # Created once in the app lifespan; see app.main.
+    return getattr(request.app.state, "storage", None)
 
 
-def get_report_repository(db: SessionDep) -> ReportRepository:
-    return SqlAlchemyReportRepository(db)
+def get_storage(request: Request) -> StoragePort:
+    storage = get_configured_storage(request)
+    if storage is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Хранилище файлов не настроено",
+        )
+    return storage
 
 
-def get_site_repository(db: SessionDep) -> SiteRepository:
-    return SqlAlchemySiteRepository(db)
+def get_local_storage(request: Request) -> LocalFileStorage:
+    # The /files routes only exist for STORAGE_BACKEND=local; anything else has no files here.
+    storage = get_configured_storage(request)
+    if not isinstance(storage, LocalFileStorage):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Файл не найден")
+    return storage
 
 
-def get_user_repository(db: SessionDep) -> UserRepository:
-    return SqlAlchemyUserRepository(db)
+def get_photo_deletion_queue(request: Request) -> PhotoDeletionQueue | None:
+    # Only present with STORAGE_DELETE_IN_BACKGROUND; see app.main.
+    return getattr(request.app.state, "photo_deletion_queue", None)
 
 
-def get_work_type_repository(db: SessionDep) -> WorkTypeRepository:
-    return SqlAlchemyWorkTypeRepository(db)
+@lru_cache(maxsize=1)
+def get_upload_budget() -> UploadBudget:
+    settings = get_settings()
+    return UploadBudget(
+        max_bytes=settings.upload_max_in_flight_bytes,
+        retry_after_seconds=settings.upload_retry_after_seconds,
+    )
+
+
+UploadBudgetDep = Annotated[UploadBudget, Depends(get_upload_budget)]
+
+
+@lru_cache(maxsize=1)
+def get_upload_reservations() -> UploadReservations:
+    settings = get_settings()
+    return UploadReservations(secret=settings.jwt_secret, ttl_seconds=settings.upload_reservation_ttl_seconds)
+
+
+@lru_cache(maxsize=1)
+def get_user_cache() -> UserCache:
+    settings = get_settings()
+    return UserCache(ttl_seconds=settings.user_cache_ttl_seconds, max_size=settings.user_cache_max_size)
+
+
+UserCacheDep = Annotated[UserCache, Depends(get_user_cache)]
+
+
+@lru_cache(maxsize=1)
+def get_work_type_catalogue() -> WorkTypeCatalogue:
+    return WorkTypeCatalogue(ttl_seconds=get_settings().work_type_catalogue_ttl_seconds)
+
+
+def get_unit_of_work(db: SessionDep) -> UnitOfWork:
+    # FastAPI caches dependencies per request, so every consumer shares this instance.
+    return SqlAlchemyUnitOfWork(db)
+
+
+UnitOfWorkDep = Annotated[UnitOfWork, Depends(get_unit_of_work)]
+
+
+def get_report_repository(uow: UnitOfWorkDep) -> ReportRepository:
+    return uow.reports
+
+
+def get_site_repository(uow: UnitOfWorkDep) -> SiteRepository:
+    return uow.sites
+
+
+def get_user_repository(uow: UnitOfWorkDep) -> UserRepository:
+    return uow.users
+
+
+def get_work_type_repository(uow: UnitOfWorkDep) -> WorkTypeRepository:
+    return uow.work_types
 
 
 def get_report_service(
@@ -52,27 +126,50 @@ def get_report_service(
     storage: Annotated[StoragePort, Depends(get_storage)],
     clock: Annotated[Clock, Depends(get_clock)],
     site_service: Annotated[SiteService, Depends(get_site_service)],
+    work_type_service: Annotated[WorkTypeService, Depends(get_work_type_service)],
+    uow: UnitOfWorkDep,
+    settings: SettingsDep,
+    deletion_queue: Annotated[PhotoDeletionQueue | None, Depends(get_photo_deletion_queue)],
+    reservations: Annotated[UploadReservations, Depends(get_upload_reservations)],
+    upload_budget: UploadBudgetDep,
 ) -> ReportService:
-    return ReportService(repository=repository, storage=storage, clock=clock, site_service=site_service)
+    return ReportService(
+        repository=repository,
+        storage=storage,
+        clock=clock,
+        site_service=site_service,
+        work_type_service=work_type_service,
+        unit_of_work=uow,
+        reservations=reservations,
+        max_page_size=settings.reports_limit,
+        deletion_queue=deletion_queue,
+        upload_concurrency=settings.upload_concurrency_per_request,
+        max_photo_bytes=settings.upload_max_photo_bytes,
+        upload_budget=upload_budget,
+    )
 
 
 def get_report_history_service(
     repository: Annotated[ReportRepository, Depends(get_report_repository)],
     site_service: Annotated[SiteService, Depends(get_site_service)],
+    uow: UnitOfWorkDep,
 ) -> ReportHistoryService:
-    return ReportHistoryService(repository=repository, site_service=site_service)
+    return ReportHistoryService(repository=repository, site_service=site_service, versions=uow.versions)
 
 
 def get_work_type_service(
     repository: Annotated[WorkTypeRepository, Depends(get_work_type_repository)],
+    uow: UnitOfWorkDep,
+    catalogue: Annotated[WorkTypeCatalogue, Depends(get_work_type_catalogue)],
 ) -> WorkTypeService:
-    return WorkTypeService(repository)
+    return WorkTypeService(repository, uow, catalogue)
 
 
 def get_site_service(
     repository: Annotated[SiteRepository, Depends(get_site_repository)],
+    uow: UnitOfWorkDep,
 ) -> SiteService:
-    return SiteService(repository)
+    return SiteService(repository, uow)
 
 
 def get_user_service_repository(
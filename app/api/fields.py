@@ -0,0 +1,33 @@
+"""Sparse fieldsets: ``?fields=id,name,status`` on listing endpoints."""
+from __future__ import annotations
+
+from typing import Type
+
+from fastapi import HTTPException, status
+from pydantic import BaseModel
+
+FIELDS_DESCRIPTION = "Comma-separated fields of each row, e.g. id,name,status; every field when absent"
+
+
+def parse_fields(fields: str | None, schema: Type[BaseModel]) -> frozenset[str] | None:
+    """Field names of a ``fields`` query parameter, checked against ``schema``; None means all of them.
+
+    The set is passed down to the repository, which selects only the columns,
+    joins and aggregates these fields need.
+    """
+
+    if fields is None:
+        return None
+    names = frozenset(name.strip() for name in fields.split(",") if name.strip())
+    if not names:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Не указаны поля для ответа",
+        )
+    unknown = names - schema.model_fields.keys() - schema.model_computed_fields.keys()
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Неизвестные поля: {', '.join(sorted(unknown))}",
+        )
+    return names
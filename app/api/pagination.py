@@ -0,0 +1,15 @@
+"""HTTP helpers for cursor-paginated listings."""
+from __future__ import annotations
+
+from fastapi import Response
+
+from app.application import Page
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def set_next_cursor(response: Response, page: Page) -> None:
+    """Expose the cursor of the following page; the header is absent on the last page."""
+
+    if page.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
@@ -0,0 +1,199 @@
+"""Pre-encoded JSON responses rendered straight from domain dataclasses.
+
+Listing endpoints would otherwise build a Pydantic model per row, have FastAPI
+validate it again against ``response_model`` and encode the result with ``json``.
+Here each row becomes a plain dict with exactly the fields of its ``*Read``
+schema, and the whole page is encoded once. The schemas stay the documented
+contract (``listing_responses``, not ``response_model``: sparse rows would fail
+its validation); ``scripts.bench_json_render`` checks that both paths produce
+the same JSON. With ``Accept: application/x-ndjson`` listings are
+streamed instead: one row per line, sent as soon as it is read. With
+``?fields=`` (``app.api.fields``) rows keep only the requested keys.
+"""
+from __future__ import annotations
+
+import json
+from datetime import date, datetime
+from typing import Any, AsyncIterator, Callable, Dict, List, Type
+
+from fastapi import Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+from app.domain.entities import Report, ReportHistoryItem, ReportWorkItem, Site
+
+try:
+    import orjson
+except ImportError:  # orjson is optional: without it the standard encoder is used.
+    orjson = None
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+NO_VARIANTS: Dict[str, str] = {}
+
+
+def _default(value: Any) -> str:
+    if isinstance(value, datetime):
+        # Same form as Pydantic: UTC as "Z", other offsets as "+hh:mm".
+        text = value.isoformat()
+        return f"{text[:-6]}Z" if text.endswith("+00:00") else text
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(value: Any) -> bytes:
+    """Compact UTF-8 JSON; dates and datetimes are written as Pydantic writes them."""
+
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_UTC_Z)
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=_default).encode()
+
+
+def pre_encoded(body: bytes, response: Response) -> Response:
+    """``body`` as the JSON response, with the headers set on the injected ``response``.
+
+    FastAPI drops headers of the injected response when an endpoint returns its own.
+    """
+
+    return Response(content=body, media_type="application/json", headers=_forwarded_headers(response))
+
+
+def listing_responses(model: Type[BaseModel], *, ndjson: bool = False) -> Dict[int | str, Dict[str, Any]]:
+    """OpenAPI ``responses`` of a pre-encoded listing: a JSON array of ``model`` rows.
+
+    Route it with ``response_class=Response`` and no ``response_model``.
+    """
+
+    description = f"Array of {model.__name__}; with `fields=` each row keeps only the listed fields."
+    content: Dict[str, Dict[str, Any]] = {"application/json": {}}
+    if ndjson:
+        description += f" With `Accept: {NDJSON_MEDIA_TYPE}` the same rows are streamed one per line."
+        content[NDJSON_MEDIA_TYPE] = {}
+    return {200: {"model": List[model], "description": description, "content": content}}
+
+
+def wants_ndjson(request: Request) -> bool:
+    return NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def ndjson_response(items: AsyncIterator[Any], row: Callable[[Any], Dict[str, Any]], response: Response) -> Response:
+    """Stream ``items`` as NDJSON, one ``row`` per line, keeping the headers of ``response``.
+
+    Every line is handed to the server as soon as its row arrives, so the first
+    byte does not wait for the rest of the result.
+    """
+
+    async def lines() -> AsyncIterator[bytes]:
+        async for item in items:
+            yield dumps(row(item)) + b"\n"
+
+    return StreamingResponse(lines(), media_type=NDJSON_MEDIA_TYPE, headers=_forwarded_headers(response))
+
+
+def only_fields(
+    row: Callable[[Any], Dict[str, Any]], fields: frozenset[str] | None
+) -> Callable[[Any], Dict[str, Any]]:
+    """``row`` limited to ``fields``, in schema order; ``row`` itself when every field is wanted.
+
+    Fields the repository did not select hold empty values, so building them is cheap.
+    """
+
+    if fields is None:
+        return row
+    return lambda item: {name: value for name, value in row(item).items() if name in fields}
+
+
+def _forwarded_headers(response: Response) -> Dict[str, str]:
+    return {name: value for name, value in response.headers.items() if name != "content-length"}
+
+
+def work_item_row(item: ReportWorkItem) -> Dict[str, Any]:
+    """``ReportWorkItemPayload``."""
+
+    return {
+        "work_type_id": item.work_type_id,
+        "description": item.description,
+        "people": item.people,
+        "volume": item.volume,
+        "machines": item.machines,
+        "sort_order": item.sort_order,
+    }
+
+
+def photo_rows(photo_urls: List[str], photo_variants: Dict[str, Dict[str, str]]) -> List[Dict[str, Any]]:
+    """``photo_reads``."""
+
+    rows = []
+    for url in photo_urls:
+        variants = photo_variants.get(url, NO_VARIANTS)
+        rows.append({"url": url, "thumb_url": variants.get("thumb"), "medium_url": variants.get("medium")})
+    return rows
+
+
+def report_row(report: Report) -> Dict[str, Any]:
+    """``ReportRead``."""
+
+    return {
+        "id": report.id,
+        "user_id": report.user_id,
+        "site_id": report.site_id,
+        "work_type_id": report.work_type_id,
+        "report_date": report.report_date,
+        "description": report.description,
+        "people": report.people,
+        "volume": report.volume,
+        "machines": report.machines,
+        "created_at": report.created_at,
+        "photo_urls": report.photo_urls,
+        "work_items": [work_item_row(item) for item in report.work_items],
+        "photos": photo_rows(report.photo_urls, report.photo_variants),
+    }
+
+
+def history_row(item: ReportHistoryItem) -> Dict[str, Any]:
+    """``SiteReportHistoryItemRead``."""
+
+    return {
+        "id": item.id,
+        "site_id": item.site_id,
+        "work_type_id": item.work_type_id,
+        "work_type_name": item.work_type_name,
+        "report_date": item.report_date,
+        "created_at": item.created_at,
+        "description": item.description,
+        "people": item.people,
+        "volume": item.volume,
+        "machines": item.machines,
+        "photo_urls": item.photo_urls,
+        "author_id": item.author_id,
+        "author_name": item.author_name,
+        "work_items": [work_item_row(work_item) for work_item in item.work_items],
+        "photos": photo_rows(item.photo_urls, item.photo_variants),
+    }
+
+
+def site_row(site: Site) -> Dict[str, Any]:
+    """``SiteRead``."""
+
+    return {
+        "id": site.id,
+        "name": site.name,
+        "address": site.address,
+        "customer_name": site.customer_name,
+        "project_manager_name": site.project_manager_name,
+        "pto_responsible_name": site.pto_responsible_name,
+        "start_date": site.start_date,
+        "planned_end_date": site.planned_end_date,
+        "budget_total": site.budget_total,
+        "budget_spent": site.budget_spent,
+        "progress_percent": site.progress_percent,
+        "status_note": site.status_note,
+        "contractor_id": site.contractor_id,
+        "contractor_name": site.contractor_name,
+        "pto_engineer_id": site.pto_engineer_id,
+        "pto_engineer_name": site.pto_engineer_name,
+        "last_report_date": site.last_report_date,
+        "recent_report_dates": site.recent_report_dates or [],
+        "has_today_report": site.has_today_report,
+        "status": site.status,
+    }
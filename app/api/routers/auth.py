@@ -6,10 +6,11 @@ from uuid import uuid4
 
 from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.deps import UnitOfWorkDep, UserCacheDep, get_user_repository
 from app.api.security import get_current_user
-from app.api.schemas.auth import AdminUserUpdate, ContractorCreate, ContractorOption, LoginRequest, LoginResponse, PtoEngineerCreate, UserOut
+from app.api.schemas.auth import AdminUserUpdate, ContractorCreate, ContractorOption, LoginRequest, LoginResponse, PtoEngineerCreate, UserCacheStats, UserOut
 from app.application.auth import AuthService, InvalidCredentialsError, normalize_phone
 from app.application.auth.security import hash_password
 from app.config import Settings, get_settings
@@ -17,17 +18,19 @@ from app.domain.ports import UserRepository
 from app.domain.entities import User
 from app.infrastructure.database import get_db
 from app.infrastructure.reports.models import ReportModel
-from app.infrastructure.users import SqlAlchemyUserRepository
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 SettingsDep = Annotated[Settings, Depends(get_settings)]
-SessionDep = Annotated[Session, Depends(get_db)]
+SessionDep = Annotated[AsyncSession, Depends(get_db)]
 
 
-def get_auth_service(db: SessionDep, settings: SettingsDep) -> AuthService:
+def get_auth_service(
+    repository: Annotated[UserRepository, Depends(get_user_repository)],
+    settings: SettingsDep,
+) -> AuthService:
     return AuthService(
-        user_repository=SqlAlchemyUserRepository(db),
+        user_repository=repository,
         jwt_secret=settings.jwt_secret,
         jwt_algorithm=settings.jwt_algorithm,
         token_expires_minutes=settings.jwt_expires_minutes,
@@ -35,12 +38,12 @@ def get_auth_service(db: SessionDep, settings: SettingsDep) -> AuthService:
 
 
 @router.post("/login", response_model=LoginResponse)
-def login(
+async def login(
     body: LoginRequest,
     auth_service: Annotated[AuthService, Depends(get_auth_service)],
 ) -> LoginResponse:
     try:
-        result = auth_service.login(phone=body.phone, password=body.password)
+        result = await auth_service.login(phone=body.phone, password=body.password)
     except InvalidCredentialsError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -62,7 +65,7 @@ def login(
 
 
 @router.get("/me", response_model=UserOut)
-def me(current_user: Annotated[User, Depends(get_current_user)]) -> UserOut:
+async def me(current_user: Annotated[User, Depends(get_current_user)]) -> UserOut:
     return UserOut(
         id=current_user.id,
         name=current_user.name,
@@ -73,10 +76,6 @@ def me(current_user: Annotated[User, Depends(get_current_user)]) -> UserOut:
     )
 
 
-def get_user_repository(db: SessionDep) -> UserRepository:
-    return SqlAlchemyUserRepository(db)
-
-
 def _ensure_admin(current_user: User) -> None:
     if current_user.role != "admin":
         raise HTTPException(
@@ -85,14 +84,23 @@ def _ensure_admin(current_user: User) -> None:
         )
 
 
-def _update_user(
+@router.get("/user-cache", response_model=UserCacheStats)
+async def user_cache_stats(
+    current_user: Annotated[User, Depends(get_current_user)],
+    user_cache: UserCacheDep,
+) -> UserCacheStats:
+    _ensure_admin(current_user)
+    return UserCacheStats(**user_cache.stats())
+
+
+async def _update_user(
     *,
     repository: UserRepository,
     user_id: str,
     role: str,
     body: AdminUserUpdate,
 ) -> User:
-    existing = repository.get_by_id(user_id)
+    existing = await repository.get_by_id(user_id)
     if existing is None or existing.role != role:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -100,14 +108,14 @@ def _update_user(
         )
 
     normalized_phone = normalize_phone(body.phone)
-    phone_owner = repository.get_by_phone(normalized_phone)
+    phone_owner = await repository.get_by_phone(normalized_phone)
     if phone_owner is not None and phone_owner.id != user_id:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="Пользователь с таким телефоном уже существует",
         )
 
-    updated = repository.update(
+    updated = await repository.update(
         User(
             id=existing.id,
             name=body.name.strip(),
@@ -127,7 +135,7 @@ def _update_user(
 
 
 @router.get("/contractors", response_model=list[ContractorOption])
-def list_contractors(
+async def list_contractors(
     current_user: Annotated[User, Depends(get_current_user)],
     repository: Annotated[UserRepository, Depends(get_user_repository)],
 ) -> list[ContractorOption]:
@@ -141,27 +149,28 @@ def list_contractors(
             phone=user.phone,
             is_active=user.is_active,
         )
-        for user in repository.list_all_by_role("contractor")
+        for user in await repository.list_all_by_role("contractor")
     ]
 
 
 @router.post("/contractors", response_model=UserOut, status_code=status.HTTP_201_CREATED)
-def create_contractor(
+async def create_contractor(
     body: ContractorCreate,
     current_user: Annotated[User, Depends(get_current_user)],
     repository: Annotated[UserRepository, Depends(get_user_repository)],
+    uow: UnitOfWorkDep,
 ) -> UserOut:
     _ensure_admin(current_user)
 
     normalized_phone = normalize_phone(body.phone)
-    existing = repository.get_by_phone(normalized_phone)
+    existing = await repository.get_by_phone(normalized_phone)
     if existing is not None:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="Пользователь с таким телефоном уже существует",
         )
 
-    user = repository.add(
+    user = await repository.add(
         User(
             id=uuid4().hex,
             name=body.name.strip(),
@@ -172,6 +181,7 @@ def create_contractor(
             is_active=True,
         )
     )
+    await uow.commit()
 
     return UserOut(
         id=user.id,
@@ -184,14 +194,18 @@ def create_contractor(
 
 
 @router.patch("/contractors/{user_id}", response_model=UserOut)
-def update_contractor(
+async def update_contractor(
     user_id: str,
     body: AdminUserUpdate,
     current_user: Annotated[User, Depends(get_current_user)],
     repository: Annotated[UserRepository, Depends(get_user_repository)],
+    uow: UnitOfWorkDep,
+    user_cache: UserCacheDep,
 ) -> UserOut:
     _ensure_admin(current_user)
-    user = _update_user(repository=repository, user_id=user_id, role="contractor", body=body)
+    user = await _update_user(repository=repository, user_id=user_id, role="contractor", body=body)
+    await uow.commit()
+    user_cache.invalidate(user_id)
     return UserOut(
         id=user.id,
         name=user.name,
@@ -203,40 +217,44 @@ def update_contractor(
 
 
 @router.delete("/contractors/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_contractor(
+async def delete_contractor(
     user_id: str,
     current_user: Annotated[User, Depends(get_current_user)],
     repository: Annotated[UserRepository, Depends(get_user_repository)],
+    uow: UnitOfWorkDep,
+    user_cache: UserCacheDep,
     db: SessionDep,
 ) -> Response:
     _ensure_admin(current_user)
-    existing = repository.get_by_id(user_id)
+    existing = await repository.get_by_id(user_id)
     if existing is None or existing.role != "contractor":
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Подрядчик не найден",
         )
 
-    report_exists = db.execute(
+    report_exists = (await db.execute(
         select(ReportModel.id).where(ReportModel.user_id == user_id).limit(1)
-    ).scalar_one_or_none()
+    )).scalar_one_or_none()
     if report_exists is not None:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="Нельзя удалить подрядчика, пока за ним закреплены отчёты",
         )
 
-    deleted = repository.delete(user_id)
+    deleted = await repository.delete(user_id)
     if not deleted:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Подрядчик не найден",
         )
+    await uow.commit()
+    user_cache.invalidate(user_id)
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
 @router.get("/pto-engineers", response_model=list[UserOut])
-def list_pto_engineers(
+async def list_pto_engineers(
     current_user: Annotated[User, Depends(get_current_user)],
     repository: Annotated[UserRepository, Depends(get_user_repository)],
 ) -> list[UserOut]:
@@ -251,27 +269,28 @@ def list_pto_engineers(
             role=user.role,
             is_active=user.is_active,
         )
-        for user in repository.list_all_by_role("pto_engineer")
+        for user in await repository.list_all_by_role("pto_engineer")
     ]
 
 
 @router.post("/pto-engineers", response_model=UserOut, status_code=status.HTTP_201_CREATED)
-def create_pto_engineer(
+async def create_pto_engineer(
     body: PtoEngineerCreate,
     current_user: Annotated[User, Depends(get_current_user)],
     repository: Annotated[UserRepository, Depends(get_user_repository)],
+    uow: UnitOfWorkDep,
 ) -> UserOut:
     _ensure_admin(current_user)
 
     normalized_phone = normalize_phone(body.phone)
-    existing = repository.get_by_phone(normalized_phone)
+    existing = await repository.get_by_phone(normalized_phone)
     if existing is not None:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="Пользователь с таким телефоном уже существует",
         )
 
-    user = repository.add(
+    user = await repository.add(
         User(
             id=uuid4().hex,
             name=body.name.strip(),
@@ -282,6 +301,7 @@ def create_pto_engineer(
             is_active=True,
         )
     )
+    await uow.commit()
 
     return UserOut(
         id=user.id,
@@ -294,14 +314,18 @@ def create_pto_engineer(
 
 
 @router.patch("/pto-engineers/{user_id}", response_model=UserOut)
-def update_pto_engineer(
+async def update_pto_engineer(
     user_id: str,
     body: AdminUserUpdate,
     current_user: Annotated[User, Depends(get_current_user)],
     repository: Annotated[UserRepository, Depends(get_user_repository)],
+    uow: UnitOfWorkDep,
+    user_cache: UserCacheDep,
 ) -> UserOut:
     _ensure_admin(current_user)
-    user = _update_user(repository=repository, user_id=user_id, role="pto_engineer", body=body)
+    user = await _update_user(repository=repository, user_id=user_id, role="pto_engineer", body=body)
+    await uow.commit()
+    user_cache.invalidate(user_id)
     return UserOut(
         id=user.id,
         name=user.name,
@@ -0,0 +1,73 @@
+"""Photo files of the local storage backend (``STORAGE_BACKEND=local``)."""
+from __future__ import annotations
+
+from typing import AsyncIterable, AsyncIterator
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import FileResponse
+
+from app.api.compression import skip_compression
+from app.api.deps import get_local_storage
+from app.infrastructure.storage import LocalFileStorage
+
+router = APIRouter(prefix="/files", tags=["files"])
+
+# Keys are content hashes or random ids, so the bytes behind a key never change.
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+
+@router.get("/{key:path}")
+@router.head("/{key:path}")
+@skip_compression
+async def get_file(key: str, storage: LocalFileStorage = Depends(get_local_storage)) -> FileResponse:
+    """Отдаёт файл фото; поддерживает Range."""
+
+    stat_result = await storage.stat(key)
+    if stat_result is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Файл не найден")
+    # FileResponse answers Range requests (206/416). It offers the path to servers with
+    # ``http.response.pathsend``; uvicorn has none, so it reads the file in chunks.
+    return FileResponse(storage.path_of(key), stat_result=stat_result, headers={"Cache-Control": IMMUTABLE})
+
+
+@router.put("/{key:path}")
+async def put_file(
+    key: str,
+    request: Request,
+    size: int = Query(ge=0),
+    expires: int = Query(),
+    signature: str = Query(),
+    storage: LocalFileStorage = Depends(get_local_storage),
+) -> Response:
+    """Принимает прямую загрузку фото по ссылке из POST /reports/uploads."""
+
+    if storage.path_of(key) is None or not storage.verify_upload(
+        key, size=size, expires=expires, signature=signature
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Ссылка для загрузки недействительна или истекла",
+        )
+    # ``size`` is signed into the link and was checked against UPLOAD_MAX_PHOTO_BYTES when it was issued.
+    declared = request.headers.get("content-length")
+    if declared is not None and declared.isdigit() and int(declared) > size:
+        raise _too_large(size)
+    # A missing or understated length is caught while streaming; write_stream drops the partial file.
+    await storage.write_stream(key, _limited(request.stream(), size))
+    return Response(status_code=status.HTTP_200_OK)
+
+
+async def _limited(chunks: AsyncIterable[bytes], max_bytes: int) -> AsyncIterator[bytes]:
+    received = 0
+    async for chunk in chunks:
+        received += len(chunk)
+        if received > max_bytes:
+            raise _too_large(max_bytes)
+        yield chunk
+
+
+def _too_large(max_bytes: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"Файл больше допустимых {max_bytes} байт",
+    )
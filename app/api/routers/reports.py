@@ -2,37 +2,76 @@
 from __future__ import annotations
 
 import json
-from typing import Annotated, List, Optional
+from typing import Annotated, Any, Dict, List, Optional, Set
 
-from fastapi import APIRouter, Depends, File, HTTPException, Query, Response, UploadFile, status
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Path, Query, Request, Response, UploadFile, status
+from pydantic import ValidationError
 
-from app.api.deps import ReportCreateForm, get_report_service, get_site_service
-from app.api.schemas import ReportRead, ReportUpdate
+from app.api.deps import (
+    ReportCreateForm,
+    SettingsDep,
+    UploadBudgetDep,
+    get_configured_storage,
+    get_report_service,
+    get_site_service,
+)
+from app.api.fields import FIELDS_DESCRIPTION, parse_fields
+from app.api.pagination import set_next_cursor
+from app.api.rendering import (
+    dumps,
+    listing_responses,
+    ndjson_response,
+    only_fields,
+    pre_encoded,
+    report_row,
+    wants_ndjson,
+)
+from app.api.schemas import (
+    PresignedUploadRead,
+    ReportBatchItem,
+    ReportBatchItemResult,
+    ReportBatchResult,
+    ReportConfirm,
+    ReportCreate,
+    ReportRead,
+    ReportUpdate,
+    ReportUploadRequest,
+    ReportUploadTicket,
+    UploadStats,
+)
 from app.api.security import get_current_user
-from app.application import ReportCreateCommand, ReportService, ReportWorkItemCommand, SiteService
+from app.application import (
+    ReportBatchEntry,
+    ReportCreateCommand,
+    ReportService,
+    ReportWorkItemCommand,
+    SiteService,
+)
 from app.domain.entities import User
+from app.domain.ports import StoragePort
 
 router = APIRouter(prefix="/reports", tags=["reports"])
 
 
-@router.post("", response_model=ReportRead)
-async def create_report(
-    payload: ReportCreateForm,
-    current_user: Annotated[User, Depends(get_current_user)],
-    site_service: Annotated[SiteService, Depends(get_site_service)],
-    photos: List[UploadFile] = File(..., description="List of photo files", min_items=1),
-    report_service: ReportService = Depends(get_report_service),
-) -> ReportRead:
-    if current_user.role != "contractor":
+REPORT_ID_PATTERN = r"^[0-9a-f]{32}$"
+
+
+def _ensure_contractor(user: User) -> None:
+    if user.role != "contractor":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Отправка отчётов доступна только подрядчикам",
         )
 
-    site_service.get_site_for_user(site_id=payload.site_id, user=current_user)
 
-    command = ReportCreateCommand(
-        user_id=current_user.id,
+async def _ensure_contractor_site_access(site_service: SiteService, *, site_id: str, user: User) -> None:
+    _ensure_contractor(user)
+    await site_service.get_site_access_for_user(site_id=site_id, user=user)
+
+
+def _to_create_command(payload: ReportCreate, user: User) -> ReportCreateCommand:
+    return ReportCreateCommand(
+        user_id=user.id,
         site_id=payload.site_id,
         work_type_id=payload.work_type_id,
         report_date=payload.report_date,
@@ -52,22 +91,215 @@ async def create_report(
             for item in payload.work_items
         ],
     )
-    report = await report_service.create_report(command, photos)
+
+
+@router.post("", response_model=ReportRead)
+async def create_report(
+    payload: ReportCreateForm,
+    current_user: Annotated[User, Depends(get_current_user)],
+    site_service: Annotated[SiteService, Depends(get_site_service)],
+    photos: List[UploadFile] = File(..., description="List of photo files", min_items=1),
+    report_service: ReportService = Depends(get_report_service),
+) -> ReportRead:
+    await _ensure_contractor_site_access(site_service, site_id=payload.site_id, user=current_user)
+    report = await report_service.create_report(_to_create_command(payload, current_user), photos)
+    return ReportRead.from_entity(report)
+
+
+@router.post("/batch", response_model=ReportBatchResult)
+async def create_report_batch(
+    current_user: Annotated[User, Depends(get_current_user)],
+    settings: SettingsDep,
+    payload: str = Form(..., description='JSON {"reports": [...]}: report fields plus photo_indexes'),
+    photos: List[UploadFile] = File(default_factory=list, description="Photos of all reports in the batch"),
+    report_service: ReportService = Depends(get_report_service),
+) -> ReportBatchResult:
+    """Отчёты, накопленные без связи, одним запросом.
+
+    Каждый отчёт ссылается на свои фото по номерам в ``photos``. Весь пакет
+    проверяется до загрузки фото; отклонённые отчёты не мешают остальным,
+    а принятые сохраняются одной транзакцией. Результат — по отчёту на позицию пакета.
+
+    Тело пакета — не больше ``REPORTS_BATCH_MAX_BYTES`` (по умолчанию 64 МиБ) и не больше
+    ``REPORTS_BATCH_MAX_ITEMS`` отчётов. Больший пакет получает 413 до чтения тела:
+    клиент делит очередь на несколько пакетов и отправляет их по очереди.
+    """
+
+    _ensure_contractor(current_user)
+    raw_items = _batch_items(payload, max_items=settings.reports_batch_max_items)
+    results: Dict[int, ReportBatchItemResult] = {}
+    entries: List[ReportBatchEntry] = []
+    positions: List[int] = []
+    claimed: Set[int] = set()
+    for index, raw in enumerate(raw_items):
+        try:
+            item = ReportBatchItem.model_validate(raw)
+        except ValidationError as exc:
+            results[index] = _rejected_item(index, _validation_detail(exc))
+            continue
+        photo_indexes = list(dict.fromkeys(item.photo_indexes))
+        missing = [photo for photo in photo_indexes if photo >= len(photos)]
+        if missing:
+            results[index] = _rejected_item(index, f"В запросе нет фото с номером {missing[0]}")
+            continue
+        # A file is uploaded by one report only: concurrent uploads would share its read position.
+        reused = claimed.intersection(photo_indexes)
+        if reused:
+            results[index] = _rejected_item(index, f"Фото с номером {min(reused)} уже указано в другом отчёте")
+            continue
+        claimed.update(photo_indexes)
+        entries.append(
+            ReportBatchEntry(
+                command=_to_create_command(item, current_user),
+                photos=[photos[photo] for photo in photo_indexes],
+            )
+        )
+        positions.append(index)
+
+    outcomes = await report_service.create_reports(entries, user=current_user)
+    for index, outcome in zip(positions, outcomes):
+        results[index] = ReportBatchItemResult(
+            index=index,
+            status_code=outcome.status_code,
+            report=ReportRead.from_entity(outcome.report) if outcome.report is not None else None,
+            detail=outcome.detail,
+        )
+    items = [results[index] for index in range(len(raw_items))]
+    created = sum(item.report is not None for item in items)
+    return ReportBatchResult(created=created, rejected=len(items) - created, items=items)
+
+
+def _batch_items(payload: str, *, max_items: int) -> List[Any]:
+    try:
+        raw_items = json.loads(payload)["reports"]
+    except (ValueError, TypeError, KeyError) as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Некорректные данные пакета отчётов",
+        ) from exc
+    if not isinstance(raw_items, list) or not raw_items:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Пакет не содержит отчётов",
+        )
+    if len(raw_items) > max_items:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"В пакете больше {max_items} отчётов",
+        )
+    return raw_items
+
+
+def _rejected_item(index: int, detail: str) -> ReportBatchItemResult:
+    return ReportBatchItemResult(index=index, status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=detail)
+
+
+def _validation_detail(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(map(str, error['loc'])) or 'report'}: {error['msg']}" for error in exc.errors()
+    )
+
+
+@router.post("/uploads", response_model=ReportUploadTicket)
+async def start_report_upload(
+    payload: ReportUploadRequest,
+    current_user: Annotated[User, Depends(get_current_user)],
+    site_service: Annotated[SiteService, Depends(get_site_service)],
+    report_service: ReportService = Depends(get_report_service),
+) -> ReportUploadTicket:
+    """Step 1 of the direct upload: presigned PUT URLs, then ``POST /reports/{report_id}/confirm``."""
+
+    await _ensure_contractor_site_access(site_service, site_id=payload.site_id, user=current_user)
+    report_id, reservation, uploads = await report_service.start_photo_upload(
+        user_id=current_user.id,
+        site_id=payload.site_id,
+        report_date=payload.report_date,
+        photos=[(photo.filename, photo.content_type, photo.size) for photo in payload.photos],
+    )
+    return ReportUploadTicket(
+        report_id=report_id,
+        reservation=reservation,
+        expires_in=min((upload.expires_in for upload in uploads), default=0),
+        uploads=[PresignedUploadRead.from_entity(upload) for upload in uploads],
+    )
+
+
+@router.get("/uploads/stats", response_model=UploadStats)
+async def upload_stats(
+    current_user: Annotated[User, Depends(get_current_user)],
+    upload_budget: UploadBudgetDep,
+    storage: Annotated[StoragePort | None, Depends(get_configured_storage)],
+) -> UploadStats:
+    if current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Доступно только администратору",
+        )
+    io_stats = storage.io_stats() if storage is not None else {}
+    return UploadStats(
+        **upload_budget.stats(),
+        storage_workers=io_stats.get("workers", 0),
+        storage_queue_depth=io_stats.get("queued", 0),
+        storage_running=io_stats.get("running", 0),
+    )
+
+
+@router.post("/{report_id}/confirm", response_model=ReportRead)
+async def confirm_report_upload(
+    payload: ReportConfirm,
+    current_user: Annotated[User, Depends(get_current_user)],
+    site_service: Annotated[SiteService, Depends(get_site_service)],
+    report_id: str = Path(..., pattern=REPORT_ID_PATTERN),
+    report_service: ReportService = Depends(get_report_service),
+) -> ReportRead:
+    await _ensure_contractor_site_access(site_service, site_id=payload.site_id, user=current_user)
+    report = await report_service.confirm_report(
+        _to_create_command(payload, current_user),
+        report_id=report_id,
+        reservation=payload.reservation,
+        photo_keys=payload.photo_keys,
+    )
     return ReportRead.from_entity(report)
 
 
-@router.get("", response_model=List[ReportRead])
+@router.get("", response_class=Response, responses=listing_responses(ReportRead, ndjson=True))
 async def list_reports(
+    request: Request,
+    response: Response,
     site_id: Optional[str] = Query(default=None),
     user_id: Optional[str] = Query(default=None),
     work_type_id: Optional[str] = Query(default=None),
+    cursor: Optional[str] = Query(default=None, description="Opaque cursor from the X-Next-Cursor header"),
+    limit: Optional[int] = Query(default=None, ge=1, description="Page size; at most and by default REPORTS_LIMIT"),
+    fields: Optional[str] = Query(default=None, description=FIELDS_DESCRIPTION),
     current_user: Annotated[User, Depends(get_current_user)] = None,
     report_service: ReportService = Depends(get_report_service),
-) -> List[ReportRead]:
+) -> Response:
+    """С ``Accept: application/x-ndjson`` — все отчёты построчно, без страниц и ``limit``."""
+
+    selected = parse_fields(fields, ReportRead)
+    row = only_fields(report_row, selected)
     if current_user.role != "admin":
         user_id = current_user.id
-    reports = await report_service.list_reports(site_id=site_id, user_id=user_id, work_type_id=work_type_id)
-    return [ReportRead.from_entity(report) for report in reports]
+    if wants_ndjson(request):
+        reports = report_service.stream_reports(
+            site_id=site_id,
+            user_id=user_id,
+            work_type_id=work_type_id,
+            cursor=cursor,
+            fields=selected,
+        )
+        return ndjson_response(reports, row, response)
+    page = await report_service.list_reports(
+        site_id=site_id,
+        user_id=user_id,
+        work_type_id=work_type_id,
+        cursor=cursor,
+        limit=limit,
+        fields=selected,
+    )
+    set_next_cursor(response, page)
+    return pre_encoded(dumps([row(report) for report in page.items]), response)
 
 
 @router.patch("/{report_id}", response_model=ReportRead)
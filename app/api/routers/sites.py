@@ -2,11 +2,24 @@
 from __future__ import annotations
 
 from datetime import date
-from typing import Annotated, List
+from typing import Annotated
 
-from fastapi import APIRouter, Depends, Query, Response, status
+from fastapi import APIRouter, Depends, Query, Request, Response, status
 
+from app.api.conditional import PRIVATE_REVALIDATE, make_etag, not_modified
 from app.api.deps import get_report_history_service, get_site_service
+from app.api.fields import FIELDS_DESCRIPTION, parse_fields
+from app.api.pagination import set_next_cursor
+from app.api.rendering import (
+    dumps,
+    history_row,
+    listing_responses,
+    ndjson_response,
+    only_fields,
+    pre_encoded,
+    site_row,
+    wants_ndjson,
+)
 from app.api.schemas import SiteRead, SiteReportHistoryItemRead, SiteWrite
 from app.api.security import get_current_user
 from app.application import ReportHistoryService, SiteService
@@ -15,22 +28,35 @@ from app.domain.entities import User
 router = APIRouter(prefix="/sites", tags=["sites"])
 
 
-@router.get("", response_model=List[SiteRead])
-def list_sites(
+@router.get("", response_class=Response, responses=listing_responses(SiteRead))
+async def list_sites(
+    request: Request,
+    response: Response,
     current_user: Annotated[User, Depends(get_current_user)],
     service: Annotated[SiteService, Depends(get_site_service)],
-) -> List[SiteRead]:
-    sites = service.list_sites_for_user(current_user)
-    return [SiteRead.from_entity(site) for site in sites]
+    fields: str | None = Query(default=None, description=FIELDS_DESCRIPTION),
+) -> Response:
+    selected = parse_fields(fields, SiteRead)
+    # has_today_report depends on the date, so it is part of the validator too.
+    etag = make_etag(
+        "sites", current_user.id, *await service.get_sites_version(), date.today(), sorted(selected or ())
+    )
+    cached = not_modified(request, response, etag=etag, cache_control=PRIVATE_REVALIDATE)
+    if cached is not None:
+        return cached
+
+    sites = await service.list_sites_for_user(current_user, selected)
+    row = only_fields(site_row, selected)
+    return pre_encoded(dumps([row(site) for site in sites]), response)
 
 
 @router.post("", response_model=SiteRead, status_code=status.HTTP_201_CREATED)
-def create_site(
+async def create_site(
     body: SiteWrite,
     current_user: Annotated[User, Depends(get_current_user)],
     service: Annotated[SiteService, Depends(get_site_service)],
 ) -> SiteRead:
-    site = service.create_site(
+    site = await service.create_site(
         user=current_user,
         name=body.name,
         address=body.address,
@@ -50,13 +76,13 @@ def create_site(
 
 
 @router.patch("/{site_id}", response_model=SiteRead)
-def update_site(
+async def update_site(
     site_id: str,
     body: SiteWrite,
     current_user: Annotated[User, Depends(get_current_user)],
     service: Annotated[SiteService, Depends(get_site_service)],
 ) -> SiteRead:
-    site = service.update_site(
+    site = await service.update_site(
         user=current_user,
         site_id=site_id,
         name=body.name,
@@ -77,31 +103,69 @@ def update_site(
 
 
 @router.delete("/{site_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_site(
+async def delete_site(
     site_id: str,
     current_user: Annotated[User, Depends(get_current_user)],
     service: Annotated[SiteService, Depends(get_site_service)],
 ) -> Response:
-    service.delete_site(user=current_user, site_id=site_id)
+    await service.delete_site(user=current_user, site_id=site_id)
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
-@router.get("/{site_id}/reports", response_model=List[SiteReportHistoryItemRead])
+@router.get(
+    "/{site_id}/reports",
+    response_class=Response,
+    responses=listing_responses(SiteReportHistoryItemRead, ndjson=True),
+)
 async def list_site_reports(
     site_id: str,
+    request: Request,
+    response: Response,
     current_user: Annotated[User, Depends(get_current_user)],
     history_service: Annotated[ReportHistoryService, Depends(get_report_history_service)],
     date_from: date | None = Query(default=None),
     date_to: date | None = Query(default=None),
     work_type_id: str | None = Query(default=None),
+    cursor: str | None = Query(default=None, description="Opaque cursor from the X-Next-Cursor header"),
     limit: int = Query(default=100, ge=1, le=500),
-) -> List[SiteReportHistoryItemRead]:
-    items = await history_service.get_site_report_history(
+    fields: str | None = Query(default=None, description=FIELDS_DESCRIPTION),
+) -> Response:
+    """С ``Accept: application/x-ndjson`` — вся история построчно, без страниц и ``limit``."""
+
+    selected = parse_fields(fields, SiteReportHistoryItemRead)
+    ndjson = wants_ndjson(request)
+    version = await history_service.get_site_report_history_version(user=current_user, site_id=site_id)
+    etag = make_etag(
+        "history", site_id, *version, date_from, date_to, work_type_id, cursor, limit, ndjson, sorted(selected or ())
+    )
+    cached = not_modified(request, response, etag=etag, cache_control=PRIVATE_REVALIDATE)
+    response.headers["Vary"] = "Accept"
+    if cached is not None:
+        cached.headers["Vary"] = "Accept"
+        return cached
+
+    if ndjson:
+        items = await history_service.stream_site_report_history(
+            user=current_user,
+            site_id=site_id,
+            date_from=date_from,
+            date_to=date_to,
+            work_type_id=work_type_id,
+            cursor=cursor,
+            fields=selected,
+        )
+        return ndjson_response(items, only_fields(history_row, selected), response)
+
+    page = await history_service.get_site_report_history(
         user=current_user,
         site_id=site_id,
         date_from=date_from,
         date_to=date_to,
         work_type_id=work_type_id,
+        cursor=cursor,
         limit=limit,
+        fields=selected,
     )
-    return [SiteReportHistoryItemRead.from_entity(item) for item in items]
+    set_next_cursor(response, page)
+    row = only_fields(history_row, selected)
+    return pre_encoded(dumps([row(item) for item in page.items]), response)
@@ -3,8 +3,9 @@ from __future__ import annotations
 
 from typing import List
 
-from fastapi import APIRouter, Depends, Response, status
+from fastapi import APIRouter, Depends, Request, Response, status
 
+from app.api.conditional import PUBLIC_CATALOGUE, make_etag, not_modified
 from app.api.deps import get_work_type_service
 from app.api.schemas import WorkTypeRead, WorkTypeWrite
 from app.api.security import get_current_user
@@ -16,10 +17,20 @@ router = APIRouter(prefix="/work_types", tags=["work types"])
 
 @router.get("", response_model=List[WorkTypeRead])
 async def list_work_types(
+    request: Request,
+    response: Response,
     service: WorkTypeService = Depends(get_work_type_service),
 ) -> List[WorkTypeRead]:
-    work_types = await service.list_work_types()
-    return [WorkTypeRead.from_entity(work_type) for work_type in work_types]
+    catalogue = await service.catalogue()
+    cached = not_modified(
+        request,
+        response,
+        etag=make_etag("work_types", catalogue.version),
+        cache_control=PUBLIC_CATALOGUE,
+    )
+    if cached is not None:
+        return cached
+    return [WorkTypeRead.from_entity(work_type) for work_type in catalogue.items]
 
 
 @router.post("", response_model=WorkTypeRead, status_code=status.HTTP_201_CREATED)
@@ -1,6 +1,15 @@
-from .auth import AdminUserUpdate, ContractorCreate, ContractorOption, LoginRequest, LoginResponse, PtoEngineerCreate, UserOut
+from .auth import AdminUserUpdate, ContractorCreate, ContractorOption, LoginRequest, LoginResponse, PtoEngineerCreate, UserCacheStats, UserOut
 from .report_history import SiteReportHistoryItemRead
-from .report import ReportCreate, ReportRead, ReportUpdate, ReportWorkItemPayload
+from .report import PhotoRead, ReportCreate, ReportRead, ReportUpdate, ReportWorkItemPayload
+from .report_batch import ReportBatchItem, ReportBatchItemResult, ReportBatchResult
+from .report_upload import (
+    PhotoUploadSlot,
+    PresignedUploadRead,
+    ReportConfirm,
+    ReportUploadRequest,
+    ReportUploadTicket,
+    UploadStats,
+)
 from .root import RootInfo
 from .site import SiteRead, SiteWrite
 from .work_type import WorkTypeRead, WorkTypeWrite
@@ -12,11 +21,22 @@ __all__ = [
     "LoginRequest",
     "LoginResponse",
     "PtoEngineerCreate",
+    "UploadStats",
+    "UserCacheStats",
     "UserOut",
     "SiteReportHistoryItemRead",
+    "PhotoRead",
+    "PhotoUploadSlot",
+    "PresignedUploadRead",
+    "ReportBatchItem",
+    "ReportBatchItemResult",
+    "ReportBatchResult",
+    "ReportConfirm",
     "ReportCreate",
     "ReportRead",
     "ReportUpdate",
+    "ReportUploadRequest",
+    "ReportUploadTicket",
     "ReportWorkItemPayload",
     "RootInfo",
     "SiteRead",
@@ -52,3 +52,9 @@ class LoginResponse(BaseModel):
     access_token: str
     token_type: str = "bearer"
     user: UserOut
+
+
+class UserCacheStats(BaseModel):
+    size: int
+    hits: int
+    misses: int
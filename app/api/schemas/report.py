@@ -3,13 +3,12 @@ from __future__ import annotations
 
 import json
 from datetime import date, datetime
-from typing import List
+from typing import Dict, List
 
 from fastapi import Form, HTTPException, status
-from pydantic import BaseModel, Field, constr, model_validator
+from pydantic import BaseModel, Field, computed_field, constr, model_validator
 
 from app.domain.entities.report import Report
-from dataclasses import asdict
 
 
 class ReportWorkItemPayload(BaseModel):
@@ -69,6 +68,20 @@ class ReportCreate(BaseModel):
         )
 
 
+class PhotoRead(BaseModel):
+    url: str
+    thumb_url: str | None = Field(None, description="Small JPEG for lists; null until rendered")
+    medium_url: str | None = Field(None, description="Screen-sized WebP; null until rendered")
+
+
+def photo_reads(photo_urls: List[str], photo_variants: Dict[str, Dict[str, str]]) -> List[PhotoRead]:
+    reads = []
+    for url in photo_urls:
+        variants = photo_variants.get(url, {})
+        reads.append(PhotoRead(url=url, thumb_url=variants.get("thumb"), medium_url=variants.get("medium")))
+    return reads
+
+
 class ReportRead(BaseModel):
     id: str
     user_id: str
@@ -81,11 +94,19 @@ class ReportRead(BaseModel):
     machines: str
     created_at: datetime
     photo_urls: List[str]
+    photo_variants: Dict[str, Dict[str, str]] = Field(default_factory=dict, exclude=True)
     work_items: List[ReportWorkItemPayload] = Field(default_factory=list)
 
+    @computed_field
+    @property
+    def photos(self) -> List[PhotoRead]:
+        """``photo_urls`` in the same order, with their resized variants."""
+        return photo_reads(self.photo_urls, self.photo_variants)
+
     @classmethod
     def from_entity(cls, report: Report) -> "ReportRead":
-        return cls(**asdict(report))
+        # Read attributes straight off the dataclass; asdict() would deep-copy every work item first.
+        return cls.model_validate(report, from_attributes=True)
 
 
 class ReportUpdate(BaseModel):
@@ -0,0 +1,30 @@
+"""Schemas for submitting a batch of reports queued while offline."""
+from __future__ import annotations
+
+from typing import List
+
+from pydantic import BaseModel, Field, conint
+
+from .report import ReportCreate, ReportRead
+
+
+class ReportBatchItem(ReportCreate):
+    photo_indexes: List[conint(ge=0)] = Field(
+        ...,
+        min_length=1,
+        max_length=50,
+        description="Positions of this report's files among the uploaded photos",
+    )
+
+
+class ReportBatchItemResult(BaseModel):
+    index: int = Field(..., description="Position of the report in the submitted batch")
+    status_code: int = Field(..., description="201 when the report was created, otherwise why it was not")
+    report: ReportRead | None = None
+    detail: str | None = None
+
+
+class ReportBatchResult(BaseModel):
+    created: int
+    rejected: int
+    items: List[ReportBatchItemResult]
@@ -1,14 +1,13 @@
 """Response schemas for site report history."""
 from __future__ import annotations
 
-from dataclasses import asdict
 from datetime import date, datetime
-from typing import List
+from typing import Dict, List
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, computed_field
 
 from app.domain.entities import ReportHistoryItem
-from .report import ReportWorkItemPayload
+from .report import PhotoRead, ReportWorkItemPayload, photo_reads
 
 
 class SiteReportHistoryItemRead(BaseModel):
@@ -23,10 +22,17 @@ class SiteReportHistoryItemRead(BaseModel):
     volume: str
     machines: str
     photo_urls: List[str]
+    photo_variants: Dict[str, Dict[str, str]] = Field(default_factory=dict, exclude=True)
     author_id: str
     author_name: str
     work_items: List[ReportWorkItemPayload]
 
+    @computed_field
+    @property
+    def photos(self) -> List[PhotoRead]:
+        return photo_reads(self.photo_urls, self.photo_variants)
+
     @classmethod
     def from_entity(cls, item: ReportHistoryItem) -> "SiteReportHistoryItemRead":
-        return cls(**asdict(item))
+        # Read attributes straight off the dataclass; asdict() would deep-copy every work item first.
+        return cls.model_validate(item, from_attributes=True)
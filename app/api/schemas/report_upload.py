@@ -0,0 +1,54 @@
+"""Schemas for the direct-to-storage photo upload flow."""
+from __future__ import annotations
+
+from datetime import date
+from typing import Dict, List
+
+from pydantic import BaseModel, Field, constr
+
+from app.domain.entities import PresignedUpload
+from .report import ReportCreate
+
+
+class PhotoUploadSlot(BaseModel):
+    filename: constr(min_length=1, max_length=255) = Field(..., description="Original file name")
+    content_type: constr(max_length=127) | None = Field("image/jpeg", description="MIME type the client will PUT")
+    size: int = Field(..., ge=1, description="Size of the file in bytes; the signed PUT accepts no other length")
+
+
+class ReportUploadRequest(BaseModel):
+    site_id: constr(min_length=1, max_length=64) = Field(..., description="Identifier of the construction site")
+    report_date: date = Field(..., description="Date when work was performed")
+    photos: List[PhotoUploadSlot] = Field(..., min_length=1, max_length=50)
+
+
+class PresignedUploadRead(BaseModel):
+    key: str
+    url: str
+    headers: Dict[str, str] = Field(default_factory=dict, description="Headers to send with the PUT")
+
+    @classmethod
+    def from_entity(cls, upload: PresignedUpload) -> "PresignedUploadRead":
+        return cls(key=upload.key, url=upload.url, headers=dict(upload.headers))
+
+
+class ReportUploadTicket(BaseModel):
+    report_id: str
+    reservation: str = Field(..., description="Pass back unchanged to POST /reports/{report_id}/confirm")
+    expires_in: int = Field(..., description="Seconds the upload URLs stay valid")
+    uploads: List[PresignedUploadRead]
+
+
+class UploadStats(BaseModel):
+    in_flight_bytes: int
+    max_in_flight_bytes: int
+    in_flight_requests: int
+    rejected: int
+    storage_workers: int = 0
+    storage_queue_depth: int = Field(0, description="Storage calls waiting for a free I/O thread")
+    storage_running: int = 0
+
+
+class ReportConfirm(ReportCreate):
+    reservation: constr(min_length=1, max_length=128) = Field(..., description="From the upload ticket")
+    photo_keys: List[constr(min_length=1, max_length=1024)] = Field(..., min_length=1, max_length=50)
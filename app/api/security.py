@@ -6,23 +6,23 @@ from typing import Annotated
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from jose import JWTError
-from sqlalchemy.orm import Session
 
+from app.api.deps import UserCacheDep, get_user_repository
 from app.application.auth.security import decode_access_token
 from app.config import Settings, get_settings
 from app.domain.entities import User
-from app.infrastructure.database import get_db
-from app.infrastructure.users import SqlAlchemyUserRepository
+from app.domain.ports import UserRepository
 
 security_scheme = HTTPBearer(auto_error=False)
 SettingsDep = Annotated[Settings, Depends(get_settings)]
-SessionDep = Annotated[Session, Depends(get_db)]
+UserRepositoryDep = Annotated[UserRepository, Depends(get_user_repository)]
 CredentialsDep = Annotated[HTTPAuthorizationCredentials | None, Depends(security_scheme)]
 
 
-def get_current_user(
+async def get_current_user(
     credentials: CredentialsDep,
-    db: SessionDep,
+    users: UserRepositoryDep,
+    cache: UserCacheDep,
     settings: SettingsDep,
 ) -> User:
     if credentials is None:
@@ -50,7 +50,11 @@ def get_current_user(
             detail="Токен не содержит идентификатор пользователя",
         )
 
-    user = SqlAlchemyUserRepository(db).get_by_id(str(user_id))
+    user = cache.get(str(user_id))
+    if user is None:
+        user = await users.get_by_id(str(user_id))
+        if user is not None:
+            cache.put(user)
     if user is None or not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
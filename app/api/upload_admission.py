@@ -0,0 +1,76 @@
+"""Admission of multipart photo uploads before their body is read."""
+from __future__ import annotations
+
+from typing import Mapping
+
+from fastapi import HTTPException, status
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.application.upload_budget import UploadBudget
+
+UPLOAD_METHODS = {"POST", "PATCH", "PUT"}
+
+
+class UploadAdmissionMiddleware:
+    """Reserves ``Content-Length`` bytes of the upload budget for each multipart request.
+
+    FastAPI parses and spools a multipart body before any dependency runs, so the
+    budget is checked here, ahead of the route: a request that does not fit is
+    answered without reading its body. The reservation lasts until the response
+    is sent. Multipart requests must declare their length. A path in ``limits``
+    accepts no more than its own byte limit, so one request there cannot take
+    the whole budget; larger requests get 413 and have to be split.
+    """
+
+    def __init__(self, app: ASGIApp, *, budget: UploadBudget, limits: Mapping[str, int] | None = None) -> None:
+        self.app = app
+        self.budget = budget
+        self.limits = dict(limits or {})
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in UPLOAD_METHODS:
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        if not headers.get("content-type", "").lower().startswith("multipart/form-data"):
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            nbytes = self._content_length(headers)
+            self._check_limit(scope["path"], nbytes)
+            self.budget.admit(nbytes)
+        except HTTPException as exc:
+            response = JSONResponse({"detail": exc.detail}, status_code=exc.status_code, headers=exc.headers)
+            await response(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.budget.release(nbytes)
+
+    def _check_limit(self, path: str, nbytes: int) -> None:
+        max_bytes = self.limits.get(path.rstrip("/") or "/")
+        if max_bytes is not None and nbytes > max_bytes:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Запрос больше {max_bytes} байт: разделите его на несколько запросов",
+            )
+
+    @staticmethod
+    def _content_length(headers: Headers) -> int:
+        value = headers.get("content-length")
+        if value is None:
+            raise HTTPException(
+                status_code=status.HTTP_411_LENGTH_REQUIRED,
+                detail="Для загрузки фото нужен заголовок Content-Length",
+            )
+        try:
+            length = int(value)
+        except ValueError:
+            length = -1
+        if length < 0:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Некорректный Content-Length")
+        return length
@@ -1,10 +1,14 @@
-from .dto import ReportCreateCommand, ReportWorkItemCommand
+from .dto import ReportBatchEntry, ReportBatchOutcome, ReportCreateCommand, ReportWorkItemCommand
+from .pagination import Page
 from .report_history_service import ReportHistoryService
 from .report_service import ReportService
 from .site_service import SiteService
 from .work_type_service import WorkTypeService
 
 __all__ = [
+    "Page",
+    "ReportBatchEntry",
+    "ReportBatchOutcome",
     "ReportCreateCommand",
     "ReportWorkItemCommand",
     "ReportHistoryService",
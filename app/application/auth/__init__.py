@@ -1,11 +1,13 @@
 from .auth_service import AuthService, InvalidCredentialsError, LoginResult
 from .phone import normalize_phone
 from .security import decode_access_token, hash_password, verify_password
+from .user_cache import UserCache
 
 __all__ = [
     "AuthService",
     "InvalidCredentialsError",
     "LoginResult",
+    "UserCache",
     "normalize_phone",
     "decode_access_token",
     "hash_password",
@@ -33,8 +33,8 @@ class AuthService:
         self._algorithm = jwt_algorithm
         self._expires = token_expires_minutes
 
-    def login(self, phone: str, password: str) -> LoginResult:
-        user = self._repo.get_by_phone(normalize_phone(phone))
+    async def login(self, phone: str, password: str) -> LoginResult:
+        user = await self._repo.get_by_phone(normalize_phone(phone))
 
         if user is None or not user.is_active:
             raise InvalidCredentialsError
@@ -0,0 +1,58 @@
+"""In-process TTL cache of authenticated users."""
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Tuple
+
+from app.domain.entities import User
+
+
+class UserCache:
+    """Maps user id to ``User`` for ``ttl_seconds``; ``ttl_seconds=0`` disables caching.
+
+    The cache lives in one worker process, so changes made through another worker
+    only become visible once the entry expires.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl_seconds: float,
+        max_size: int = 1024,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._ttl_seconds = ttl_seconds
+        self._max_size = max_size
+        self._clock = clock
+        self._entries: OrderedDict[str, Tuple[float, User]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id: str) -> User | None:
+        entry = self._entries.get(user_id)
+        if entry is not None:
+            expires_at, user = entry
+            if expires_at > self._clock():
+                self.hits += 1
+                return user
+            del self._entries[user_id]
+        self.misses += 1
+        return None
+
+    def put(self, user: User) -> None:
+        if self._ttl_seconds <= 0:
+            return
+        self._entries[user.id] = (self._clock() + self._ttl_seconds, user)
+        self._entries.move_to_end(user.id)
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: str) -> None:
+        self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
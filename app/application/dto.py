@@ -4,6 +4,10 @@ from __future__ import annotations
 from datetime import date
 from dataclasses import dataclass, field
 
+from fastapi import UploadFile
+
+from app.domain.entities import Report
+
 
 @dataclass(slots=True)
 class ReportWorkItemCommand:
@@ -26,3 +30,20 @@ class ReportCreateCommand:
     volume: str
     machines: str
     work_items: list[ReportWorkItemCommand] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class ReportBatchEntry:
+    """One report of a batch submission with its own photos."""
+
+    command: ReportCreateCommand
+    photos: list[UploadFile] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class ReportBatchOutcome:
+    """What became of one ``ReportBatchEntry``: the created report, or why it was rejected."""
+
+    report: Report | None = None
+    status_code: int = 201
+    detail: str | None = None
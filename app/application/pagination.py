@@ -0,0 +1,54 @@
+"""Opaque keyset cursors and page containers for report listings."""
+from __future__ import annotations
+
+import base64
+import json
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Generic, List, Sequence, TypeVar
+
+from fastapi import HTTPException, status
+
+from app.domain.entities import ReportCursor
+
+T = TypeVar("T")
+
+
+@dataclass(slots=True)
+class Page(Generic[T]):
+    items: List[T] = field(default_factory=list)
+    next_cursor: str | None = None
+
+
+def encode_cursor(cursor: ReportCursor) -> str:
+    raw = [cursor.created_at.isoformat(), cursor.id]
+    if cursor.report_date is not None:
+        raw.append(cursor.report_date.isoformat())
+    return base64.urlsafe_b64encode(json.dumps(raw, separators=(",", ":")).encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str | None) -> ReportCursor | None:
+    if not token:
+        return None
+    try:
+        raw = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+        return ReportCursor(
+            created_at=datetime.fromisoformat(raw[0]),
+            id=str(raw[1]),
+            report_date=date.fromisoformat(raw[2]) if len(raw) > 2 else None,
+        )
+    except (ValueError, TypeError, IndexError, KeyError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Некорректный курсор пагинации",
+        )
+
+
+def build_page(rows: Sequence[T], *, limit: int, cursor_of) -> Page[T]:
+    """Trim a ``limit + 1`` fetch to ``limit`` items and derive the next cursor from the last one."""
+
+    items = list(rows)
+    if len(items) <= limit:
+        return Page(items=items)
+    items = items[:limit]
+    return Page(items=items, next_cursor=encode_cursor(cursor_of(items[-1])))
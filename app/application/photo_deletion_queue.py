@@ -0,0 +1,101 @@
+"""Background deletion of photos that no report references any more."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from contextlib import AbstractAsyncContextManager
+from typing import Callable, Iterable, List
+
+from app.domain.ports import StoragePort, UnitOfWork
+
+logger = logging.getLogger(__name__)
+
+
+class PhotoDeletionQueue:
+    """Collects photo URLs from requests and deletes them from a single worker task.
+
+    URLs submitted within ``max_delay_seconds`` of each other share one
+    ``delete_many`` call, so deletes from several requests become one batch.
+    References are checked right before each batch, under the photo key locks
+    (``ReportRepository.claim_unreferenced_photo_urls``), in a unit of work of its
+    own: a URL that an upload reused after it was submitted is kept. The queue
+    lives in one worker process. URLs still queued when the process dies are left
+    in the bucket for ``scripts.gc_storage`` to collect.
+    """
+
+    def __init__(
+        self,
+        storage: StoragePort,
+        unit_of_work: Callable[[], AbstractAsyncContextManager[UnitOfWork]],
+        *,
+        batch_size: int = 1000,
+        max_delay_seconds: float = 0.5,
+    ) -> None:
+        self._storage = storage
+        self._unit_of_work = unit_of_work
+        self._batch_size = batch_size
+        self._max_delay_seconds = max_delay_seconds
+        # None is the shutdown sentinel put by ``close``.
+        self._queue: asyncio.Queue[str | None] = asyncio.Queue()
+        self._worker: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._worker is None:
+            self._worker = asyncio.create_task(self._run(), name="photo-deletion-queue")
+
+    def submit(self, urls: Iterable[str]) -> None:
+        for url in urls:
+            self._queue.put_nowait(url)
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    async def close(self) -> None:
+        """Delete whatever is still queued, then stop the worker."""
+
+        self._queue.put_nowait(None)
+        if self._worker is None:
+            await self._run()
+        else:
+            await self._worker
+            self._worker = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            first = await self._queue.get()
+            if first is None:
+                return
+            batch: List[str] = [first]
+            deadline = loop.time() + self._max_delay_seconds
+            while len(batch) < self._batch_size and not stopping:
+                if not self._queue.empty():
+                    url = self._queue.get_nowait()
+                else:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        url = await asyncio.wait_for(self._queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                if url is None:
+                    stopping = True
+                else:
+                    batch.append(url)
+            await self._delete(batch)
+
+    async def _delete(self, urls: List[str]) -> None:
+        try:
+            # The locks are released when the unit of work closes, after the delete.
+            async with self._unit_of_work() as unit_of_work:
+                unused = await unit_of_work.reports.claim_unreferenced_photo_urls(urls)
+                if unused:
+                    await self._storage.delete_many(unused)
+        except Exception:
+            # The rows are already gone, so the objects are orphans now; the GC job collects them.
+            logger.exception("Background deletion of %d photo(s) failed", len(urls))
+        else:
+            logger.info("Deleted %d of %d queued photo(s) in the background", len(unused), len(urls))
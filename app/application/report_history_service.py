@@ -2,19 +2,34 @@
 from __future__ import annotations
 
 from datetime import date
-from typing import Iterable
+from typing import AsyncIterator
 
 from fastapi import HTTPException, status
 
-from app.domain.entities import ReportHistoryItem, User
-from app.domain.ports import ReportRepository
+from app.application.pagination import Page, build_page, decode_cursor
+from app.domain.entities import ReportCursor, ReportHistoryItem, User
+from app.domain.ports import USERS_SCOPE, WORK_TYPES_SCOPE, DataVersionRepository, ReportRepository
 from app.application.site_service import SiteService
 
 
 class ReportHistoryService:
-    def __init__(self, repository: ReportRepository, site_service: SiteService) -> None:
+    def __init__(
+        self,
+        repository: ReportRepository,
+        site_service: SiteService,
+        versions: DataVersionRepository,
+    ) -> None:
         self._repository = repository
         self._site_service = site_service
+        self._versions = versions
+
+    async def get_site_report_history_version(self, *, user: User, site_id: str) -> tuple[int, int, int]:
+        """Data versions behind the site history, checked against access like the history itself."""
+
+        await self._site_service.get_site_access_for_user(site_id=site_id, user=user)
+        scopes = await self._versions.get_versions(USERS_SCOPE, WORK_TYPES_SCOPE)
+        reports_version = await self._versions.get_site_reports_version(site_id)
+        return reports_version, scopes[USERS_SCOPE], scopes[WORK_TYPES_SCOPE]
 
     async def get_site_report_history(
         self,
@@ -24,20 +39,82 @@ class ReportHistoryService:
         date_from: date | None = None,
         date_to: date | None = None,
         work_type_id: str | None = None,
-        limit: int | None = None,
-    ) -> Iterable[ReportHistoryItem]:
-        self._site_service.get_site_for_user(site_id=site_id, user=user)
+        cursor: str | None = None,
+        limit: int = 100,
+        fields: frozenset[str] | None = None,
+    ) -> Page[ReportHistoryItem]:
+        position = await self._check_history_request(
+            user=user,
+            site_id=site_id,
+            date_from=date_from,
+            date_to=date_to,
+            cursor=cursor,
+        )
+        items = await self._repository.list_history_by_site(
+            site_id=site_id,
+            date_from=date_from.isoformat() if date_from else None,
+            date_to=date_to.isoformat() if date_to else None,
+            work_type_id=work_type_id,
+            cursor=position,
+            limit=limit + 1,
+            fields=fields,
+        )
+        return build_page(
+            list(items),
+            limit=limit,
+            cursor_of=lambda item: ReportCursor(created_at=item.created_at, id=item.id, report_date=item.report_date),
+        )
 
-        if date_from and date_to and date_from > date_to:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Дата начала не может быть позже даты окончания",
-            )
+    async def stream_site_report_history(
+        self,
+        *,
+        user: User,
+        site_id: str,
+        date_from: date | None = None,
+        date_to: date | None = None,
+        work_type_id: str | None = None,
+        cursor: str | None = None,
+        fields: frozenset[str] | None = None,
+    ) -> AsyncIterator[ReportHistoryItem]:
+        """The whole history without pages; access and filters are checked before the first row."""
 
-        return await self._repository.list_history_by_site(
+        position = await self._check_history_request(
+            user=user,
+            site_id=site_id,
+            date_from=date_from,
+            date_to=date_to,
+            cursor=cursor,
+        )
+        return self._repository.stream_history_by_site(
             site_id=site_id,
             date_from=date_from.isoformat() if date_from else None,
             date_to=date_to.isoformat() if date_to else None,
             work_type_id=work_type_id,
-            limit=limit,
+            cursor=position,
+            fields=fields,
         )
+
+    async def _check_history_request(
+        self,
+        *,
+        user: User,
+        site_id: str,
+        date_from: date | None,
+        date_to: date | None,
+        cursor: str | None,
+    ) -> ReportCursor | None:
+        await self._site_service.get_site_access_for_user(site_id=site_id, user=user)
+
+        if date_from and date_to and date_from > date_to:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Дата начала не может быть позже даты окончания",
+            )
+
+        position = decode_cursor(cursor)
+        if position is not None and position.report_date is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Некорректный курсор пагинации",
+            )
+        return position
@@ -3,17 +3,24 @@ from __future__ import annotations
 
 import asyncio
 import logging
+from contextlib import asynccontextmanager
+from datetime import date
 from time import perf_counter
-from typing import Iterable, List, Sequence
+from typing import AsyncIterator, Dict, Iterable, List, Sequence
 
 from fastapi import UploadFile
 from fastapi import HTTPException, status
 
-from app.application.dto import ReportCreateCommand
-from app.domain.entities import ReportWorkItem, User
+from app.application.dto import ReportBatchEntry, ReportBatchOutcome, ReportCreateCommand
+from app.application.pagination import Page, build_page, decode_cursor
+from app.application.photo_deletion_queue import PhotoDeletionQueue
+from app.application.upload_budget import UploadBudget
+from app.application.upload_reservation import UploadReservations
+from app.domain.entities import PresignedUpload, ReportCursor, ReportWorkItem, SiteAccess, StoredPhoto, User
 from app.domain.entities.report import Report
 from app.application.site_service import SiteService
-from app.domain.ports import Clock, ReportRepository, StoragePort
+from app.application.work_type_service import WorkTypeService
+from app.domain.ports import Clock, ReportRepository, StoragePort, UnitOfWork
 
 logger = logging.getLogger(__name__)
 
@@ -28,11 +35,29 @@ class ReportService:
         storage: StoragePort,
         clock: Clock,
         site_service: SiteService,
+        work_type_service: WorkTypeService,
+        unit_of_work: UnitOfWork,
+        reservations: UploadReservations,
+        max_page_size: int = 500,
+        deletion_queue: PhotoDeletionQueue | None = None,
+        upload_concurrency: int = 4,
+        max_photo_bytes: int = 50 * 1024 * 1024,
+        upload_budget: UploadBudget | None = None,
     ) -> None:
         self._repository = repository
+        self._unit_of_work = unit_of_work
+        self._reservations = reservations
         self._storage = storage
         self._clock = clock
         self._site_service = site_service
+        self._work_type_service = work_type_service
+        self._max_page_size = max_page_size
+        self._deletion_queue = deletion_queue
+        self._upload_concurrency = upload_concurrency
+        self._max_photo_bytes = max_photo_bytes
+        self._upload_budget = upload_budget
+        # Uploads run concurrently but share the request's session; its statements must not overlap.
+        self._session_lock = asyncio.Lock()
 
     @staticmethod
     def _normalize_work_items(
@@ -74,22 +99,294 @@ class ReportService:
     async def create_report(self, payload: ReportCreateCommand, photos: Sequence[UploadFile]) -> Report:
         started_at = perf_counter()
         report_id = await self._repository.next_id()
-        site = self._site_service.get_site(payload.site_id)
-        photo_urls: List[str] = list(
+        site = await self._site_service.get_site_access(payload.site_id)
+        await self._work_type_service.ensure_work_types_exist(
+            [payload.work_type_id, *(item.work_type_id for item in payload.work_items or [])]
+        )
+        stored = await self._upload_photos(
+            photos,
+            site_id=payload.site_id,
+            site_name=site.name,
+            report_id=report_id,
+            report_date=payload.report_date,
+        )
+        return await self._save_new_report(payload, report_id=report_id, photos=stored, started_at=started_at)
+
+    async def _upload_photos(
+        self,
+        photos: Sequence[UploadFile],
+        *,
+        site_id: str,
+        site_name: str | None,
+        report_id: str,
+        report_date: date,
+    ) -> List[StoredPhoto]:
+        """Upload ``photos``, ``upload_concurrency`` at a time.
+
+        The request was admitted against the process upload budget before its body
+        was read; see ``app.api.upload_admission``.
+        """
+
+        if not photos:
+            return []
+        return await self._store_photos(
+            photos,
+            asyncio.Semaphore(self._upload_concurrency),
+            site_id=site_id,
+            site_name=site_name,
+            report_id=report_id,
+            report_date=report_date,
+        )
+
+    async def _store_photos(
+        self,
+        photos: Sequence[UploadFile],
+        limit: asyncio.Semaphore,
+        *,
+        site_id: str,
+        site_name: str | None,
+        report_id: str,
+        report_date: date,
+    ) -> List[StoredPhoto]:
+        async def upload(photo: UploadFile) -> StoredPhoto:
+            async with limit:
+                return await self._storage.upload(
+                    photo,
+                    site_id=site_id,
+                    site_name=site_name,
+                    report_id=report_id,
+                    report_date=report_date,
+                    lock=self._lock_photo,
+                )
+
+        return list(await asyncio.gather(*(upload(photo) for photo in photos)))
+
+    async def _lock_photo(self, url: str) -> None:
+        """Keep ``url`` from being deleted as unreferenced until this request commits.
+
+        Content-addressed objects are shared, so the one an upload reuses may be
+        the one another request just stopped referencing.
+        """
+
+        async with self._session_lock:
+            await self._repository.lock_photo_urls([url])
+
+    async def create_reports(self, entries: Sequence[ReportBatchEntry], *, user: User) -> List[ReportBatchOutcome]:
+        """Create a batch of reports queued by a contractor while offline; one outcome per entry, in order.
+
+        Every entry is checked before any upload: site access once per site, work
+        types against the catalogue. Rejected entries do not stop the others. The
+        photos of all accepted entries share the per-request upload concurrency,
+        and the reports are inserted and committed together.
+        """
+
+        started_at = perf_counter()
+        outcomes = [ReportBatchOutcome() for _ in entries]
+        sites: Dict[str, SiteAccess | HTTPException] = {}
+        for site_id in dict.fromkeys(entry.command.site_id for entry in entries):
+            try:
+                sites[site_id] = await self._site_service.get_site_access_for_user(site_id=site_id, user=user)
+            except HTTPException as exc:
+                sites[site_id] = exc
+
+        accepted: List[tuple[int, str]] = []
+        for index, entry in enumerate(entries):
+            payload = entry.command
+            site = sites[payload.site_id]
+            if isinstance(site, HTTPException):
+                outcomes[index] = self._rejected(site)
+                continue
+            try:
+                await self._work_type_service.ensure_work_types_exist(
+                    [payload.work_type_id, *(item.work_type_id for item in payload.work_items or [])]
+                )
+            except HTTPException as exc:
+                outcomes[index] = self._rejected(exc)
+                continue
+            accepted.append((index, await self._repository.next_id()))
+
+        limit = asyncio.Semaphore(self._upload_concurrency)
+        uploads = await asyncio.gather(
+            *(
+                self._store_photos(
+                    entries[index].photos,
+                    limit,
+                    site_id=entries[index].command.site_id,
+                    site_name=sites[entries[index].command.site_id].name,
+                    report_id=report_id,
+                    report_date=entries[index].command.report_date,
+                )
+                for index, report_id in accepted
+            ),
+            return_exceptions=True,
+        )
+
+        reports: List[Report] = []
+        photo_count = 0
+        for (index, report_id), stored in zip(accepted, uploads):
+            if isinstance(stored, BaseException):
+                if not isinstance(stored, Exception):
+                    raise stored
+                logger.error("Could not upload photos of batch report %s", report_id, exc_info=stored)
+                outcomes[index] = ReportBatchOutcome(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Не удалось загрузить фото отчёта, повторите отправку",
+                )
+                continue
+            report = self._new_report(entries[index].command, report_id=report_id, photos=stored)
+            outcomes[index] = ReportBatchOutcome(report=report)
+            reports.append(report)
+            photo_count += len(stored)
+
+        if reports:
+            await self._repository.add_many(reports)
+            await self._unit_of_work.commit()
+        logger.info(
+            "Created %d of %d batch reports with %d photos in %.3fs",
+            len(reports),
+            len(entries),
+            photo_count,
+            perf_counter() - started_at,
+        )
+        return outcomes
+
+    async def start_photo_upload(
+        self,
+        *,
+        user_id: str,
+        site_id: str,
+        report_date: date,
+        photos: Sequence[tuple[str, str | None, int]],
+    ) -> tuple[str, str, List[PresignedUpload]]:
+        """Reserve a report id and sign one direct PUT per ``(filename, content_type, size)``.
+
+        Returns the report id, the signed reservation ``confirm_report`` requires, and the uploads.
+        """
+
+        for filename, _, size in photos:
+            if size > self._max_photo_bytes:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Фото {filename} больше допустимых {self._max_photo_bytes} байт",
+                )
+        report_id = await self._repository.next_id()
+        site = await self._site_service.get_site_access(site_id)
+        uploads = [
+            await self._storage.presign_upload(
+                filename=filename,
+                content_type=content_type,
+                size=size,
+                site_id=site_id,
+                site_name=site.name,
+                report_id=report_id,
+                report_date=report_date,
+            )
+            for filename, content_type, size in photos
+        ]
+        reservation = self._reservations.issue(
+            report_id=report_id,
+            site_id=site_id,
+            report_date=report_date,
+            user_id=user_id,
+        )
+        return report_id, reservation, uploads
+
+    async def confirm_report(
+        self,
+        payload: ReportCreateCommand,
+        *,
+        report_id: str,
+        reservation: str,
+        photo_keys: Sequence[str],
+    ) -> Report:
+        """Create a report whose photos were already PUT to storage after ``start_photo_upload``.
+
+        ``reservation`` must be the one issued for this report id, user, site and date.
+        """
+
+        started_at = perf_counter()
+        self._reservations.verify(
+            reservation,
+            report_id=report_id,
+            site_id=payload.site_id,
+            report_date=payload.report_date,
+            user_id=payload.user_id,
+        )
+        await self._site_service.get_site_access(payload.site_id)
+        await self._work_type_service.ensure_work_types_exist(
+            [payload.work_type_id, *(item.work_type_id for item in payload.work_items or [])]
+        )
+        if await self._repository.get_by_id(report_id) is not None:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Отчёт уже создан")
+
+        stored = list(
             await asyncio.gather(
                 *(
-                    self._storage.upload(
-                        photo,
+                    self._storage.confirm_upload(
+                        key,
                         site_id=payload.site_id,
-                        site_name=site.name,
                         report_id=report_id,
                         report_date=payload.report_date,
+                        reserve=self._reserve_download,
                     )
-                    for photo in photos
-                )
+                    for key in dict.fromkeys(photo_keys)
+                ),
+                # Let every download finish (and release its bytes) before failing the request.
+                return_exceptions=True,
             )
         )
-        created_at = self._clock.now()
+        for result in stored:
+            if isinstance(result, BaseException):
+                raise result
+        if None in stored:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Загруженное фото не найдено в хранилище",
+            )
+        return await self._save_new_report(payload, report_id=report_id, photos=stored, started_at=started_at)
+
+    @asynccontextmanager
+    async def _reserve_download(self, size: int) -> AsyncIterator[None]:
+        """Admit a directly uploaded photo the storage downloads to render its variants.
+
+        Confirm is a JSON request, so ``app.api.upload_admission`` never counted
+        these bytes; each photo takes its share of the upload budget here instead.
+        """
+
+        if size > self._max_photo_bytes:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Загруженное фото больше допустимых {self._max_photo_bytes} байт",
+            )
+        if self._upload_budget is None:
+            yield
+            return
+        self._upload_budget.admit(size)
+        try:
+            yield
+        finally:
+            self._upload_budget.release(size)
+
+    async def _save_new_report(
+        self,
+        payload: ReportCreateCommand,
+        *,
+        report_id: str,
+        photos: List[StoredPhoto],
+        started_at: float,
+    ) -> Report:
+        report = self._new_report(payload, report_id=report_id, photos=photos)
+        await self._repository.add(report)
+        await self._unit_of_work.commit()
+        logger.info(
+            "Created report %s with %d photos in %.3fs",
+            report.id,
+            len(photos),
+            perf_counter() - started_at,
+        )
+        return report
+
+    def _new_report(self, payload: ReportCreateCommand, *, report_id: str, photos: Sequence[StoredPhoto]) -> Report:
         work_items = self._normalize_work_items(
             report_id=report_id,
             work_type_id=payload.work_type_id,
@@ -99,8 +396,7 @@ class ReportService:
             machines=payload.machines,
             work_items=payload.work_items,
         )
-
-        report = Report(
+        return Report(
             id=report_id,
             user_id=payload.user_id,
             site_id=payload.site_id,
@@ -110,18 +406,51 @@ class ReportService:
             people=payload.people,
             volume=payload.volume,
             machines=payload.machines,
-            created_at=created_at,
-            photo_urls=photo_urls,
+            created_at=self._clock.now(),
+            photo_urls=self._unique_urls(photo.url for photo in photos),
+            photo_variants=self._variants_by_url(photos),
             work_items=work_items,
         )
-        await self._repository.add(report)
-        logger.info(
-            "Created report %s with %d photos in %.3fs",
-            report.id,
-            len(photo_urls),
-            perf_counter() - started_at,
-        )
-        return report
+
+    @staticmethod
+    def _rejected(exc: HTTPException) -> ReportBatchOutcome:
+        return ReportBatchOutcome(status_code=exc.status_code, detail=exc.detail)
+
+    @staticmethod
+    def _variants_by_url(photos: Sequence[StoredPhoto]) -> Dict[str, Dict[str, str]]:
+        return {photo.url: dict(photo.variants) for photo in photos if photo.variants}
+
+    @staticmethod
+    def _unique_urls(urls: Iterable[str]) -> List[str]:
+        # Identical photos share one content-addressed URL; list it once.
+        return list(dict.fromkeys(urls))
+
+    async def _delete_unreferenced(self, urls: Sequence[str]) -> None:
+        """Delete photos no report lists any more; run after the commit that dropped them.
+
+        The reference check and the delete run under ``claim_unreferenced_photo_urls``
+        locks, so an upload reusing one of the objects meanwhile either waits for the
+        delete (and stores the photo again) or keeps the object. The deletion queue
+        does the same check itself, right before each batch.
+        """
+
+        candidates = self._unique_urls(urls)
+        if not candidates:
+            return
+        if self._deletion_queue is not None:
+            self._deletion_queue.submit(candidates)
+            return
+        try:
+            unused = await self._repository.claim_unreferenced_photo_urls(candidates)
+            if unused:
+                await self._storage.delete_many(unused)
+        except Exception:
+            # The commit already happened: failing the request now would misreport it,
+            # and the leftover objects are orphans for scripts.gc_storage.
+            logger.exception("Could not delete %d unreferenced photo(s)", len(candidates))
+        finally:
+            # Ends the transaction and with it the locks.
+            await self._unit_of_work.rollback()
 
     async def list_reports(
         self,
@@ -129,8 +458,43 @@ class ReportService:
         site_id: str | None,
         user_id: str | None,
         work_type_id: str | None,
-    ) -> Iterable[Report]:
-        return await self._repository.list(site_id=site_id, user_id=user_id, work_type_id=work_type_id)
+        cursor: str | None = None,
+        limit: int | None = None,
+        fields: frozenset[str] | None = None,
+    ) -> Page[Report]:
+        page_size = min(limit or self._max_page_size, self._max_page_size)
+        reports = await self._repository.list(
+            site_id=site_id,
+            user_id=user_id,
+            work_type_id=work_type_id,
+            cursor=decode_cursor(cursor),
+            limit=page_size + 1,
+            fields=fields,
+        )
+        return build_page(
+            list(reports),
+            limit=page_size,
+            cursor_of=lambda report: ReportCursor(created_at=report.created_at, id=report.id),
+        )
+
+    def stream_reports(
+        self,
+        *,
+        site_id: str | None,
+        user_id: str | None,
+        work_type_id: str | None,
+        cursor: str | None = None,
+        fields: frozenset[str] | None = None,
+    ) -> AsyncIterator[Report]:
+        """All matching reports in ``list_reports`` order, without pages; rows arrive as they are read."""
+
+        return self._repository.stream(
+            site_id=site_id,
+            user_id=user_id,
+            work_type_id=work_type_id,
+            cursor=decode_cursor(cursor),
+            fields=fields,
+        )
 
     async def update_report(
         self,
@@ -151,7 +515,7 @@ class ReportService:
         if existing is None:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Отчёт не найден")
 
-        site = self._site_service.get_site_for_user(site_id=existing.site_id, user=user)
+        site = await self._site_service.get_site_access_for_user(site_id=existing.site_id, user=user)
         if user.role not in {"admin", "pto_engineer"}:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -163,27 +527,19 @@ class ReportService:
                 detail="Нет доступа к редактированию этого отчёта",
             )
 
+        await self._work_type_service.ensure_work_types_exist(
+            [work_type_id, *(item.work_type_id for item in work_items or [])]
+        )
+
         keep_set = set(keep_photo_urls)
         removed_urls = [url for url in existing.photo_urls if url not in keep_set]
-        appended_urls: List[str] = []
-        if new_photos:
-            site = self._site_service.get_site(existing.site_id)
-            appended_urls = list(
-                await asyncio.gather(
-                    *(
-                        self._storage.upload(
-                            photo,
-                            site_id=existing.site_id,
-                            site_name=site.name,
-                            report_id=existing.id,
-                            report_date=report_date,
-                        )
-                        for photo in new_photos
-                    )
-                )
-            )
-        for url in removed_urls:
-            await self._storage.delete(url)
+        appended = await self._upload_photos(
+            new_photos,
+            site_id=existing.site_id,
+            site_name=site.name,
+            report_id=existing.id,
+            report_date=report_date,
+        )
 
         normalized_items = self._normalize_work_items(
             report_id=existing.id,
@@ -206,10 +562,19 @@ class ReportService:
             volume=volume,
             machines=machines,
             created_at=existing.created_at,
-            photo_urls=[url for url in existing.photo_urls if url in keep_set] + appended_urls,
+            photo_urls=self._unique_urls(
+                [*(url for url in existing.photo_urls if url in keep_set), *(photo.url for photo in appended)]
+            ),
+            photo_variants={
+                **{url: variants for url, variants in existing.photo_variants.items() if url in keep_set},
+                **self._variants_by_url(appended),
+            },
             work_items=normalized_items,
         )
-        return await self._repository.update(updated)
+        saved = await self._repository.update(updated)
+        await self._unit_of_work.commit()
+        await self._delete_unreferenced(removed_urls)
+        return saved
 
     async def delete_report(self, *, report_id: str, user: User) -> None:
         if user.role != "admin":
@@ -222,9 +587,8 @@ class ReportService:
         if existing is None:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Отчёт не найден")
 
-        for photo_url in existing.photo_urls:
-            await self._storage.delete(photo_url)
-
         deleted = await self._repository.delete(report_id)
         if not deleted:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Отчёт не найден")
+        await self._unit_of_work.commit()
+        await self._delete_unreferenced(existing.photo_urls)
@@ -6,23 +6,40 @@ from uuid import uuid4
 from fastapi import HTTPException, status
 from typing import Iterable
 
-from app.domain.entities import Site, User
-from app.domain.ports import SiteRepository
+from app.domain.entities import Site, SiteAccess, User
+from app.domain.ports import SITES_SCOPE, USERS_SCOPE, SiteRepository, UnitOfWork
 
 
 class SiteService:
-    def __init__(self, repository: SiteRepository) -> None:
+    def __init__(self, repository: SiteRepository, unit_of_work: UnitOfWork) -> None:
         self._repository = repository
+        self._unit_of_work = unit_of_work
 
-    def list_sites_for_user(self, user: User) -> Iterable[Site]:
+    async def list_sites_for_user(self, user: User, fields: frozenset[str] | None = None) -> Iterable[Site]:
         if user.role == "admin":
-            return self._repository.list_all()
+            return await self._repository.list_all(fields)
         if user.role == "pto_engineer":
-            return self._repository.list_by_pto_engineer(user.id)
-        return self._repository.list_by_contractor(user.id)
+            return await self._repository.list_by_pto_engineer(user.id, fields)
+        return await self._repository.list_by_contractor(user.id, fields)
 
-    def get_site(self, site_id: str) -> Site:
-        site = self._repository.get_by_id(site_id)
+    async def get_sites_version(self) -> tuple[int, int, int]:
+        """Data versions behind site listings; read them before the listing itself."""
+
+        versions = self._unit_of_work.versions
+        scopes = await versions.get_versions(SITES_SCOPE, USERS_SCOPE)
+        return scopes[SITES_SCOPE], scopes[USERS_SCOPE], await versions.get_site_reports_version()
+
+    async def get_site(self, site_id: str) -> Site:
+        site = await self._repository.get_by_id(site_id)
+        if site is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Объект не найден",
+            )
+        return site
+
+    async def get_site_access(self, site_id: str) -> SiteAccess:
+        site = await self._repository.get_access(site_id)
         if site is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -30,8 +47,8 @@ class SiteService:
             )
         return site
 
-    def get_site_for_user(self, *, site_id: str, user: User) -> Site:
-        site = self.get_site(site_id)
+    async def get_site_access_for_user(self, *, site_id: str, user: User) -> SiteAccess:
+        site = await self.get_site_access(site_id)
         if user.role == "admin":
             return site
 
@@ -51,7 +68,7 @@ class SiteService:
 
         return site
 
-    def create_site(
+    async def create_site(
         self,
         *,
         user: User,
@@ -86,9 +103,11 @@ class SiteService:
             contractor_id=contractor_id,
             pto_engineer_id=pto_engineer_id,
         )
-        return self._repository.create(site)
+        created = await self._repository.create(site)
+        await self._unit_of_work.commit()
+        return created
 
-    def update_site(
+    async def update_site(
         self,
         *,
         user: User,
@@ -108,14 +127,14 @@ class SiteService:
         pto_engineer_id: str | None,
     ) -> Site:
         self._ensure_admin(user)
-        existing = self._repository.get_by_id(site_id)
+        existing = await self._repository.get_by_id(site_id)
         if existing is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Объект не найден",
             )
 
-        updated = self._repository.update(
+        updated = await self._repository.update(
             Site(
                 id=existing.id,
                 name=name.strip(),
@@ -143,16 +162,18 @@ class SiteService:
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Объект не найден",
             )
+        await self._unit_of_work.commit()
         return updated
 
-    def delete_site(self, *, user: User, site_id: str) -> None:
+    async def delete_site(self, *, user: User, site_id: str) -> None:
         self._ensure_admin(user)
-        deleted = self._repository.delete(site_id)
+        deleted = await self._repository.delete(site_id)
         if not deleted:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Объект не найден",
             )
+        await self._unit_of_work.commit()
 
     @staticmethod
     def _ensure_admin(user: User) -> None:
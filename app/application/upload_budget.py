@@ -0,0 +1,58 @@
+"""Process-wide admission control for photo uploads."""
+from __future__ import annotations
+
+from typing import Dict
+
+from fastapi import HTTPException, status
+
+
+class UploadBudget:
+    """Caps the bytes of photo uploads in flight in this worker process.
+
+    A request reserves its whole body at once, by ``Content-Length``, before the
+    body is read (see ``app.api.upload_admission``), and never waits: when the
+    budget is exhausted it fails fast with 503 and ``Retry-After``, instead of
+    queueing behind other uploads while holding its spooled files. A request
+    larger than the whole budget can never fit and is refused with 413. Photos
+    that a confirm of a direct upload downloads to render are admitted one by
+    one, by their stored size (see ``ReportService.confirm_report``).
+    """
+
+    def __init__(self, *, max_bytes: int, retry_after_seconds: int = 5) -> None:
+        self._max_bytes = max_bytes
+        self._retry_after_seconds = retry_after_seconds
+        self._in_flight_bytes = 0
+        self._in_flight_requests = 0
+        self.rejected = 0
+
+    def admit(self, nbytes: int) -> None:
+        """Reserve ``nbytes`` or raise 413/503; every admitted request must ``release`` them."""
+
+        if nbytes > self._max_bytes:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Слишком большой запрос с фото: больше {self._max_bytes} байт",
+            )
+        # Check and update run without an await in between, so no lock is needed on one event loop.
+        if self._in_flight_bytes + nbytes > self._max_bytes:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Сервер перегружен загрузкой фото, повторите попытку позже",
+                headers={"Retry-After": str(self._retry_after_seconds)},
+            )
+        self._in_flight_bytes += nbytes
+        self._in_flight_requests += 1
+
+    def release(self, nbytes: int) -> None:
+        self._in_flight_bytes -= nbytes
+        self._in_flight_requests -= 1
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "in_flight_bytes": self._in_flight_bytes,
+            "max_in_flight_bytes": self._max_bytes,
+            "in_flight_requests": self._in_flight_requests,
+            "rejected": self.rejected,
+        }
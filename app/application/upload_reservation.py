@@ -0,0 +1,45 @@
+"""Signed reservations that bind a direct photo upload to the report it was issued for."""
+from __future__ import annotations
+
+import hashlib
+import hmac
+import time
+from datetime import date
+
+from fastapi import HTTPException, status
+
+
+class UploadReservations:
+    """Issues and checks the ``reservation`` token of ``POST /reports/uploads``.
+
+    The token is an HMAC over the report id, site, report date, user and expiry,
+    so ``POST /reports/{report_id}/confirm`` only accepts a report id this server
+    reserved for the same user and report, and only until the token expires.
+    """
+
+    def __init__(self, *, secret: str, ttl_seconds: int) -> None:
+        self._secret = secret.encode()
+        self._ttl_seconds = ttl_seconds
+
+    def issue(self, *, report_id: str, site_id: str, report_date: date, user_id: str) -> str:
+        expires = int(time.time()) + self._ttl_seconds
+        signature = self._signature(report_id, site_id, report_date, user_id, expires)
+        return f"{expires}.{signature}"
+
+    def verify(self, token: str, *, report_id: str, site_id: str, report_date: date, user_id: str) -> None:
+        expires_text, _, signature = token.partition(".")
+        try:
+            expires = int(expires_text)
+        except ValueError:
+            expires = 0
+        if expires < time.time() or not hmac.compare_digest(
+            signature, self._signature(report_id, site_id, report_date, user_id, expires)
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Резервирование загрузки недействительно или истекло",
+            )
+
+    def _signature(self, report_id: str, site_id: str, report_date: date, user_id: str, expires: int) -> str:
+        message = f"{report_id}\n{site_id}\n{report_date.isoformat()}\n{user_id}\n{expires}".encode()
+        return hmac.new(self._secret, message, hashlib.sha256).hexdigest()
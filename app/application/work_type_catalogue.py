@@ -0,0 +1,86 @@
+"""Process-wide, versioned snapshot of the work-type catalogue."""
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Callable, Dict, Iterable, List, Tuple
+
+from app.domain.entities import WorkType
+from app.domain.ports import WORK_TYPES_SCOPE, DataVersionRepository, WorkTypeRepository
+
+
+class WorkTypeSnapshot:
+    """Immutable view of all work types with id and hierarchy indexes."""
+
+    __slots__ = ("version", "items", "_by_id", "_children")
+
+    def __init__(self, *, version: int, items: Iterable[WorkType]) -> None:
+        self.version = version
+        self.items: Tuple[WorkType, ...] = tuple(items)
+        self._by_id: Dict[str, WorkType] = {item.id: item for item in self.items}
+        children: Dict[str | None, List[WorkType]] = {}
+        for item in self.items:
+            children.setdefault(item.parent_id, []).append(item)
+        self._children = {parent_id: tuple(items) for parent_id, items in children.items()}
+
+    def get(self, work_type_id: str) -> WorkType | None:
+        return self._by_id.get(work_type_id)
+
+    def children(self, parent_id: str | None) -> Tuple[WorkType, ...]:
+        return self._children.get(parent_id, ())
+
+    def ancestor_ids(self, work_type_id: str) -> List[str]:
+        """Ids from the direct parent up to the root; stops early on a broken chain."""
+
+        ancestors: List[str] = []
+        current = self._by_id.get(work_type_id)
+        while current is not None and current.parent_id and current.parent_id not in ancestors:
+            ancestors.append(current.parent_id)
+            current = self._by_id.get(current.parent_id)
+        return ancestors
+
+
+class WorkTypeCatalogue:
+    """Keeps the current ``WorkTypeSnapshot`` so reads never touch the database.
+
+    The snapshot is loaded at startup, dropped by ``invalidate()`` after every
+    write and reloaded lazily. ``version`` is the ``work_types`` data version read
+    just before the rows, so it is the same in every worker serving the same data.
+    ``ttl_seconds`` bounds how long a worker can serve a catalogue changed through
+    another worker.
+    """
+
+    def __init__(self, *, ttl_seconds: float = 300.0, clock: Callable[[], float] = time.monotonic) -> None:
+        self._ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._snapshot: WorkTypeSnapshot | None = None
+        self._loaded_at = 0.0
+        self._lock = asyncio.Lock()
+
+    @property
+    def version(self) -> int | None:
+        return self._snapshot.version if self._snapshot is not None else None
+
+    async def snapshot(self, repository: WorkTypeRepository, versions: DataVersionRepository) -> WorkTypeSnapshot:
+        current = self._snapshot
+        if current is not None and not self._expired():
+            return current
+        async with self._lock:
+            if self._snapshot is None or self._expired():
+                await self.load(repository, versions)
+            return self._snapshot
+
+    async def load(self, repository: WorkTypeRepository, versions: DataVersionRepository) -> WorkTypeSnapshot:
+        # Version first: a write landing in between makes the version older than the rows,
+        # which only costs clients a needless refetch, never a stale 304.
+        version = (await versions.get_versions(WORK_TYPES_SCOPE))[WORK_TYPES_SCOPE]
+        items = await repository.list()
+        self._snapshot = WorkTypeSnapshot(version=version, items=items)
+        self._loaded_at = self._clock()
+        return self._snapshot
+
+    def invalidate(self) -> None:
+        self._snapshot = None
+
+    def _expired(self) -> bool:
+        return self._ttl_seconds > 0 and self._clock() - self._loaded_at >= self._ttl_seconds
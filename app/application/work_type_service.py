@@ -6,17 +6,43 @@ from uuid import uuid4
 from fastapi import HTTPException, status
 from typing import Iterable
 
+from app.application.work_type_catalogue import WorkTypeCatalogue, WorkTypeSnapshot
 from app.domain.entities import User
 from app.domain.entities.work_type import WorkType
-from app.domain.ports import WorkTypeRepository
+from app.domain.ports import UnitOfWork, WorkTypeRepository
 
 
 class WorkTypeService:
-    def __init__(self, repository: WorkTypeRepository) -> None:
+    def __init__(
+        self,
+        repository: WorkTypeRepository,
+        unit_of_work: UnitOfWork,
+        catalogue: WorkTypeCatalogue,
+    ) -> None:
         self._repository = repository
+        self._unit_of_work = unit_of_work
+        self._catalogue = catalogue
+
+    async def catalogue(self) -> WorkTypeSnapshot:
+        return await self._catalogue.snapshot(self._repository, self._unit_of_work.versions)
 
     async def list_work_types(self) -> Iterable[WorkType]:
-        return await self._repository.list()
+        return (await self.catalogue()).items
+
+    async def get_work_type(self, work_type_id: str) -> WorkType | None:
+        work_type = (await self.catalogue()).get(work_type_id)
+        if work_type is None:
+            # Possibly created through another worker since our snapshot was loaded.
+            work_type = await self._repository.get_by_id(work_type_id)
+        return work_type
+
+    async def ensure_work_types_exist(self, work_type_ids: Iterable[str]) -> None:
+        for work_type_id in dict.fromkeys(work_type_ids):
+            if await self.get_work_type(work_type_id) is None:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Вид работ не найден",
+                )
 
     async def create_work_type(
         self,
@@ -32,7 +58,8 @@ class WorkTypeService:
         requires_machines: bool = False,
     ) -> WorkType:
         self._ensure_admin(user)
-        return await self._repository.create(
+        await self._validate_parent(work_type_id=None, parent_id=parent_id)
+        created = await self._repository.create(
             WorkType(
                 id=uuid4().hex,
                 name=name.strip(),
@@ -45,6 +72,9 @@ class WorkTypeService:
                 requires_machines=requires_machines,
             )
         )
+        await self._unit_of_work.commit()
+        self._catalogue.invalidate()
+        return created
 
     async def update_work_type(
         self,
@@ -61,6 +91,7 @@ class WorkTypeService:
         requires_machines: bool = False,
     ) -> WorkType:
         self._ensure_admin(user)
+        await self._validate_parent(work_type_id=work_type_id, parent_id=parent_id)
         updated = await self._repository.update(
             WorkType(
                 id=work_type_id,
@@ -79,6 +110,8 @@ class WorkTypeService:
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Вид работ не найден",
             )
+        await self._unit_of_work.commit()
+        self._catalogue.invalidate()
         return updated
 
     async def delete_work_type(self, *, user: User, work_type_id: str) -> None:
@@ -89,6 +122,24 @@ class WorkTypeService:
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Вид работ не найден",
             )
+        await self._unit_of_work.commit()
+        self._catalogue.invalidate()
+
+    async def _validate_parent(self, *, work_type_id: str | None, parent_id: str | None) -> None:
+        if parent_id is None:
+            return
+        if await self.get_work_type(parent_id) is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Родительский вид работ не найден",
+            )
+        if work_type_id is not None and (
+            parent_id == work_type_id or work_type_id in (await self.catalogue()).ancestor_ids(parent_id)
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Вид работ не может быть вложен сам в себя",
+            )
 
     @staticmethod
     def _ensure_admin(user: User) -> None:
@@ -38,19 +38,82 @@ class Settings(BaseSettings):
     yc_s3_bucket: str = Field(default="ptobot-assets", min_length=1, alias="YC_S3_BUCKET")
     yc_s3_access_key_id: str = Field(default="", alias="YC_S3_ACCESS_KEY_ID")
     yc_s3_secret_access_key: str = Field(default="", alias="YC_S3_SECRET_ACCESS_KEY")
+    # Базовый публичный URL объектов; пусто — https://<bucket>.storage.yandexcloud.net
+    yc_s3_public_url: str = Field(default="", alias="YC_S3_PUBLIC_URL")
+    yc_s3_presign_expires_seconds: int = Field(default=900, ge=60, le=7 * 24 * 3600, alias="YC_S3_PRESIGN_EXPIRES_SECONDS")
+    # Сколько после /reports/uploads принимается confirm с выданным резервированием
+    upload_reservation_ttl_seconds: int = Field(default=3600, ge=60, alias="UPLOAD_RESERVATION_TTL_SECONDS")
+    # Предел одного фото прямой загрузки: больший размер не получает ссылку, а размер входит в подпись PUT
+    upload_max_photo_bytes: int = Field(default=50 * 1024 * 1024, ge=1, alias="UPLOAD_MAX_PHOTO_BYTES")
+    # Один S3-клиент на процесс: размер пула соединений, keep-alive и таймауты
+    yc_s3_max_pool_connections: int = Field(default=32, ge=1, alias="YC_S3_MAX_POOL_CONNECTIONS")
+    yc_s3_tcp_keepalive: bool = Field(default=True, alias="YC_S3_TCP_KEEPALIVE")
+    yc_s3_connect_timeout: float = Field(default=5.0, gt=0, alias="YC_S3_CONNECT_TIMEOUT")
+    yc_s3_read_timeout: float = Field(default=30.0, gt=0, alias="YC_S3_READ_TIMEOUT")
+    yc_s3_max_attempts: int = Field(default=3, ge=1, alias="YC_S3_MAX_ATTEMPTS")
+    # "path" нужен для S3-совместимых заглушек (MinIO и т.п.) на localhost
+    yc_s3_addressing_style: str = Field(default="auto", pattern="^(auto|virtual|path)$", alias="YC_S3_ADDRESSING_STYLE")
+    # Файлы крупнее порога грузятся multipart-ом частями по chunksize (минимум S3 — 5 МиБ)
+    yc_s3_multipart_threshold: int = Field(default=8 * 1024 * 1024, ge=5 * 1024 * 1024, alias="YC_S3_MULTIPART_THRESHOLD")
+    yc_s3_multipart_chunksize: int = Field(default=8 * 1024 * 1024, ge=5 * 1024 * 1024, alias="YC_S3_MULTIPART_CHUNKSIZE")
+    # Миниатюра и средний размер каждого фото, считаются в пуле процессов (нужен Pillow)
+    image_variants_enabled: bool = Field(default=True, alias="IMAGE_VARIANTS_ENABLED")
+    image_workers: int = Field(default=2, ge=1, alias="IMAGE_WORKERS")
+    image_thumb_size: int = Field(default=320, ge=16, alias="IMAGE_THUMB_SIZE")
+    image_medium_size: int = Field(default=1280, ge=16, alias="IMAGE_MEDIUM_SIZE")
+    # Отдельный пул потоков для блокирующих вызовов хранилища (не общий asyncio.to_thread)
+    storage_io_workers: int = Field(default=16, ge=1, alias="STORAGE_IO_WORKERS")
+    # Допуск загрузок по Content-Length до чтения тела: сверх — 503 с Retry-After, больше лимита — 413;
+    # фото, скачиваемые при confirm прямой загрузки, учитываются в том же лимите
+    upload_max_in_flight_bytes: int = Field(default=256 * 1024 * 1024, ge=1, alias="UPLOAD_MAX_IN_FLIGHT_BYTES")
+    upload_retry_after_seconds: int = Field(default=5, ge=1, alias="UPLOAD_RETRY_AFTER_SECONDS")
+    # Сколько фото одного запроса загружаются одновременно
+    upload_concurrency_per_request: int = Field(default=4, ge=1, alias="UPLOAD_CONCURRENCY_PER_REQUEST")
+    # Удалять фото из хранилища фоновой задачей после коммита, а не внутри запроса
+    storage_delete_in_background: bool = Field(default=False, alias="STORAGE_DELETE_IN_BACKGROUND")
+    # Бэкенд фото: "s3" — Yandex Object Storage, "local" — файлы на диске (нагрузочные тесты, офлайн)
+    storage_backend: str = Field(default="s3", pattern="^(s3|local)$", alias="STORAGE_BACKEND")
+    local_storage_dir: Path = Field(default=Path("var/storage"), alias="LOCAL_STORAGE_DIR")
+    # Публичный адрес маршрута /files этого сервера; из него строятся ссылки на фото
+    local_storage_public_url: str = Field(default="http://localhost:8000/files", alias="LOCAL_STORAGE_PUBLIC_URL")
+    # Размер блока при потоковой записи файлов на диск
+    local_storage_chunk_size: int = Field(default=1024 * 1024, ge=4096, alias="LOCAL_STORAGE_CHUNK_SIZE")
+
+    # Сжатие ответов (Brotli, если установлен, иначе gzip); тела меньше порога не сжимаются,
+    # тела от COMPRESSION_OFFLOAD_SIZE байт сжимаются в отдельном потоке
+    compression_enabled: bool = Field(default=True, alias="COMPRESSION_ENABLED")
+    compression_minimum_size: int = Field(default=1024, ge=0, alias="COMPRESSION_MINIMUM_SIZE")
+    compression_gzip_level: int = Field(default=6, ge=1, le=9, alias="COMPRESSION_GZIP_LEVEL")
+    compression_brotli_quality: int = Field(default=4, ge=0, le=11, alias="COMPRESSION_BROTLI_QUALITY")
+    compression_offload_size: int = Field(default=64 * 1024, ge=0, alias="COMPRESSION_OFFLOAD_SIZE")
 
     database_url: str = Field(alias="DATABASE_URL")
     reports_limit: int = Field(default=500, ge=1, alias="REPORTS_LIMIT")
+    # Сколько отчётов принимает один POST /reports/batch (очередь подрядчика без связи)
+    reports_batch_max_items: int = Field(default=100, ge=1, alias="REPORTS_BATCH_MAX_ITEMS")
+    # Предел тела одного пакета (байт) — заметно меньше UPLOAD_MAX_IN_FLIGHT_BYTES, чтобы пакет не занимал
+    # весь лимит загрузок; больший пакет получает 413, и клиент делит его на части
+    reports_batch_max_bytes: int = Field(default=64 * 1024 * 1024, ge=1, alias="REPORTS_BATCH_MAX_BYTES")
 
     # JWT — обязательный секрет, генерируй через: openssl rand -hex 32
     jwt_secret: str = Field(alias="JWT_SECRET")
     jwt_algorithm: str = Field(default="HS256", alias="JWT_ALGORITHM")
     jwt_expires_minutes: int = Field(default=60 * 24 * 7, alias="JWT_EXPIRES_MINUTES")
 
+    # Кэш пользователей в get_current_user (на процесс); 0 — отключить
+    user_cache_ttl_seconds: float = Field(default=30.0, ge=0, alias="USER_CACHE_TTL_SECONDS")
+    user_cache_max_size: int = Field(default=1024, ge=1, alias="USER_CACHE_MAX_SIZE")
+    # Как долго процесс держит справочник видов работ без перечитывания; 0 — до изменения
+    work_type_catalogue_ttl_seconds: float = Field(default=300.0, ge=0, alias="WORK_TYPE_CATALOGUE_TTL_SECONDS")
+
     @property
     def has_storage_credentials(self) -> bool:
         return bool(self.yc_s3_access_key_id and self.yc_s3_secret_access_key)
 
+    @property
+    def storage_public_base_url(self) -> str:
+        return (self.yc_s3_public_url or f"https://{self.yc_s3_bucket}.storage.yandexcloud.net").rstrip("/")
+
     @staticmethod
     def _normalize_origins(value: str | Iterable[str] | None) -> List[str]:
         if value is None:
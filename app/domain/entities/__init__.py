@@ -1,8 +1,23 @@
+from .presigned_upload import PresignedUpload
 from .report import Report
+from .report_cursor import ReportCursor
 from .report_history_item import ReportHistoryItem
 from .report_work_item import ReportWorkItem
 from .site import Site
+from .site_access import SiteAccess
+from .stored_photo import StoredPhoto
 from .user import User
 from .work_type import WorkType
 
-__all__ = ["Report", "ReportHistoryItem", "ReportWorkItem", "Site", "User", "WorkType"]
+__all__ = [
+    "PresignedUpload",
+    "Report",
+    "ReportCursor",
+    "ReportHistoryItem",
+    "ReportWorkItem",
+    "Site",
+    "SiteAccess",
+    "StoredPhoto",
+    "User",
+    "WorkType",
+]
@@ -0,0 +1,13 @@
+"""Instruction for a client to upload one file straight to storage."""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+
+@dataclass(frozen=True, slots=True)
+class PresignedUpload:
+    key: str
+    url: str
+    expires_in: int
+    # Headers the client must send with the PUT; they are part of the signature.
+    headers: dict[str, str] = field(default_factory=dict)
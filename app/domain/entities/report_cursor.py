@@ -0,0 +1,12 @@
+"""Keyset position inside a report listing."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, datetime
+
+
+@dataclass(slots=True, frozen=True)
+class ReportCursor:
+    created_at: datetime
+    id: str
+    report_date: date | None = None
@@ -3,7 +3,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from datetime import date, datetime
-from typing import List
+from typing import Dict, List
 
 from .report_work_item import ReportWorkItem
 
@@ -21,6 +21,8 @@ class ReportHistoryItem:
     volume: str
     machines: str
     photo_urls: List[str] = field(default_factory=list)
+    # Original photo URL -> {variant name: URL}; photos without variants are absent.
+    photo_variants: Dict[str, Dict[str, str]] = field(default_factory=dict)
     author_id: str = ""
     author_name: str = ""
     work_items: List[ReportWorkItem] = field(default_factory=list)
@@ -0,0 +1,12 @@
+"""Minimal projection of a site used for access checks and storage key naming."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+
+@dataclass(slots=True, frozen=True)
+class SiteAccess:
+    id: str
+    name: str
+    contractor_id: str | None = None
+    pto_engineer_id: str | None = None
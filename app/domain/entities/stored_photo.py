@@ -0,0 +1,11 @@
+"""A photo saved to storage together with its resized variants."""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+
+@dataclass(frozen=True, slots=True)
+class StoredPhoto:
+    url: str
+    # Variant name ("thumb", "medium") -> public URL; empty when none could be rendered.
+    variants: dict[str, str] = field(default_factory=dict)
@@ -1,16 +1,23 @@
 from .clock import Clock, UtcClock
+from .data_version_repository import SITES_SCOPE, USERS_SCOPE, WORK_TYPES_SCOPE, DataVersionRepository
 from .report_repository import ReportRepository
 from .site_repository import SiteRepository
 from .storage import StoragePort
+from .unit_of_work import UnitOfWork
 from .user_repository import UserRepository
 from .work_type_repository import WorkTypeRepository
 
 __all__ = [
     "Clock",
+    "DataVersionRepository",
     "UtcClock",
     "ReportRepository",
     "SiteRepository",
     "StoragePort",
+    "UnitOfWork",
     "UserRepository",
     "WorkTypeRepository",
+    "SITES_SCOPE",
+    "USERS_SCOPE",
+    "WORK_TYPES_SCOPE",
 ]
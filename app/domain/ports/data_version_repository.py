@@ -0,0 +1,20 @@
+"""Port for reading data versions used to validate cached responses."""
+from __future__ import annotations
+
+from typing import Dict, Protocol, runtime_checkable
+
+WORK_TYPES_SCOPE = "work_types"
+SITES_SCOPE = "sites"
+USERS_SCOPE = "users"
+
+
+@runtime_checkable
+class DataVersionRepository(Protocol):
+    """Versions grow whenever the data behind a scope changes; 0 means never changed."""
+
+    async def get_versions(self, *scopes: str) -> Dict[str, int]:
+        ...
+
+    async def get_site_reports_version(self, site_id: str | None = None) -> int:
+        """Report version of one site, or the latest across all sites when ``site_id`` is omitted."""
+        ...
@@ -1,9 +1,9 @@
 """Port definition for report persistence."""
 from __future__ import annotations
 
-from typing import Iterable, Protocol, runtime_checkable
+from typing import AsyncIterator, Iterable, List, Protocol, Sequence, Set, runtime_checkable
 
-from app.domain.entities import Report, ReportHistoryItem
+from app.domain.entities import Report, ReportCursor, ReportHistoryItem
 
 
 @runtime_checkable
@@ -11,13 +11,21 @@ class ReportRepository(Protocol):
     async def add(self, report: Report) -> Report:
         ...
 
+    async def add_many(self, reports: Sequence[Report]) -> List[Report]:
+        """Add ``reports`` in as few statements as the store allows; nothing is committed."""
+        ...
+
     async def list(
         self,
         *,
         site_id: str | None = None,
         user_id: str | None = None,
         work_type_id: str | None = None,
+        cursor: ReportCursor | None = None,
+        limit: int | None = None,
+        fields: frozenset[str] | None = None,
     ) -> Iterable[Report]:
+        """With ``fields``, reports only need to carry those fields and their keyset (``id``, ``created_at``)."""
         ...
 
     async def list_history_by_site(
@@ -27,10 +35,37 @@ class ReportRepository(Protocol):
         date_from: str | None = None,
         date_to: str | None = None,
         work_type_id: str | None = None,
+        cursor: ReportCursor | None = None,
         limit: int | None = None,
+        fields: frozenset[str] | None = None,
     ) -> Iterable[ReportHistoryItem]:
         ...
 
+    def stream(
+        self,
+        *,
+        site_id: str | None = None,
+        user_id: str | None = None,
+        work_type_id: str | None = None,
+        cursor: ReportCursor | None = None,
+        fields: frozenset[str] | None = None,
+    ) -> AsyncIterator[Report]:
+        """Every report ``list`` would return without a limit, yielded as rows arrive."""
+        ...
+
+    def stream_history_by_site(
+        self,
+        *,
+        site_id: str,
+        date_from: str | None = None,
+        date_to: str | None = None,
+        work_type_id: str | None = None,
+        cursor: ReportCursor | None = None,
+        fields: frozenset[str] | None = None,
+    ) -> AsyncIterator[ReportHistoryItem]:
+        """Every item ``list_history_by_site`` would return without a limit, yielded as rows arrive."""
+        ...
+
     async def next_id(self) -> str:
         ...
 
@@ -42,3 +77,25 @@ class ReportRepository(Protocol):
 
     async def delete(self, report_id: str) -> bool:
         ...
+
+    async def referenced_photo_urls(self, urls: Sequence[str]) -> Set[str]:
+        """Those of ``urls`` that at least one report still lists in ``photo_urls``."""
+        ...
+
+    async def lock_photo_urls(self, urls: Sequence[str]) -> None:
+        """Share-lock each photo URL until the transaction ends; waits while one is being deleted.
+
+        Uploads take it before looking for an identical stored object, so an object
+        they reuse cannot be deleted before the report referencing it is committed.
+        A photo's variants share the lock of its original URL.
+        """
+        ...
+
+    async def claim_unreferenced_photo_urls(self, urls: Sequence[str]) -> List[str]:
+        """Lock ``urls`` exclusively until the transaction ends and return those no report references.
+
+        URLs an upload holds are skipped rather than waited for: it may be about to
+        reference them, and if not, ``scripts.gc_storage`` collects them later. Delete
+        the returned objects before ending the transaction.
+        """
+        ...
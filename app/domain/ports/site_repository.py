@@ -4,27 +4,32 @@ from __future__ import annotations
 from typing import Iterable, Protocol, runtime_checkable
 
 from app.domain.entities.site import Site
+from app.domain.entities.site_access import SiteAccess
 
 
 @runtime_checkable
 class SiteRepository(Protocol):
-    def get_by_id(self, site_id: str) -> Site | None:
+    async def get_by_id(self, site_id: str) -> Site | None:
         ...
 
-    def list_all(self) -> Iterable[Site]:
+    async def get_access(self, site_id: str) -> SiteAccess | None:
         ...
 
-    def list_by_contractor(self, contractor_id: str) -> Iterable[Site]:
+    async def list_all(self, fields: frozenset[str] | None = None) -> Iterable[Site]:
+        """Every site; with ``fields``, sites only need to carry those fields (and ``id``)."""
         ...
 
-    def list_by_pto_engineer(self, pto_engineer_id: str) -> Iterable[Site]:
+    async def list_by_contractor(self, contractor_id: str, fields: frozenset[str] | None = None) -> Iterable[Site]:
         ...
 
-    def create(self, site: Site) -> Site:
+    async def list_by_pto_engineer(self, pto_engineer_id: str, fields: frozenset[str] | None = None) -> Iterable[Site]:
         ...
 
-    def update(self, site: Site) -> Site | None:
+    async def create(self, site: Site) -> Site:
         ...
 
-    def delete(self, site_id: str) -> bool:
+    async def update(self, site: Site) -> Site | None:
+        ...
+
+    async def delete(self, site_id: str) -> bool:
         ...
@@ -2,10 +2,12 @@
 from __future__ import annotations
 
 from datetime import date
-from typing import Protocol, runtime_checkable
+from typing import AsyncContextManager, Awaitable, Callable, Dict, Protocol, Sequence, runtime_checkable
 
 from fastapi import UploadFile
 
+from app.domain.entities import PresignedUpload, StoredPhoto
+
 
 @runtime_checkable
 class StoragePort(Protocol):
@@ -17,8 +19,57 @@ class StoragePort(Protocol):
         site_name: str | None,
         report_id: str,
         report_date: date,
-    ) -> str:
+        lock: Callable[[str], Awaitable[None]] | None = None,
+    ) -> StoredPhoto:
+        """Store ``file`` and return where it lives.
+
+        ``lock`` is awaited with the photo URL as soon as it is known and before the
+        backend looks for an identical stored object or writes one; see
+        ``ReportRepository.lock_photo_urls``.
+        """
         ...
 
     async def delete(self, url: str) -> None:
         ...
+
+    def io_stats(self) -> Dict[str, int]:
+        """``workers``, ``queued`` and ``running`` of the backend's blocking-I/O pool."""
+        ...
+
+    async def delete_many(self, urls: Sequence[str]) -> None:
+        """Delete several photos (and their variants) in as few requests as the backend allows."""
+        ...
+
+    async def presign_upload(
+        self,
+        *,
+        filename: str,
+        content_type: str | None,
+        size: int,
+        site_id: str,
+        site_name: str | None,
+        report_id: str,
+        report_date: date,
+    ) -> PresignedUpload:
+        """Reserve a key under the report's prefix and sign a direct PUT of ``size`` bytes to it.
+
+        The signature covers ``size``, so the PUT cannot store a larger object.
+        """
+        ...
+
+    async def confirm_upload(
+        self,
+        key: str,
+        *,
+        site_id: str,
+        report_id: str,
+        report_date: date,
+        reserve: Callable[[int], AsyncContextManager[None]] | None = None,
+    ) -> StoredPhoto | None:
+        """The uploaded ``key`` as a stored photo; None if it is missing or outside the report's prefix.
+
+        A backend that has to download the object to render its variants first
+        enters ``reserve`` with the object's size and holds it during the download;
+        ``reserve`` raises to refuse the object.
+        """
+        ...
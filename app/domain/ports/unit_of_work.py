@@ -0,0 +1,25 @@
+"""Port for a request-scoped unit of work spanning all repositories."""
+from __future__ import annotations
+
+from typing import Protocol, runtime_checkable
+
+from .data_version_repository import DataVersionRepository
+from .report_repository import ReportRepository
+from .site_repository import SiteRepository
+from .user_repository import UserRepository
+from .work_type_repository import WorkTypeRepository
+
+
+@runtime_checkable
+class UnitOfWork(Protocol):
+    reports: ReportRepository
+    sites: SiteRepository
+    users: UserRepository
+    work_types: WorkTypeRepository
+    versions: DataVersionRepository
+
+    async def commit(self) -> None:
+        ...
+
+    async def rollback(self) -> None:
+        ...
@@ -8,26 +8,26 @@ from app.domain.entities.user import User
 
 @runtime_checkable
 class UserRepository(Protocol):
-    def get_by_id(self, user_id: str) -> Optional[User]:
+    async def get_by_id(self, user_id: str) -> Optional[User]:
         ...
 
-    def get_by_phone(self, phone: str) -> Optional[User]:
+    async def get_by_phone(self, phone: str) -> Optional[User]:
         ...
 
-    def add(self, user: User) -> User:
+    async def add(self, user: User) -> User:
         ...
 
-    def update(self, user: User) -> User | None:
+    async def update(self, user: User) -> User | None:
         ...
 
-    def delete(self, user_id: str) -> bool:
+    async def delete(self, user_id: str) -> bool:
         ...
 
-    def list_all_by_role(self, role: str) -> list[User]:
+    async def list_all_by_role(self, role: str) -> list[User]:
         ...
 
-    def list_contractors(self) -> list[User]:
+    async def list_contractors(self) -> list[User]:
         ...
 
-    def list_by_role(self, role: str) -> list[User]:
+    async def list_by_role(self, role: str) -> list[User]:
         ...
@@ -1,15 +1,19 @@
 from .repositories.memory import InMemoryReportRepository, InMemoryWorkTypeRepository
 from .reports import ReportModel, ReportWorkItemModel, SqlAlchemyReportRepository
 from .sites import SiteModel, SqlAlchemySiteRepository
+from .storage.local import LocalFileStorage
 from .storage.yandex import YandexStorage
+from .unit_of_work import SqlAlchemyUnitOfWork, open_unit_of_work
 from .users import SqlAlchemyUserRepository
 from .work_types import SqlAlchemyWorkTypeRepository, WorkTypeModel
 
 __all__ = [
     "InMemoryReportRepository",
     "InMemoryWorkTypeRepository",
+    "LocalFileStorage",
     "SqlAlchemyReportRepository",
     "SqlAlchemySiteRepository",
+    "SqlAlchemyUnitOfWork",
     "SqlAlchemyUserRepository",
     "SqlAlchemyWorkTypeRepository",
     "ReportModel",
@@ -0,0 +1,4 @@
+from .models import DATA_VERSION_SEQ, DataVersionModel
+from .repository import SqlAlchemyDataVersionRepository, bump_data_version
+
+__all__ = ["DATA_VERSION_SEQ", "DataVersionModel", "SqlAlchemyDataVersionRepository", "bump_data_version"]
@@ -0,0 +1,17 @@
+"""SQLAlchemy models for data versions."""
+from __future__ import annotations
+
+from sqlalchemy import BigInteger, Sequence, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.infrastructure.database import Base
+
+# One sequence feeds every version column, so versions never repeat across scopes or sites.
+DATA_VERSION_SEQ = Sequence("data_version_seq", metadata=Base.metadata)
+
+
+class DataVersionModel(Base):
+    __tablename__ = "data_versions"
+
+    scope: Mapped[str] = mapped_column(String(64), primary_key=True)
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False)
@@ -0,0 +1,43 @@
+"""SQLAlchemy-based access to data versions."""
+from __future__ import annotations
+
+from typing import Dict
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.ports import DataVersionRepository
+from app.infrastructure.data_versions.models import DATA_VERSION_SEQ, DataVersionModel
+from app.infrastructure.sites.models import SiteReportStatsModel
+
+
+async def bump_data_version(session: AsyncSession, scope: str) -> None:
+    """Advance ``scope`` inside the caller's transaction; readers see it once that commits."""
+
+    stmt = pg_insert(DataVersionModel).values(scope=scope, version=DATA_VERSION_SEQ.next_value())
+    await session.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[DataVersionModel.scope],
+            set_={"version": DATA_VERSION_SEQ.next_value()},
+        )
+    )
+
+
+class SqlAlchemyDataVersionRepository(DataVersionRepository):
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def get_versions(self, *scopes: str) -> Dict[str, int]:
+        rows = await self._session.execute(
+            select(DataVersionModel.scope, DataVersionModel.version).where(DataVersionModel.scope.in_(scopes))
+        )
+        versions = dict.fromkeys(scopes, 0)
+        versions.update(rows.tuples().all())
+        return versions
+
+    async def get_site_reports_version(self, site_id: str | None = None) -> int:
+        stmt = select(func.max(SiteReportStatsModel.version))
+        if site_id is not None:
+            stmt = stmt.where(SiteReportStatsModel.site_id == site_id)
+        return (await self._session.execute(stmt)).scalar_one() or 0
@@ -1,17 +1,18 @@
-"""SQLAlchemy engine, session factory, and base declarative class."""
+"""SQLAlchemy engines, session factories, and base declarative class."""
 from __future__ import annotations
 
-import logging       
-import os            
-from collections.abc import Generator
+import logging
+import os
+from collections.abc import AsyncGenerator
 
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncAttrs, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
 
 from app.config import get_settings
 
 
-class Base(DeclarativeBase):
+class Base(AsyncAttrs, DeclarativeBase):
     """Base class for SQLAlchemy models."""
 
 
@@ -22,16 +23,26 @@ _settings = get_settings()
 logger.info("Settings.database_url = %s", _settings.database_url)
 logger.info("ENV DATABASE_URL      = %s", os.getenv("DATABASE_URL"))
 
+
+def to_async_url(url: str) -> str:
+    """Point bare Postgres URLs at the psycopg driver, which also speaks asyncio."""
+
+    for prefix in ("postgres://", "postgresql://"):
+        if url.startswith(prefix):
+            return "postgresql+psycopg://" + url.removeprefix(prefix)
+    return url
+
+
+# Async engine serves the API; the sync one is kept for seed scripts and one-off tooling.
+async_engine = create_async_engine(to_async_url(_settings.database_url), pool_pre_ping=True)
 engine = create_engine(_settings.database_url, pool_pre_ping=True, future=True)
 
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False, class_=AsyncSession)
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, class_=Session)
 
 
-def get_db() -> Generator[Session, None, None]:
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """Provide a database session for FastAPI dependencies."""
 
-    db = SessionLocal()
-    try:
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
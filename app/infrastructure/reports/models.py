@@ -2,9 +2,9 @@
 from __future__ import annotations
 
 from datetime import date, datetime
-from typing import List
+from typing import Dict, List
 
-from sqlalchemy import Date, DateTime, ForeignKey, Integer, String
+from sqlalchemy import Date, DateTime, ForeignKey, Index, Integer, String
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -13,6 +13,13 @@ from app.infrastructure.database import Base
 
 class ReportModel(Base):
     __tablename__ = "reports"
+    __table_args__ = (
+        Index("ix_reports_site_id_report_date_created_at", "site_id", "report_date", "created_at", "id"),
+        Index("ix_reports_user_id_created_at", "user_id", "created_at", "id"),
+        Index("ix_reports_created_at_id", "created_at", "id"),
+        # Photos are shared between reports by content hash; answers "is this URL still used?".
+        Index("ix_reports_photo_urls", "photo_urls", postgresql_using="gin"),
+    )
 
     id: Mapped[str] = mapped_column(String(64), primary_key=True)
     user_id: Mapped[str] = mapped_column(String(64), ForeignKey("users.id", ondelete="RESTRICT"), index=True)
@@ -30,15 +37,18 @@ class ReportModel(Base):
     machines: Mapped[str] = mapped_column(String(256), default="")
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
     photo_urls: Mapped[List[str]] = mapped_column(JSONB, default=list)
+    photo_variants: Mapped[Dict[str, Dict[str, str]]] = mapped_column(JSONB, default=dict)
     work_items: Mapped[List["ReportWorkItemModel"]] = relationship(
         back_populates="report",
         cascade="all, delete-orphan",
         order_by="ReportWorkItemModel.sort_order",
+        lazy="raise_on_sql",
     )
 
 
 class ReportWorkItemModel(Base):
     __tablename__ = "report_work_items"
+    __table_args__ = (Index("ix_report_work_items_work_type_id_report_id", "work_type_id", "report_id"),)
 
     id: Mapped[str] = mapped_column(String(64), primary_key=True)
     report_id: Mapped[str] = mapped_column(
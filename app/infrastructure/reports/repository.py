@@ -3,20 +3,83 @@ from __future__ import annotations
 
 import uuid
 from datetime import date
-from typing import Iterable, List
+from typing import AsyncIterator, Iterable, List, Sequence, Set
 
-from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy import JSON, Text, exists, func, insert, select, tuple_
+from sqlalchemy.dialects.postgresql import aggregate_order_by, array
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
-from app.domain.entities import Report, ReportHistoryItem, ReportWorkItem
+from app.domain.entities import Report, ReportCursor, ReportHistoryItem, ReportWorkItem
 from app.domain.ports import ReportRepository
 from app.infrastructure.reports.models import ReportModel, ReportWorkItemModel
+from app.infrastructure.sites.stats import refresh_site_report_stats
 from app.infrastructure.users.models import UserModel
 from app.infrastructure.work_types.models import WorkTypeModel
 
+# Work items for a whole page are fetched with one extra IN query instead of one per report.
+WITH_WORK_ITEMS = selectinload(ReportModel.work_items)
+
+# History and streamed listings are read-only, so they skip the ORM: work items of each row
+# come back as one JSON array of positional tuples, aggregated by the same statement.
+_work_items = ReportWorkItemModel.__table__
+HISTORY_WORK_ITEMS = (
+    select(
+        func.json_agg(
+            aggregate_order_by(
+                func.json_build_array(
+                    _work_items.c.id,
+                    _work_items.c.work_type_id,
+                    _work_items.c.description,
+                    _work_items.c.people,
+                    _work_items.c.volume,
+                    _work_items.c.machines,
+                    _work_items.c.sort_order,
+                ),
+                _work_items.c.sort_order,
+            ),
+            type_=JSON,
+        )
+    )
+    .where(_work_items.c.report_id == ReportModel.__table__.c.id)
+    .scalar_subquery()
+    .label("work_items")
+)
+
+# Rows per round trip of a server-side cursor; what a stream holds in memory at a time.
+STREAM_BATCH_ROWS = 200
+# Rows per multi-row INSERT of ``add_many``; keeps a statement far below the 65535 bind parameters.
+INSERT_BATCH_ROWS = 500
+
+# Columns of the reports table that listings read, in select order.
+REPORT_COLUMNS = (
+    "id",
+    "user_id",
+    "site_id",
+    "work_type_id",
+    "report_date",
+    "description",
+    "people",
+    "volume",
+    "machines",
+    "created_at",
+    "photo_urls",
+    "photo_variants",
+)
+# Sparse rows still carry their keyset columns: the next page cursor is built from them.
+REPORT_KEYSET = ("id", "created_at")
+HISTORY_KEYSET = ("id", "report_date", "created_at")
+# Columns behind the fields that are not report columns themselves.
+FIELD_COLUMNS = {
+    "author_id": ("user_id",),
+    "photos": ("photo_urls", "photo_variants"),
+    # A legacy report without work items gets one built from its own columns.
+    "work_items": ("work_type_id", "description", "people", "volume", "machines"),
+}
+
 
 class SqlAlchemyReportRepository(ReportRepository):
-    def __init__(self, session: Session) -> None:
+    def __init__(self, session: AsyncSession) -> None:
         self._session = session
 
     async def add(self, report: Report) -> Report:
@@ -32,34 +95,144 @@ class SqlAlchemyReportRepository(ReportRepository):
             machines=report.machines,
             created_at=report.created_at,
             photo_urls=list(report.photo_urls),
+            photo_variants=dict(report.photo_variants),
         )
         model.work_items = self._build_work_item_models(report)
         self._session.add(model)
-        self._session.commit()
-        self._session.refresh(model)
+        await self._session.flush()
+        await refresh_site_report_stats(self._session, [model.site_id])
         return self._to_entity(model)
 
+    async def add_many(self, reports: Sequence[Report]) -> List[Report]:
+        """Insert ``reports`` with multi-row INSERTs and refresh the stats of their sites once."""
+
+        if not reports:
+            return []
+        report_rows = [
+            {
+                "id": report.id,
+                "user_id": report.user_id,
+                "site_id": report.site_id,
+                "work_type_id": report.work_type_id,
+                "report_date": report.report_date,
+                "description": report.description,
+                "people": report.people,
+                "volume": report.volume,
+                "machines": report.machines,
+                "created_at": report.created_at,
+                "photo_urls": list(report.photo_urls),
+                "photo_variants": dict(report.photo_variants),
+            }
+            for report in reports
+        ]
+        work_item_rows = [row for report in reports for row in self._work_item_rows(report)]
+        for table, rows in ((ReportModel.__table__, report_rows), (_work_items, work_item_rows)):
+            for start in range(0, len(rows), INSERT_BATCH_ROWS):
+                # ``values(list)`` renders one INSERT ... VALUES (...), (...); executemany would not.
+                await self._session.execute(insert(table).values(rows[start : start + INSERT_BATCH_ROWS]))
+        await refresh_site_report_stats(self._session, [report.site_id for report in reports])
+        return list(reports)
+
     async def list(
         self,
         *,
         site_id: str | None = None,
         user_id: str | None = None,
         work_type_id: str | None = None,
+        cursor: ReportCursor | None = None,
+        limit: int | None = None,
+        fields: frozenset[str] | None = None,
     ) -> Iterable[Report]:
-        stmt = select(ReportModel)
-        if site_id is not None:
-            stmt = stmt.where(ReportModel.site_id == site_id)
-        if user_id is not None:
-            stmt = stmt.where(ReportModel.user_id == user_id)
-        if work_type_id is not None:
-            stmt = stmt.outerjoin(ReportWorkItemModel, ReportWorkItemModel.report_id == ReportModel.id).where(
-                (ReportModel.work_type_id == work_type_id) | (ReportWorkItemModel.work_type_id == work_type_id)
+        filters = self._report_filters(site_id=site_id, user_id=user_id, work_type_id=work_type_id, cursor=cursor)
+        if fields is not None:
+            # A sparse page is a plain projection, like a stream; see ``_report_columns``.
+            reports = ReportModel.__table__
+            stmt = (
+                select(*self._report_columns(fields, REPORT_KEYSET))
+                .where(*filters)
+                .order_by(reports.c.created_at.desc(), reports.c.id.desc())
             )
+            if limit is not None:
+                stmt = stmt.limit(limit)
+            return [self._row_to_report(row) for row in await self._session.execute(stmt)]
+
+        stmt = (
+            select(ReportModel)
+            .options(WITH_WORK_ITEMS)
+            .where(*filters)
+            .order_by(ReportModel.created_at.desc(), ReportModel.id.desc())
+        )
+        if limit is not None:
+            stmt = stmt.limit(limit)
 
-        result = self._session.execute(stmt.order_by(ReportModel.created_at.desc())).unique()
+        result = await self._session.execute(stmt)
         models: List[ReportModel] = list(result.scalars().all())
         return [self._to_entity(model) for model in models]
 
+    async def stream(
+        self,
+        *,
+        site_id: str | None = None,
+        user_id: str | None = None,
+        work_type_id: str | None = None,
+        cursor: ReportCursor | None = None,
+        fields: frozenset[str] | None = None,
+    ) -> AsyncIterator[Report]:
+        reports = ReportModel.__table__
+        stmt = (
+            select(*self._report_columns(fields, REPORT_KEYSET))
+            .where(*self._report_filters(site_id=site_id, user_id=user_id, work_type_id=work_type_id, cursor=cursor))
+            .order_by(reports.c.created_at.desc(), reports.c.id.desc())
+        )
+        async for row in self._stream_rows(stmt):
+            yield self._row_to_report(row)
+
+    @staticmethod
+    def _report_columns(fields: frozenset[str] | None, keyset: Sequence[str]) -> List:
+        """Report columns ``fields`` need (all of them for None) and the work items aggregate if wanted."""
+
+        reports = ReportModel.__table__
+        if fields is None:
+            return [*(reports.c[name] for name in REPORT_COLUMNS), HISTORY_WORK_ITEMS]
+        names = {*keyset, *fields}
+        for field in fields:
+            names.update(FIELD_COLUMNS.get(field, ()))
+        columns = [reports.c[name] for name in REPORT_COLUMNS if name in names]
+        if "work_items" in fields:
+            columns.append(HISTORY_WORK_ITEMS)
+        return columns
+
+    @staticmethod
+    def _report_filters(
+        *,
+        site_id: str | None,
+        user_id: str | None,
+        work_type_id: str | None,
+        cursor: ReportCursor | None,
+    ) -> List:
+        reports = ReportModel.__table__
+        filters = []
+        if site_id is not None:
+            filters.append(reports.c.site_id == site_id)
+        if user_id is not None:
+            filters.append(reports.c.user_id == user_id)
+        if work_type_id is not None:
+            filters.append(SqlAlchemyReportRepository._has_work_type(work_type_id))
+        if cursor is not None:
+            filters.append(tuple_(reports.c.created_at, reports.c.id) < tuple_(cursor.created_at, cursor.id))
+        return filters
+
+    async def _stream_rows(self, stmt) -> AsyncIterator:
+        """Rows of ``stmt`` through a server-side cursor, ``STREAM_BATCH_ROWS`` per fetch."""
+
+        result = await self._session.stream(stmt.execution_options(yield_per=STREAM_BATCH_ROWS))
+        try:
+            async for row in result.tuples():
+                yield row
+        finally:
+            # Also runs when the client goes away mid-stream; frees the cursor on the server.
+            await result.close()
+
     async def list_history_by_site(
         self,
         *,
@@ -67,47 +240,96 @@ class SqlAlchemyReportRepository(ReportRepository):
         date_from: str | None = None,
         date_to: str | None = None,
         work_type_id: str | None = None,
+        cursor: ReportCursor | None = None,
         limit: int | None = None,
+        fields: frozenset[str] | None = None,
     ) -> Iterable[ReportHistoryItem]:
+        stmt = self._history_stmt(
+            site_id=site_id,
+            date_from=date_from,
+            date_to=date_to,
+            work_type_id=work_type_id,
+            cursor=cursor,
+            fields=fields,
+        )
+        if limit is not None:
+            stmt = stmt.limit(limit)
+
+        result = await self._session.execute(stmt)
+        return [self._to_history_item(row) for row in result.tuples()]
+
+    async def stream_history_by_site(
+        self,
+        *,
+        site_id: str,
+        date_from: str | None = None,
+        date_to: str | None = None,
+        work_type_id: str | None = None,
+        cursor: ReportCursor | None = None,
+        fields: frozenset[str] | None = None,
+    ) -> AsyncIterator[ReportHistoryItem]:
+        stmt = self._history_stmt(
+            site_id=site_id,
+            date_from=date_from,
+            date_to=date_to,
+            work_type_id=work_type_id,
+            cursor=cursor,
+            fields=fields,
+        )
+        async for row in self._stream_rows(stmt):
+            yield self._to_history_item(row)
+
+    def _history_stmt(
+        self,
+        *,
+        site_id: str,
+        date_from: str | None,
+        date_to: str | None,
+        work_type_id: str | None,
+        cursor: ReportCursor | None,
+        fields: frozenset[str] | None = None,
+    ):
+        reports, work_types, users = ReportModel.__table__, WorkTypeModel.__table__, UserModel.__table__
         stmt = (
-            select(
-                ReportModel,
-                WorkTypeModel.name.label("work_type_name"),
-                UserModel.name.label("author_name"),
-            )
-            .join(WorkTypeModel, WorkTypeModel.id == ReportModel.work_type_id)
-            .join(UserModel, UserModel.id == ReportModel.user_id)
-            .where(ReportModel.site_id == site_id)
+            select(*self._report_columns(fields, HISTORY_KEYSET))
+            .select_from(reports)
+            .where(reports.c.site_id == site_id)
         )
+        # Both foreign keys are NOT NULL, so leaving a join out does not change which rows match.
+        if fields is None or "work_type_name" in fields:
+            stmt = stmt.add_columns(work_types.c.name.label("work_type_name")).join(
+                work_types, work_types.c.id == reports.c.work_type_id
+            )
+        if fields is None or "author_name" in fields:
+            stmt = stmt.add_columns(users.c.name.label("author_name")).join(users, users.c.id == reports.c.user_id)
 
         if date_from is not None:
-            stmt = stmt.where(ReportModel.report_date >= date.fromisoformat(date_from))
+            stmt = stmt.where(reports.c.report_date >= date.fromisoformat(date_from))
         if date_to is not None:
-            stmt = stmt.where(ReportModel.report_date <= date.fromisoformat(date_to))
+            stmt = stmt.where(reports.c.report_date <= date.fromisoformat(date_to))
         if work_type_id is not None:
-            stmt = stmt.outerjoin(ReportWorkItemModel, ReportWorkItemModel.report_id == ReportModel.id).where(
-                (ReportModel.work_type_id == work_type_id) | (ReportWorkItemModel.work_type_id == work_type_id)
+            stmt = stmt.where(self._has_work_type(work_type_id))
+        if cursor is not None:
+            stmt = stmt.where(
+                tuple_(reports.c.report_date, reports.c.created_at, reports.c.id)
+                < tuple_(cursor.report_date, cursor.created_at, cursor.id)
             )
 
-        stmt = stmt.order_by(ReportModel.report_date.desc(), ReportModel.created_at.desc())
-        if limit is not None:
-            stmt = stmt.limit(limit)
-
-        rows = self._session.execute(stmt).unique().all()
-        return [self._to_history_item(row) for row in rows]
+        return stmt.order_by(reports.c.report_date.desc(), reports.c.created_at.desc(), reports.c.id.desc())
 
     async def next_id(self) -> str:
         return uuid.uuid4().hex
 
     async def get_by_id(self, report_id: str) -> Report | None:
-        model = self._session.get(ReportModel, report_id)
+        model = await self._get_model(report_id)
         return self._to_entity(model) if model else None
 
     async def update(self, report: Report) -> Report:
-        model = self._session.get(ReportModel, report.id)
+        model = await self._get_model(report.id)
         if model is None:
             raise ValueError(f"Report {report.id} not found")
 
+        previous_site_id = model.site_id
         model.user_id = report.user_id
         model.site_id = report.site_id
         model.work_type_id = report.work_type_id
@@ -118,20 +340,72 @@ class SqlAlchemyReportRepository(ReportRepository):
         model.machines = report.machines
         model.created_at = report.created_at
         model.photo_urls = list(report.photo_urls)
+        model.photo_variants = dict(report.photo_variants)
         model.work_items = self._build_work_item_models(report)
-        self._session.commit()
-        self._session.refresh(model)
+        await self._session.flush()
+        await refresh_site_report_stats(self._session, [previous_site_id, model.site_id])
         return self._to_entity(model)
 
     async def delete(self, report_id: str) -> bool:
-        model = self._session.get(ReportModel, report_id)
+        model = await self._get_model(report_id)
         if model is None:
             return False
 
-        self._session.delete(model)
-        self._session.commit()
+        await self._session.delete(model)
+        await self._session.flush()
+        await refresh_site_report_stats(self._session, [model.site_id])
         return True
 
+    async def referenced_photo_urls(self, urls: Sequence[str]) -> Set[str]:
+        if not urls:
+            return set()
+        # ``?|`` is served by the GIN index on photo_urls; only matching reports come back.
+        stmt = select(ReportModel.photo_urls).where(ReportModel.photo_urls.has_any(array(list(urls))))
+        wanted = set(urls)
+        result = await self._session.execute(stmt)
+        return {url for photo_urls in result.scalars() for url in photo_urls or () if url in wanted}
+
+    async def lock_photo_urls(self, urls: Sequence[str]) -> None:
+        if not urls:
+            return
+        url = self._url_values(urls)
+        await self._session.execute(select(func.pg_advisory_xact_lock_shared(self._photo_lock(url.c.url))))
+
+    async def claim_unreferenced_photo_urls(self, urls: Sequence[str]) -> List[str]:
+        if not urls:
+            return []
+        url = self._url_values(urls)
+        # The try variant never waits, so deleters cannot deadlock with uploads or each other.
+        result = await self._session.execute(
+            select(url.c.url).where(func.pg_try_advisory_xact_lock(self._photo_lock(url.c.url)))
+        )
+        locked = list(result.scalars())
+        still_used = await self.referenced_photo_urls(locked)
+        return [item for item in locked if item not in still_used]
+
+    @staticmethod
+    def _url_values(urls: Sequence[str]):
+        return func.unnest(array(list(dict.fromkeys(urls)), type_=Text)).table_valued("url").render_derived()
+
+    @staticmethod
+    def _photo_lock(url):
+        # One lock per photo: the URL up to the first dot of its file name, which the original
+        # and its variants share. A hashtext collision only makes two photos share a lock.
+        return func.hashtext(func.regexp_replace(url, r"\.[^/]*$", ""))
+
+    @staticmethod
+    def _has_work_type(work_type_id: str):
+        # EXISTS instead of a join keeps one row per report, so LIMIT counts reports.
+        # Plain table columns, so the filter also fits the ORM-free history query.
+        reports = ReportModel.__table__
+        return (reports.c.work_type_id == work_type_id) | exists().where(
+            _work_items.c.report_id == reports.c.id,
+            _work_items.c.work_type_id == work_type_id,
+        )
+
+    async def _get_model(self, report_id: str) -> ReportModel | None:
+        return await self._session.get(ReportModel, report_id, options=[WITH_WORK_ITEMS], populate_existing=True)
+
     @staticmethod
     def _to_entity(model: ReportModel) -> Report:
         work_items = SqlAlchemyReportRepository._to_work_items(model)
@@ -147,32 +421,118 @@ class SqlAlchemyReportRepository(ReportRepository):
             machines=model.machines,
             created_at=model.created_at,
             photo_urls=list(model.photo_urls or []),
+            photo_variants=dict(model.photo_variants or {}),
             work_items=work_items,
         )
 
     @staticmethod
     def _to_history_item(row) -> ReportHistoryItem:
-        model: ReportModel = row[0]
-        work_type_name: str = row[1]
-        author_name: str = row[2]
-        work_items = SqlAlchemyReportRepository._to_work_items(model, fallback_name=work_type_name)
+        # Columns left out by a sparse ``_history_stmt`` keep empty values.
+        values = row._mapping
+        work_type_name = values.get("work_type_name", "")
         return ReportHistoryItem(
-            id=model.id,
-            site_id=model.site_id or "",
-            work_type_id=model.work_type_id,
+            id=values["id"],
+            site_id=values.get("site_id") or "",
+            work_type_id=values.get("work_type_id", ""),
             work_type_name=work_type_name,
-            report_date=model.report_date,
-            created_at=model.created_at,
-            description=model.description,
-            people=model.people,
-            volume=model.volume,
-            machines=model.machines,
-            photo_urls=list(model.photo_urls or []),
-            author_id=model.user_id,
-            author_name=author_name,
-            work_items=work_items,
+            report_date=values["report_date"],
+            created_at=values["created_at"],
+            description=values.get("description", ""),
+            people=values.get("people", ""),
+            volume=values.get("volume", ""),
+            machines=values.get("machines", ""),
+            photo_urls=list(values.get("photo_urls") or []),
+            photo_variants=values.get("photo_variants") or {},
+            author_id=values.get("user_id", ""),
+            author_name=values.get("author_name", ""),
+            work_items=SqlAlchemyReportRepository._row_work_items(values, work_type_name=work_type_name),
         )
 
+    @staticmethod
+    def _row_to_report(row) -> Report:
+        # Columns left out by a sparse ``_report_columns`` keep empty values.
+        values = row._mapping
+        return Report(
+            id=values["id"],
+            user_id=values.get("user_id", ""),
+            site_id=values.get("site_id") or "",
+            work_type_id=values.get("work_type_id", ""),
+            report_date=values.get("report_date"),
+            description=values.get("description", ""),
+            people=values.get("people", ""),
+            volume=values.get("volume", ""),
+            machines=values.get("machines", ""),
+            created_at=values["created_at"],
+            photo_urls=list(values.get("photo_urls") or []),
+            photo_variants=values.get("photo_variants") or {},
+            # Same as ``_to_entity``: reports carry no work type names.
+            work_items=SqlAlchemyReportRepository._row_work_items(values, work_type_name=""),
+        )
+
+    @staticmethod
+    def _row_work_items(values, *, work_type_name: str) -> List[ReportWorkItem]:
+        if "work_items" not in values:
+            return []
+        return SqlAlchemyReportRepository._aggregated_work_items(
+            values["work_items"],
+            report_id=values["id"],
+            work_type_id=values["work_type_id"],
+            work_type_name=work_type_name,
+            description=values["description"],
+            people=values["people"],
+            volume=values["volume"],
+            machines=values["machines"],
+        )
+
+    @staticmethod
+    def _aggregated_work_items(
+        raw_items,
+        *,
+        report_id: str,
+        work_type_id: str,
+        work_type_name: str,
+        description: str,
+        people: str,
+        volume: str,
+        machines: str,
+    ) -> List[ReportWorkItem]:
+        """Work items from the ``HISTORY_WORK_ITEMS`` aggregate; a legacy report without any gets one."""
+
+        if raw_items:
+            return [
+                ReportWorkItem(
+                    id=item_id,
+                    work_type_id=item_work_type_id,
+                    work_type_name=work_type_name if item_work_type_id == work_type_id else "",
+                    description=item_description,
+                    people=item_people,
+                    volume=item_volume,
+                    machines=item_machines,
+                    sort_order=sort_order,
+                )
+                for (
+                    item_id,
+                    item_work_type_id,
+                    item_description,
+                    item_people,
+                    item_volume,
+                    item_machines,
+                    sort_order,
+                ) in raw_items
+            ]
+        return [
+            ReportWorkItem(
+                id=f"{report_id}-legacy",
+                work_type_id=work_type_id,
+                work_type_name=work_type_name,
+                description=description,
+                people=people,
+                volume=volume,
+                machines=machines,
+                sort_order=0,
+            )
+        ]
+
     @staticmethod
     def _to_work_items(model: ReportModel, fallback_name: str = "") -> List[ReportWorkItem]:
         if model.work_items:
@@ -205,6 +565,10 @@ class SqlAlchemyReportRepository(ReportRepository):
 
     @staticmethod
     def _build_work_item_models(report: Report) -> List[ReportWorkItemModel]:
+        return [ReportWorkItemModel(**row) for row in SqlAlchemyReportRepository._work_item_rows(report)]
+
+    @staticmethod
+    def _work_item_rows(report: Report) -> List[dict]:
         items = report.work_items or [
             ReportWorkItem(
                 id=f"{report.id}-legacy",
@@ -217,15 +581,15 @@ class SqlAlchemyReportRepository(ReportRepository):
             )
         ]
         return [
-            ReportWorkItemModel(
-                id=item.id or uuid.uuid4().hex,
-                report_id=report.id,
-                work_type_id=item.work_type_id or report.work_type_id,
-                description=item.description,
-                people=item.people,
-                volume=item.volume,
-                machines=item.machines,
-                sort_order=item.sort_order,
-            )
+            {
+                "id": item.id or uuid.uuid4().hex,
+                "report_id": report.id,
+                "work_type_id": item.work_type_id or report.work_type_id,
+                "description": item.description,
+                "people": item.people,
+                "volume": item.volume,
+                "machines": item.machines,
+                "sort_order": item.sort_order,
+            }
             for item in items
         ]
@@ -5,9 +5,9 @@ import asyncio
 import itertools
 from collections import deque
 from datetime import date
-from typing import Deque, Iterable, List
+from typing import AsyncIterator, Deque, Iterable, List, Sequence, Set
 
-from app.domain.entities import Report, ReportHistoryItem, WorkType
+from app.domain.entities import Report, ReportCursor, ReportHistoryItem, WorkType
 from app.domain.ports import ReportRepository, WorkTypeRepository
 
 
@@ -22,6 +22,11 @@ class InMemoryReportRepository(ReportRepository):
             self._reports.append(report)
         return report
 
+    async def add_many(self, reports: Sequence[Report]) -> List[Report]:
+        async with self._lock:
+            self._reports.extend(reports)
+        return list(reports)
+
     async def next_id(self) -> str:
         async with self._lock:
             return str(next(self._id_counter))
@@ -32,7 +37,11 @@ class InMemoryReportRepository(ReportRepository):
         site_id: str | None = None,
         user_id: str | None = None,
         work_type_id: str | None = None,
+        cursor: ReportCursor | None = None,
+        limit: int | None = None,
+        fields: frozenset[str] | None = None,
     ) -> Iterable[Report]:
+        # Reports are held whole, so ``fields`` has nothing to skip here; rendering trims the rows.
         async with self._lock:
             reports: Iterable[Report] = list(self._reports)
         if site_id is not None:
@@ -41,7 +50,10 @@ class InMemoryReportRepository(ReportRepository):
             reports = [item for item in reports if item.user_id == user_id]
         if work_type_id is not None:
             reports = [item for item in reports if item.work_type_id == work_type_id]
-        return list(reports)
+        if cursor is not None:
+            reports = [item for item in reports if (item.created_at, item.id) < (cursor.created_at, cursor.id)]
+        ordered = sorted(reports, key=lambda item: (item.created_at, item.id), reverse=True)
+        return ordered[:limit] if limit is not None else ordered
 
     async def list_history_by_site(
         self,
@@ -50,7 +62,9 @@ class InMemoryReportRepository(ReportRepository):
         date_from: str | None = None,
         date_to: str | None = None,
         work_type_id: str | None = None,
+        cursor: ReportCursor | None = None,
         limit: int | None = None,
+        fields: frozenset[str] | None = None,
     ) -> Iterable[ReportHistoryItem]:
         reports = await self.list(site_id=site_id, work_type_id=work_type_id)
         filtered = list(reports)
@@ -58,7 +72,10 @@ class InMemoryReportRepository(ReportRepository):
             filtered = [item for item in filtered if item.report_date >= date.fromisoformat(date_from)]
         if date_to is not None:
             filtered = [item for item in filtered if item.report_date <= date.fromisoformat(date_to)]
-        filtered.sort(key=lambda item: (item.report_date, item.created_at), reverse=True)
+        if cursor is not None:
+            position = (cursor.report_date, cursor.created_at, cursor.id)
+            filtered = [item for item in filtered if (item.report_date, item.created_at, item.id) < position]
+        filtered.sort(key=lambda item: (item.report_date, item.created_at, item.id), reverse=True)
         if limit is not None:
             filtered = filtered[:limit]
         return [
@@ -74,6 +91,7 @@ class InMemoryReportRepository(ReportRepository):
                 volume=item.volume,
                 machines=item.machines,
                 photo_urls=list(item.photo_urls),
+                photo_variants=dict(item.photo_variants),
                 author_id=item.user_id,
                 author_name="",
                 work_items=list(item.work_items),
@@ -81,6 +99,38 @@ class InMemoryReportRepository(ReportRepository):
             for item in filtered
         ]
 
+    async def stream(
+        self,
+        *,
+        site_id: str | None = None,
+        user_id: str | None = None,
+        work_type_id: str | None = None,
+        cursor: ReportCursor | None = None,
+        fields: frozenset[str] | None = None,
+    ) -> AsyncIterator[Report]:
+        for report in await self.list(site_id=site_id, user_id=user_id, work_type_id=work_type_id, cursor=cursor):
+            yield report
+
+    async def stream_history_by_site(
+        self,
+        *,
+        site_id: str,
+        date_from: str | None = None,
+        date_to: str | None = None,
+        work_type_id: str | None = None,
+        cursor: ReportCursor | None = None,
+        fields: frozenset[str] | None = None,
+    ) -> AsyncIterator[ReportHistoryItem]:
+        items = await self.list_history_by_site(
+            site_id=site_id,
+            date_from=date_from,
+            date_to=date_to,
+            work_type_id=work_type_id,
+            cursor=cursor,
+        )
+        for item in items:
+            yield item
+
     async def get_by_id(self, report_id: str) -> Report | None:
         async with self._lock:
             for report in self._reports:
@@ -104,6 +154,19 @@ class InMemoryReportRepository(ReportRepository):
                     return True
         return False
 
+    async def referenced_photo_urls(self, urls: Sequence[str]) -> Set[str]:
+        wanted = set(urls)
+        async with self._lock:
+            return {url for report in self._reports for url in report.photo_urls if url in wanted}
+
+    async def lock_photo_urls(self, urls: Sequence[str]) -> None:
+        # A single process with no separate deleters: nothing to serialise against.
+        return None
+
+    async def claim_unreferenced_photo_urls(self, urls: Sequence[str]) -> List[str]:
+        still_used = await self.referenced_photo_urls(urls)
+        return [url for url in dict.fromkeys(urls) if url not in still_used]
+
 
 class InMemoryWorkTypeRepository(WorkTypeRepository):
     def __init__(self) -> None:
@@ -1,4 +1,4 @@
-from .models import SiteModel
+from .models import SiteModel, SiteReportStatsModel
 from .repository import SqlAlchemySiteRepository
 
-__all__ = ["SiteModel", "SqlAlchemySiteRepository"]
+__all__ = ["SiteModel", "SiteReportStatsModel", "SqlAlchemySiteRepository"]
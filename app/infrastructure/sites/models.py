@@ -3,7 +3,8 @@ from __future__ import annotations
 
 from datetime import date
 
-from sqlalchemy import Date, ForeignKey, Integer, String
+from sqlalchemy import BigInteger, Date, ForeignKey, Integer, String
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.infrastructure.database import Base
@@ -36,3 +37,19 @@ class SiteModel(Base):
         index=True,
         nullable=True,
     )
+
+
+class SiteReportStatsModel(Base):
+    """Per-site report summary kept in step with the reports table by the report repository."""
+
+    __tablename__ = "site_report_stats"
+
+    site_id: Mapped[str] = mapped_column(
+        String(64),
+        ForeignKey("sites.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    last_report_date: Mapped[date | None] = mapped_column(Date, nullable=True)
+    recent_report_dates: Mapped[list[date]] = mapped_column(ARRAY(Date), nullable=False, default=list)
+    # Taken from data_version_seq on every refresh; validates cached report history of the site.
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
@@ -4,40 +4,76 @@ from __future__ import annotations
 from datetime import date
 from typing import Iterable
 
-from sqlalchemy import func, select
-from sqlalchemy.orm import Session, aliased
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.domain.entities import Site
-from app.domain.ports import SiteRepository
-from app.infrastructure.reports.models import ReportModel
-from app.infrastructure.sites.models import SiteModel
+from app.domain.entities import Site, SiteAccess
+from app.domain.ports import SITES_SCOPE, SiteRepository
+from app.infrastructure.data_versions import bump_data_version
+from app.infrastructure.sites.models import SiteModel, SiteReportStatsModel
 from app.infrastructure.users.models import UserModel
 
+# Fields of a site that are columns of the sites table itself.
+SITE_COLUMNS = (
+    "id",
+    "name",
+    "address",
+    "customer_name",
+    "project_manager_name",
+    "pto_responsible_name",
+    "start_date",
+    "planned_end_date",
+    "budget_total",
+    "budget_spent",
+    "progress_percent",
+    "status_note",
+    "contractor_id",
+    "pto_engineer_id",
+)
+# Fields read from site_report_stats; the last two are derived from last_report_date.
+STATS_FIELDS = ("last_report_date", "recent_report_dates", "has_today_report", "status")
+
 
 class SqlAlchemySiteRepository(SiteRepository):
-    def __init__(self, session: Session) -> None:
+    def __init__(self, session: AsyncSession) -> None:
         self._session = session
+        self._access: dict[str, SiteAccess | None] = {}
 
-    def get_by_id(self, site_id: str) -> Site | None:
+    async def get_by_id(self, site_id: str) -> Site | None:
         stmt = self._base_stmt().where(SiteModel.id == site_id)
-        row = self._session.execute(stmt).first()
+        row = (await self._session.execute(stmt)).first()
         return self._to_entity(row) if row else None
 
-    def list_all(self) -> Iterable[Site]:
-        rows = self._session.execute(self._base_stmt()).all()
+    async def get_access(self, site_id: str) -> SiteAccess | None:
+        if site_id in self._access:
+            return self._access[site_id]
+        stmt = select(SiteModel.id, SiteModel.name, SiteModel.contractor_id, SiteModel.pto_engineer_id).where(
+            SiteModel.id == site_id
+        )
+        row = (await self._session.execute(stmt)).first()
+        access = (
+            SiteAccess(id=row.id, name=row.name, contractor_id=row.contractor_id, pto_engineer_id=row.pto_engineer_id)
+            if row
+            else None
+        )
+        self._access[site_id] = access
+        return access
+
+    async def list_all(self, fields: frozenset[str] | None = None) -> Iterable[Site]:
+        rows = (await self._session.execute(self._base_stmt(fields))).all()
         return [self._to_entity(row) for row in rows]
 
-    def list_by_contractor(self, contractor_id: str) -> Iterable[Site]:
-        stmt = self._base_stmt().where(SiteModel.contractor_id == contractor_id)
-        rows = self._session.execute(stmt).all()
+    async def list_by_contractor(self, contractor_id: str, fields: frozenset[str] | None = None) -> Iterable[Site]:
+        stmt = self._base_stmt(fields).where(SiteModel.contractor_id == contractor_id)
+        rows = (await self._session.execute(stmt)).all()
         return [self._to_entity(row) for row in rows]
 
-    def list_by_pto_engineer(self, pto_engineer_id: str) -> Iterable[Site]:
-        stmt = self._base_stmt().where(SiteModel.pto_engineer_id == pto_engineer_id)
-        rows = self._session.execute(stmt).all()
+    async def list_by_pto_engineer(self, pto_engineer_id: str, fields: frozenset[str] | None = None) -> Iterable[Site]:
+        stmt = self._base_stmt(fields).where(SiteModel.pto_engineer_id == pto_engineer_id)
+        rows = (await self._session.execute(stmt)).all()
         return [self._to_entity(row) for row in rows]
 
-    def create(self, site: Site) -> Site:
+    async def create(self, site: Site) -> Site:
         model = SiteModel(
             id=site.id,
             name=site.name,
@@ -55,11 +91,13 @@ class SqlAlchemySiteRepository(SiteRepository):
             pto_engineer_id=site.pto_engineer_id,
         )
         self._session.add(model)
-        self._session.commit()
-        return self.get_by_id(site.id) or site
+        await self._session.flush()
+        await bump_data_version(self._session, SITES_SCOPE)
+        self._access.pop(site.id, None)
+        return await self.get_by_id(site.id) or site
 
-    def update(self, site: Site) -> Site | None:
-        model = self._session.get(SiteModel, site.id)
+    async def update(self, site: Site) -> Site | None:
+        model = await self._session.get(SiteModel, site.id)
         if model is None:
             return None
 
@@ -76,98 +114,75 @@ class SqlAlchemySiteRepository(SiteRepository):
         model.status_note = site.status_note
         model.contractor_id = site.contractor_id
         model.pto_engineer_id = site.pto_engineer_id
-        self._session.commit()
-        return self.get_by_id(site.id)
+        await self._session.flush()
+        await bump_data_version(self._session, SITES_SCOPE)
+        self._access.pop(site.id, None)
+        return await self.get_by_id(site.id)
 
-    def delete(self, site_id: str) -> bool:
-        model = self._session.get(SiteModel, site_id)
+    async def delete(self, site_id: str) -> bool:
+        model = await self._session.get(SiteModel, site_id)
         if model is None:
             return False
 
-        self._session.delete(model)
-        self._session.commit()
+        await self._session.delete(model)
+        await self._session.flush()
+        await bump_data_version(self._session, SITES_SCOPE)
+        self._access[site_id] = None
         return True
 
     @staticmethod
-    def _base_stmt():
-        contractor_user = aliased(UserModel)
-        pto_engineer_user = aliased(UserModel)
-        latest_report_subquery = (
-            select(
-                ReportModel.site_id.label("site_id"),
-                func.max(ReportModel.report_date).label("last_report_date"),
-            )
-            .where(ReportModel.site_id.is_not(None))
-            .group_by(ReportModel.site_id)
-            .subquery()
-        )
-        recent_reports_subquery = (
-            select(
-                ReportModel.site_id.label("site_id"),
-                ReportModel.report_date.label("report_date"),
-                func.row_number()
-                .over(
-                    partition_by=ReportModel.site_id,
-                    order_by=ReportModel.report_date.desc(),
-                )
-                .label("row_num"),
-            )
-            .where(ReportModel.site_id.is_not(None))
-            .subquery()
-        )
-        recent_report_dates_subquery = (
-            select(
-                recent_reports_subquery.c.site_id,
-                func.array_agg(recent_reports_subquery.c.report_date).label("recent_report_dates"),
-            )
-            .where(recent_reports_subquery.c.row_num <= 7)
-            .group_by(recent_reports_subquery.c.site_id)
-            .subquery()
-        )
+    def _base_stmt(fields: frozenset[str] | None = None):
+        """Sites with their names and report stats; with ``fields``, only what those fields need."""
+
+        sites, users, stats = SiteModel.__table__, UserModel.__table__, SiteReportStatsModel.__table__
 
-        return (
-            select(
-                SiteModel,
-                contractor_user.name.label("contractor_name"),
-                pto_engineer_user.name.label("pto_engineer_name"),
-                latest_report_subquery.c.last_report_date,
-                recent_report_dates_subquery.c.recent_report_dates,
+        def wanted(*names: str) -> bool:
+            return fields is None or not fields.isdisjoint(names)
+
+        stmt = select(*(sites.c[name] for name in SITE_COLUMNS if name == "id" or wanted(name))).select_from(sites)
+        if wanted("contractor_name"):
+            contractor_user = users.alias("contractor_user")
+            stmt = stmt.add_columns(contractor_user.c.name.label("contractor_name")).outerjoin(
+                contractor_user, sites.c.contractor_id == contractor_user.c.id
             )
-            .outerjoin(contractor_user, SiteModel.contractor_id == contractor_user.id)
-            .outerjoin(pto_engineer_user, SiteModel.pto_engineer_id == pto_engineer_user.id)
-            .outerjoin(latest_report_subquery, latest_report_subquery.c.site_id == SiteModel.id)
-            .outerjoin(recent_report_dates_subquery, recent_report_dates_subquery.c.site_id == SiteModel.id)
-            .order_by(SiteModel.name.asc())
-        )
+        if wanted("pto_engineer_name"):
+            pto_engineer_user = users.alias("pto_engineer_user")
+            stmt = stmt.add_columns(pto_engineer_user.c.name.label("pto_engineer_name")).outerjoin(
+                pto_engineer_user, sites.c.pto_engineer_id == pto_engineer_user.c.id
+            )
+        if wanted(*STATS_FIELDS):
+            stmt = stmt.add_columns(stats.c.last_report_date)
+            if wanted("recent_report_dates"):
+                stmt = stmt.add_columns(stats.c.recent_report_dates)
+            stmt = stmt.outerjoin(stats, stats.c.site_id == sites.c.id)
+        return stmt.order_by(sites.c.name.asc())
 
     @staticmethod
     def _to_entity(row) -> Site:
-        site_model: SiteModel = row[0]
-        contractor_name: str | None = row[1]
-        pto_engineer_name: str | None = row[2]
-        last_report_date: date | None = row[3]
-        recent_report_dates: list[date] | None = row[4]
+        # Columns left out by a sparse ``_base_stmt`` keep the entity defaults.
+        values = row._mapping
+        last_report_date: date | None = values.get("last_report_date")
         has_today_report = last_report_date == date.today() if last_report_date else False
 
         return Site(
-            id=site_model.id,
-            name=site_model.name,
-            address=site_model.address,
-            customer_name=site_model.customer_name,
-            project_manager_name=site_model.project_manager_name,
-            pto_responsible_name=site_model.pto_responsible_name,
-            start_date=site_model.start_date,
-            planned_end_date=site_model.planned_end_date,
-            budget_total=site_model.budget_total,
-            budget_spent=site_model.budget_spent,
-            progress_percent=site_model.progress_percent,
-            status_note=site_model.status_note,
-            contractor_id=site_model.contractor_id,
-            contractor_name=contractor_name,
-            pto_engineer_id=site_model.pto_engineer_id,
-            pto_engineer_name=pto_engineer_name,
+            id=values["id"],
+            name=values.get("name", ""),
+            address=values.get("address", ""),
+            customer_name=values.get("customer_name"),
+            project_manager_name=values.get("project_manager_name"),
+            pto_responsible_name=values.get("pto_responsible_name"),
+            start_date=values.get("start_date"),
+            planned_end_date=values.get("planned_end_date"),
+            budget_total=values.get("budget_total"),
+            budget_spent=values.get("budget_spent"),
+            progress_percent=values.get("progress_percent"),
+            status_note=values.get("status_note"),
+            contractor_id=values.get("contractor_id"),
+            contractor_name=values.get("contractor_name"),
+            pto_engineer_id=values.get("pto_engineer_id"),
+            pto_engineer_name=values.get("pto_engineer_name"),
             last_report_date=last_report_date,
-            recent_report_dates=list(recent_report_dates or []),
+            recent_report_dates=list(values.get("recent_report_dates") or []),
             has_today_report=has_today_report,
             status="sent" if has_today_report else "missing",
         )
@@ -0,0 +1,87 @@
+"""Maintenance of the per-site report summary (``site_report_stats``)."""
+from __future__ import annotations
+
+from typing import Iterable
+
+from sqlalchemy import Connection, delete, func, insert, select, update
+from sqlalchemy.dialects.postgresql import aggregate_order_by, insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.infrastructure.data_versions.models import DATA_VERSION_SEQ
+from app.infrastructure.reports.models import ReportModel
+from app.infrastructure.sites.models import SiteReportStatsModel
+
+RECENT_REPORT_DATES = 7
+
+
+async def refresh_site_report_stats(session: AsyncSession, site_ids: Iterable[str | None]) -> None:
+    """Recompute the summary of the given sites inside the caller's transaction.
+
+    Pending report changes must already be flushed. The summary row is locked
+    before reading so concurrent writers for the same site serialize and the
+    last one to commit always sees every committed report.
+    """
+
+    for site_id in sorted({site_id for site_id in site_ids if site_id}):
+        await session.execute(
+            pg_insert(SiteReportStatsModel)
+            .values(site_id=site_id, recent_report_dates=[])
+            .on_conflict_do_nothing(index_elements=[SiteReportStatsModel.site_id])
+        )
+        await session.execute(
+            select(SiteReportStatsModel.site_id).where(SiteReportStatsModel.site_id == site_id).with_for_update()
+        )
+        dates = list(
+            (
+                await session.execute(
+                    select(ReportModel.report_date)
+                    .where(ReportModel.site_id == site_id)
+                    .order_by(ReportModel.report_date.desc())
+                    .limit(RECENT_REPORT_DATES)
+                )
+            ).scalars()
+        )
+        await session.execute(
+            update(SiteReportStatsModel)
+            .where(SiteReportStatsModel.site_id == site_id)
+            .values(
+                last_report_date=dates[0] if dates else None,
+                recent_report_dates=dates,
+                version=DATA_VERSION_SEQ.next_value(),
+            )
+        )
+
+
+def rebuild_site_report_stats(connection: Connection) -> int:
+    """Rebuild the whole summary from ``reports``; used by the backfill script."""
+
+    ranked = (
+        select(
+            ReportModel.site_id.label("site_id"),
+            ReportModel.report_date.label("report_date"),
+            func.row_number()
+            .over(partition_by=ReportModel.site_id, order_by=ReportModel.report_date.desc())
+            .label("row_num"),
+        )
+        .where(ReportModel.site_id.is_not(None))
+        .subquery()
+    )
+    summary = (
+        select(
+            ranked.c.site_id,
+            func.max(ranked.c.report_date),
+            func.array_agg(aggregate_order_by(ranked.c.report_date, ranked.c.report_date.desc())),
+            DATA_VERSION_SEQ.next_value(),
+        )
+        .where(ranked.c.row_num <= RECENT_REPORT_DATES)
+        .group_by(ranked.c.site_id)
+    )
+
+    connection.execute(delete(SiteReportStatsModel))
+    result = connection.execute(
+        insert(SiteReportStatsModel).from_select(
+            ["site_id", "last_report_date", "recent_report_dates", "version"],
+            summary,
+        ).returning(SiteReportStatsModel.site_id)
+    )
+    return len(result.all())
@@ -1,3 +1,4 @@
-from .yandex import YandexStorage
+from .local import LocalFileStorage
+from .yandex import StoredObject, YandexStorage
 
-__all__ = ["YandexStorage"]
+__all__ = ["LocalFileStorage", "StoredObject", "YandexStorage"]
@@ -0,0 +1,102 @@
+"""Resized photo variants (thumbnail, medium) rendered in a process pool."""
+from __future__ import annotations
+
+import asyncio
+import io
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Sequence, Tuple
+
+from app.config import Settings
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Pillow is optional: without it photos are stored as uploaded.
+    Image = ImageOps = None
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class VariantSpec:
+    name: str
+    max_side: int
+    format: str
+    quality: int
+    extension: str
+    content_type: str
+
+
+def default_variant_specs(*, thumb_size: int, medium_size: int) -> Tuple[VariantSpec, ...]:
+    return (
+        VariantSpec("thumb", thumb_size, "JPEG", 75, ".jpg", "image/jpeg"),
+        VariantSpec("medium", medium_size, "WEBP", 80, ".webp", "image/webp"),
+    )
+
+
+def variant_key(key: str, spec: VariantSpec) -> str:
+    """``.../<uuid>-photo.jpg`` -> ``.../<uuid>-photo.thumb.jpg``; stored next to the original."""
+
+    stem = key.rsplit(".", 1)[0] if "." in key.rsplit("/", 1)[-1] else key
+    return f"{stem}.{spec.name}{spec.extension}"
+
+
+def render_variants(path: str, specs: Sequence[VariantSpec]) -> Dict[str, bytes]:
+    """Encode every spec from one decode of the photo file at ``path``; runs inside a pool worker.
+
+    The worker reads the file itself, so only the path is pickled to it, never the photo.
+    Orientation is baked into the pixels first, then the variants are saved without
+    the source EXIF (GPS, maker notes, embedded previews).
+    """
+
+    largest = max(spec.max_side for spec in specs)
+    with Image.open(path) as source:
+        # JPEG only: let the decoder downscale by 1/2..1/8 instead of decoding full resolution.
+        source.draft("RGB", (largest, largest))
+        image = ImageOps.exif_transpose(source).convert("RGB")
+
+    rendered: Dict[str, bytes] = {}
+    for spec in sorted(specs, key=lambda item: item.max_side, reverse=True):
+        image.thumbnail((spec.max_side, spec.max_side), Image.Resampling.LANCZOS)
+        buffer = io.BytesIO()
+        image.save(buffer, format=spec.format, quality=spec.quality, optimize=True)
+        rendered[spec.name] = buffer.getvalue()
+    return rendered
+
+
+class ImageProcessor:
+    """Owns the worker processes; decoding and resizing are CPU-bound and hold the GIL."""
+
+    def __init__(self, *, specs: Sequence[VariantSpec], max_workers: int) -> None:
+        self.specs: Tuple[VariantSpec, ...] = tuple(specs)
+        # "spawn": forking a process that already runs an event loop and boto3 threads is unsafe.
+        self._executor = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+
+    @staticmethod
+    def available() -> bool:
+        return Image is not None
+
+    async def render(self, path: str) -> Dict[str, bytes]:
+        """Variants of the photo file at ``path``, which must stay in place until this returns."""
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, render_variants, path, self.specs)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def build_image_processor(settings: Settings, specs: Sequence[VariantSpec]) -> ImageProcessor | None:
+    """The storage backend's processor, or None when variants are off or Pillow is missing."""
+
+    if not settings.image_variants_enabled:
+        return None
+    if not ImageProcessor.available():
+        logger.warning("Photo variants disabled: Pillow is not installed")
+        return None
+    return ImageProcessor(specs=specs, max_workers=settings.image_workers)
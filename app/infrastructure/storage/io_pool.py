@@ -0,0 +1,58 @@
+"""Bounded thread pool for blocking storage calls."""
+from __future__ import annotations
+
+import asyncio
+import functools
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, TypeVar
+
+T = TypeVar("T")
+
+
+class StorageIOPool:
+    """Runs blocking storage I/O on its own threads instead of the loop's default executor.
+
+    A burst of uploads therefore queues here rather than starving everything else
+    that uses ``asyncio.to_thread``. ``stats()`` reports how many calls are waiting
+    for a thread (the queue depth) and how many are running.
+    """
+
+    def __init__(self, *, max_workers: int, name: str = "storage-io") -> None:
+        self._max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+
+    async def run(self, func: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+        call = functools.partial(func, *args, **kwargs)
+
+        def started() -> T:
+            with self._lock:
+                self._queued -= 1
+                self._running += 1
+            try:
+                return call()
+            finally:
+                with self._lock:
+                    self._running -= 1
+
+        def finished(future: Future) -> None:
+            # Cancelled before a thread picked it up, so ``started`` never ran.
+            if future.cancelled():
+                with self._lock:
+                    self._queued -= 1
+
+        with self._lock:
+            self._queued += 1
+        future = self._executor.submit(started)
+        future.add_done_callback(finished)
+        return await asyncio.wrap_future(future)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"workers": self._max_workers, "queued": self._queued, "running": self._running}
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,120 @@
+"""Object key layout shared by the storage backends."""
+from __future__ import annotations
+
+import re
+import uuid
+from dataclasses import dataclass
+from datetime import date, datetime
+from pathlib import Path
+
+QUARANTINE_PREFIX = "quarantine/"
+
+
+@dataclass(frozen=True, slots=True)
+class StoredObject:
+    key: str
+    size: int
+    last_modified: datetime
+
+
+CYRILLIC_TO_LATIN = {
+    "а": "a",
+    "б": "b",
+    "в": "v",
+    "г": "g",
+    "д": "d",
+    "е": "e",
+    "ё": "e",
+    "ж": "zh",
+    "з": "z",
+    "и": "i",
+    "й": "y",
+    "к": "k",
+    "л": "l",
+    "м": "m",
+    "н": "n",
+    "о": "o",
+    "п": "p",
+    "р": "r",
+    "с": "s",
+    "т": "t",
+    "у": "u",
+    "ф": "f",
+    "х": "h",
+    "ц": "ts",
+    "ч": "ch",
+    "ш": "sh",
+    "щ": "sch",
+    "ъ": "",
+    "ы": "y",
+    "ь": "",
+    "э": "e",
+    "ю": "yu",
+    "я": "ya",
+}
+
+
+def slugify_site_name(value: str | None) -> str:
+    raw = (value or "").strip().lower()
+    if not raw:
+        return ""
+
+    transliterated = "".join(CYRILLIC_TO_LATIN.get(char, char) for char in raw)
+    slug = re.sub(r"[^a-z0-9]+", "-", transliterated).strip("-")
+    return re.sub(r"-{2,}", "-", slug)
+
+
+def day_prefix(root: Path, *, site_id: str, site_name: str | None, report_date: date) -> Path:
+    site_slug = slugify_site_name(site_name)
+    site_prefix = f"{site_id}-{site_slug}" if site_slug else site_id
+    return root / site_prefix / f"{report_date:%Y}" / f"{report_date:%m}" / f"{report_date:%d}"
+
+
+def content_key(
+    root: Path,
+    filename: str | None,
+    digest: str,
+    *,
+    site_id: str,
+    site_name: str | None,
+    report_date: date,
+) -> str:
+    """``reports/<site>/<Y>/<m>/<d>/<sha256><ext>``: no report id, so a retry under a new id matches."""
+
+    ext = Path(filename or "").suffix or ".jpg"
+    prefix = day_prefix(root, site_id=site_id, site_name=site_name, report_date=report_date)
+    return str(prefix / f"{digest}{ext.lower()}")
+
+
+def new_key(
+    root: Path,
+    filename: str | None,
+    *,
+    site_id: str,
+    site_name: str | None,
+    report_id: str,
+    report_date: date,
+) -> str:
+    ext = Path(filename or "").suffix or ".jpg"
+    original_name = Path(filename or "").stem.strip()
+    file_slug = slugify_site_name(original_name) or "photo"
+    prefix = day_prefix(root, site_id=site_id, site_name=site_name, report_date=report_date)
+    return str(prefix / report_id / f"{uuid.uuid4().hex}-{file_slug}{ext.lower()}")
+
+
+def is_report_key(root: Path, key: str, *, site_id: str, report_id: str, report_date: date) -> bool:
+    """Whether ``key`` has the ``reports/<site>/<Y>/<m>/<d>/<report_id>/<file>`` shape of this report.
+
+    The site segment is matched by id only, so a site renamed in between still matches.
+    """
+
+    parts = key.split("/")
+    if len(parts) != 7 or any(part in {"", ".", ".."} for part in parts):
+        return False
+    key_root, site_prefix, year, month, day, key_report_id, _ = parts
+    return (
+        key_root == str(root)
+        and (site_prefix == site_id or site_prefix.startswith(f"{site_id}-"))
+        and (year, month, day) == (f"{report_date:%Y}", f"{report_date:%m}", f"{report_date:%d}")
+        and key_report_id == report_id
+    )
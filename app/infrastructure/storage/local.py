@@ -0,0 +1,362 @@
+"""Local filesystem storage adapter for benchmarks and offline runs."""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import hmac
+import logging
+import os
+import tempfile
+import time
+from contextlib import suppress
+from datetime import date, datetime, timezone
+from pathlib import Path
+from stat import S_ISREG
+from time import perf_counter
+from typing import AsyncContextManager, AsyncIterable, Awaitable, Callable, Dict, Iterator, List, Sequence
+from urllib.parse import urlencode
+
+from fastapi import UploadFile
+
+from app.config import Settings
+from app.domain.entities import PresignedUpload, StoredPhoto
+from app.domain.ports import StoragePort
+from app.infrastructure.storage.images import build_image_processor, default_variant_specs, variant_key
+from app.infrastructure.storage.io_pool import StorageIOPool
+from app.infrastructure.storage.keys import (
+    QUARANTINE_PREFIX,
+    StoredObject,
+    content_key,
+    is_report_key,
+    new_key,
+)
+
+logger = logging.getLogger(__name__)
+
+LIST_PAGE_SIZE = 1000
+# Partial writes live here until they are renamed into place; same filesystem, so the rename is atomic.
+TMP_DIR = ".tmp"
+
+
+class LocalFileStorage(StoragePort):
+    """Keeps photos as files under ``LOCAL_STORAGE_DIR`` with the same keys as the bucket.
+
+    Files are written in ``LOCAL_STORAGE_CHUNK_SIZE`` blocks on the storage I/O pool
+    and renamed into place, so a reader never sees a partial photo. They are served
+    by ``app.api.routers.files``, which also accepts the signed PUTs of
+    ``presign_upload``. Like ``YandexStorage``, one instance lives for the whole process.
+    """
+
+    def __init__(self, settings: Settings) -> None:
+        self._settings = settings
+        self._root = Path(settings.local_storage_dir).resolve()
+        self._tmp_dir = self._root / TMP_DIR
+        self._tmp_dir.mkdir(parents=True, exist_ok=True)
+        self._base_url = settings.local_storage_public_url.rstrip("/")
+        self._chunk_size = settings.local_storage_chunk_size
+        self._io = StorageIOPool(max_workers=settings.storage_io_workers, name="local-storage-io")
+        self._variant_specs = default_variant_specs(
+            thumb_size=settings.image_thumb_size,
+            medium_size=settings.image_medium_size,
+        )
+        self._images = build_image_processor(settings, self._variant_specs)
+
+    def close(self) -> None:
+        self._io.close()
+        if self._images is not None:
+            self._images.close()
+
+    async def upload(
+        self,
+        file: UploadFile,
+        *,
+        site_id: str,
+        site_name: str | None,
+        report_id: str,
+        report_date: date,
+        lock: Callable[[str], Awaitable[None]] | None = None,
+    ) -> StoredPhoto:
+        """Store ``file`` under its content hash, as ``YandexStorage.upload`` does."""
+
+        started_at = perf_counter()
+        digest, size, temp_path = await self._io.run(self._write_spool, file)
+        key = content_key(
+            self._settings.storage_key_prefix(),
+            file.filename,
+            digest,
+            site_id=site_id,
+            site_name=site_name,
+            report_date=report_date,
+        )
+        try:
+            if lock is not None:
+                await lock(self.public_url(key))
+            reused = await self._io.run(self._place_spool, temp_path, self._root / key)
+        except BaseException:
+            with suppress(FileNotFoundError):
+                os.unlink(temp_path)
+            raise
+        variants = await self._io.run(self._existing_variants, key) if reused else {}
+        if not variants and self._images is not None:
+            variants = await self._store_variants(key)
+        logger.info(
+            "%s photo '%s' (%d bytes) at key '%s' in %.3fs",
+            "Reused" if reused else "Stored",
+            file.filename or key,
+            size,
+            key,
+            perf_counter() - started_at,
+        )
+        return StoredPhoto(url=self.public_url(key), variants=variants)
+
+    async def presign_upload(
+        self,
+        *,
+        filename: str,
+        content_type: str | None,
+        size: int,
+        site_id: str,
+        site_name: str | None,
+        report_id: str,
+        report_date: date,
+    ) -> PresignedUpload:
+        key = new_key(
+            self._settings.storage_key_prefix(),
+            filename,
+            site_id=site_id,
+            site_name=site_name,
+            report_id=report_id,
+            report_date=report_date,
+        )
+        expires_in = self._settings.yc_s3_presign_expires_seconds
+        expires = int(time.time()) + expires_in
+        query = urlencode({"size": size, "expires": expires, "signature": self._signature(key, size, expires)})
+        headers = {"Content-Type": content_type} if content_type else {}
+        return PresignedUpload(key=key, url=f"{self.public_url(key)}?{query}", expires_in=expires_in, headers=headers)
+
+    def verify_upload(self, key: str, *, size: int, expires: int, signature: str) -> bool:
+        """Whether a PUT of at most ``size`` bytes to ``key`` carries a live signature from ``presign_upload``."""
+
+        return expires >= time.time() and hmac.compare_digest(signature, self._signature(key, size, expires))
+
+    def _signature(self, key: str, size: int, expires: int) -> str:
+        message = f"PUT\n{key}\n{size}\n{expires}".encode()
+        return hmac.new(self._settings.jwt_secret.encode(), message, hashlib.sha256).hexdigest()
+
+    async def write_stream(self, key: str, chunks: AsyncIterable[bytes]) -> int:
+        """Write a request body to ``key`` chunk by chunk; returns its size."""
+
+        path = self.path_of(key)
+        if path is None:
+            raise ValueError(f"Invalid storage key '{key}'")
+        target = await self._io.run(tempfile.NamedTemporaryFile, dir=self._tmp_dir, delete=False)
+        size = 0
+        try:
+            with target:
+                async for chunk in chunks:
+                    if chunk:
+                        await self._io.run(target.write, chunk)
+                        size += len(chunk)
+            await self._io.run(self._move_into_place, target.name, path)
+        except BaseException:
+            with suppress(FileNotFoundError):
+                os.unlink(target.name)
+            raise
+        return size
+
+    async def confirm_upload(
+        self,
+        key: str,
+        *,
+        site_id: str,
+        report_id: str,
+        report_date: date,
+        reserve: Callable[[int], AsyncContextManager[None]] | None = None,
+    ) -> StoredPhoto | None:
+        """The uploaded ``key`` with its variants; they render from the file in place, so ``reserve`` is not needed."""
+
+        root = self._settings.storage_key_prefix()
+        if not is_report_key(root, key, site_id=site_id, report_id=report_id, report_date=report_date):
+            return None
+        path = self.path_of(key)
+        if path is None or not await self._io.run(path.is_file):
+            return None
+        variants = await self._store_variants(key) if self._images is not None else {}
+        return StoredPhoto(url=self.public_url(key), variants=variants)
+
+    async def _store_variants(self, key: str) -> dict[str, str]:
+        """Render and write the variants of ``key``; a photo Pillow cannot read keeps none."""
+
+        try:
+            # The stored file itself: the pool worker opens it, nothing is read into this process.
+            rendered = await self._images.render(str(self._root / key))
+        except Exception:
+            logger.warning("Could not render variants of '%s'", key, exc_info=True)
+            return {}
+
+        specs = [spec for spec in self._variant_specs if spec.name in rendered]
+        await asyncio.gather(
+            *(self._io.run(self._write_bytes, variant_key(key, spec), rendered[spec.name]) for spec in specs)
+        )
+        return {spec.name: self.public_url(variant_key(key, spec)) for spec in specs}
+
+    def _existing_variants(self, key: str) -> dict[str, str]:
+        return {
+            spec.name: self.public_url(variant_key(key, spec))
+            for spec in self._variant_specs
+            if self._root.joinpath(variant_key(key, spec)).is_file()
+        }
+
+    def _write_spool(self, file: UploadFile) -> tuple[str, int, str]:
+        """Copy the spooled upload to a temporary file while hashing it, in one pass.
+
+        Returns the SHA-256, the size and the temporary file for ``_place_spool``.
+        """
+
+        source = file.file
+        source.seek(0)
+        digest = hashlib.sha256()
+        buffer = bytearray(self._chunk_size)
+        view = memoryview(buffer)
+        size = 0
+        with tempfile.NamedTemporaryFile(dir=self._tmp_dir, delete=False) as target:
+            try:
+                while read := source.readinto(buffer):
+                    digest.update(view[:read])
+                    target.write(view[:read])
+                    size += read
+            except BaseException:
+                os.unlink(target.name)
+                raise
+        return digest.hexdigest(), size, target.name
+
+    def _place_spool(self, temp_path: str, path: Path) -> bool:
+        """Rename the copy to ``path``, or drop it if an identical file is already there; True if it was."""
+
+        if path.is_file():
+            os.unlink(temp_path)
+            return True
+        self._move_into_place(temp_path, path)
+        return False
+
+    def _write_bytes(self, key: str, data: bytes) -> None:
+        with tempfile.NamedTemporaryFile(dir=self._tmp_dir, delete=False) as target:
+            target.write(data)
+        self._move_into_place(target.name, self._root / key)
+
+    @staticmethod
+    def _move_into_place(temp_path: str, path: Path) -> None:
+        try:
+            # mkstemp creates 0600 files; photos are public, as with public-read in the bucket.
+            os.chmod(temp_path, 0o644)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(temp_path, path)
+        except BaseException:
+            with suppress(FileNotFoundError):
+                os.unlink(temp_path)
+            raise
+
+    def path_of(self, key: str) -> Path | None:
+        """Filesystem path of ``key``; None for keys outside the storage root or its temp dir."""
+
+        parts = key.split("/")
+        if not key or parts[0] == TMP_DIR or any(part in {"", ".", ".."} for part in parts):
+            return None
+        path = self._root.joinpath(*parts)
+        return path if path.is_relative_to(self._root) else None
+
+    async def stat(self, key: str) -> os.stat_result | None:
+        """``stat`` of the regular file at ``key``; None when there is none."""
+
+        path = self.path_of(key)
+        if path is None:
+            return None
+        try:
+            result = await self._io.run(os.stat, path)
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+        return result if S_ISREG(result.st_mode) else None
+
+    def io_stats(self) -> Dict[str, int]:
+        return self._io.stats()
+
+    async def delete(self, url: str) -> None:
+        await self.delete_many([url])
+
+    async def delete_many(self, urls: Sequence[str]) -> None:
+        keys: List[str] = []
+        for url in urls:
+            key = self.key_of(url)
+            if key is None:
+                logger.warning("Skip deleting unsupported storage url '%s'", url)
+                continue
+            keys += [key, *self.variant_keys(key)]
+        await self.delete_keys(keys)
+
+    async def delete_keys(self, keys: Sequence[str]) -> None:
+        if keys:
+            await self._io.run(self._unlink_keys, list(dict.fromkeys(keys)))
+
+    def _unlink_keys(self, keys: List[str]) -> None:
+        for key in keys:
+            path = self.path_of(key)
+            if path is not None:
+                # Missing files count as deleted, like S3 DeleteObjects.
+                path.unlink(missing_ok=True)
+
+    async def quarantine_keys(self, keys: Sequence[str], *, prefix: str = QUARANTINE_PREFIX) -> None:
+        await self._io.run(self._move_keys, list(keys), prefix)
+
+    def _move_keys(self, keys: List[str], prefix: str) -> None:
+        for key in keys:
+            path = self.path_of(key)
+            if path is None or not path.is_file():
+                continue
+            target = self._root / f"{prefix}{key}"
+            target.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(path, target)
+
+    async def last_modified(self, key: str) -> datetime | None:
+        """When ``key`` was last written; None if it does not exist."""
+
+        result = await self.stat(key)
+        return None if result is None else datetime.fromtimestamp(result.st_mtime, tz=timezone.utc)
+
+    def iter_objects(self, prefix: str) -> Iterator[List[StoredObject]]:
+        """Files under ``prefix`` in key order, ``LIST_PAGE_SIZE`` at a time (the shape of ListObjectsV2)."""
+
+        page: List[StoredObject] = []
+        for directory, subdirs, files in os.walk(self._root / prefix):
+            subdirs.sort()
+            for name in sorted(files):
+                path = Path(directory, name)
+                stat = path.stat()
+                page.append(
+                    StoredObject(
+                        key=path.relative_to(self._root).as_posix(),
+                        size=stat.st_size,
+                        last_modified=datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc),
+                    )
+                )
+                if len(page) == LIST_PAGE_SIZE:
+                    yield page
+                    page = []
+        if page:
+            yield page
+
+    def key_of(self, url: str) -> str | None:
+        """Object key of a photo URL served by this storage; None for any other URL."""
+
+        base_prefix = f"{self._base_url}/"
+        if not url.startswith(base_prefix):
+            return None
+        return url.removeprefix(base_prefix) or None
+
+    def public_url(self, key: str) -> str:
+        return f"{self._base_url}/{key}"
+
+    def variant_keys(self, key: str) -> List[str]:
+        return [variant_key(key, spec) for spec in self._variant_specs]
+
+    def is_variant_key(self, key: str) -> bool:
+        return any(key.endswith(f".{spec.name}{spec.extension}") for spec in self._variant_specs)
@@ -2,83 +2,95 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import logging
-import re
-import uuid
-from datetime import date
-from pathlib import Path
+import os
+import tempfile
+from contextlib import nullcontext, suppress
+from datetime import date, datetime
 from time import perf_counter
+from typing import AsyncContextManager, Awaitable, Callable, Dict, Iterator, List, Sequence
 
 import boto3
+from boto3.s3.transfer import TransferConfig
 from botocore.config import Config
+from botocore.exceptions import ClientError
 from fastapi import UploadFile
 
 from app.config import Settings
+from app.domain.entities import PresignedUpload, StoredPhoto
 from app.domain.ports import StoragePort
+from app.infrastructure.storage.images import build_image_processor, default_variant_specs, variant_key
+from app.infrastructure.storage.io_pool import StorageIOPool
+from app.infrastructure.storage.keys import (
+    QUARANTINE_PREFIX,
+    StoredObject,
+    content_key,
+    is_report_key,
+    new_key,
+)
 
 logger = logging.getLogger(__name__)
 
-CYRILLIC_TO_LATIN = {
-    "а": "a",
-    "б": "b",
-    "в": "v",
-    "г": "g",
-    "д": "d",
-    "е": "e",
-    "ё": "e",
-    "ж": "zh",
-    "з": "z",
-    "и": "i",
-    "й": "y",
-    "к": "k",
-    "л": "l",
-    "м": "m",
-    "н": "n",
-    "о": "o",
-    "п": "p",
-    "р": "r",
-    "с": "s",
-    "т": "t",
-    "у": "u",
-    "ф": "f",
-    "х": "h",
-    "ц": "ts",
-    "ч": "ch",
-    "ш": "sh",
-    "щ": "sch",
-    "ъ": "",
-    "ы": "y",
-    "ь": "",
-    "э": "e",
-    "ю": "yu",
-    "я": "ya",
-}
-
-
-def slugify_site_name(value: str | None) -> str:
-    raw = (value or "").strip().lower()
-    if not raw:
-        return ""
-
-    transliterated = "".join(CYRILLIC_TO_LATIN.get(char, char) for char in raw)
-    slug = re.sub(r"[^a-z0-9]+", "-", transliterated).strip("-")
-    return re.sub(r"-{2,}", "-", slug)
+# S3 DeleteObjects accepts at most this many keys per request.
+DELETE_OBJECTS_MAX_KEYS = 1000
+# Block size when hashing an upload and copying it to disk for the variant renderer.
+SPOOL_READ_SIZE = 1024 * 1024
+
+
+def build_s3_client(settings: Settings):
+    """Create the boto3 S3 client; expensive, so build it once per process and share it."""
+
+    return boto3.client(
+        "s3",
+        endpoint_url=str(settings.yc_s3_endpoint),
+        region_name=settings.yc_s3_region,
+        aws_access_key_id=settings.yc_s3_access_key_id,
+        aws_secret_access_key=settings.yc_s3_secret_access_key,
+        config=Config(
+            retries={"max_attempts": settings.yc_s3_max_attempts, "mode": "standard"},
+            connect_timeout=settings.yc_s3_connect_timeout,
+            read_timeout=settings.yc_s3_read_timeout,
+            max_pool_connections=settings.yc_s3_max_pool_connections,
+            tcp_keepalive=settings.yc_s3_tcp_keepalive,
+            s3={"addressing_style": settings.yc_s3_addressing_style},
+        ),
+    )
 
 
 class YandexStorage(StoragePort):
+    """S3 adapter meant to live for the whole process (see ``app.main.lifespan``).
+
+    boto3 clients are thread-safe, so one instance serves every request and keeps
+    its HTTPS connections alive between uploads.
+    """
+
     def __init__(self, settings: Settings) -> None:
         if not settings.has_storage_credentials:
             raise ValueError("YC_S3_ACCESS_KEY_ID and YC_S3_SECRET_ACCESS_KEY must be provided for uploads")
 
         self._settings = settings
-        self._client = boto3.client(
-            "s3",
-            endpoint_url=str(settings.yc_s3_endpoint),
-            region_name=settings.yc_s3_region,
-            aws_access_key_id=settings.yc_s3_access_key_id,
-            aws_secret_access_key=settings.yc_s3_secret_access_key,
-            config=Config(retries={"max_attempts": 3, "mode": "standard"}, connect_timeout=5, read_timeout=30),
+        self._client = build_s3_client(settings)
+        self._io = StorageIOPool(max_workers=settings.storage_io_workers)
+        # Parts are read from the upload spool one at a time, so memory per upload stays
+        # around one chunk instead of the whole photo.
+        self._transfer_config = TransferConfig(
+            multipart_threshold=settings.yc_s3_multipart_threshold,
+            multipart_chunksize=settings.yc_s3_multipart_chunksize,
+            use_threads=False,
         )
+        # Kept even when rendering is off, so ``delete`` still removes variants made earlier.
+        self._variant_specs = default_variant_specs(
+            thumb_size=settings.image_thumb_size,
+            medium_size=settings.image_medium_size,
+        )
+        self._images = build_image_processor(settings, self._variant_specs)
+
+    def close(self) -> None:
+        self._io.close()
+        self._client.close()
+        if self._images is not None:
+            self._images.close()
 
     async def upload(
         self,
@@ -88,64 +100,375 @@ class YandexStorage(StoragePort):
         site_name: str | None,
         report_id: str,
         report_date: date,
-    ) -> str:
+        lock: Callable[[str], Awaitable[None]] | None = None,
+    ) -> StoredPhoto:
+        """Store ``file`` under its content hash; identical bytes for the same site and day reuse one object.
+
+        Retried ``POST /reports`` and ``PATCH`` requests therefore skip the PUT. Objects
+        may be shared between reports, so callers must delete only unreferenced URLs,
+        and ``lock`` the URL before it is looked up.
+        """
+
         total_started_at = perf_counter()
-        ext = Path(file.filename or "").suffix or ".jpg"
-        site_slug = slugify_site_name(site_name)
-        site_prefix = f"{site_id}-{site_slug}" if site_slug else site_id
-        original_name = Path(file.filename or "").stem.strip()
-        file_slug = slugify_site_name(original_name) or "photo"
-        key = str(
-            self._settings.storage_key_prefix()
-            / site_prefix
-            / f"{report_date:%Y}"
-            / f"{report_date:%m}"
-            / f"{report_date:%d}"
-            / report_id
-            / f"{uuid.uuid4().hex}-{file_slug}{ext.lower()}"
+        digest, copy_path = await self._io.run(self._scan_spool, file)
+        try:
+            return await self._store_upload(
+                file,
+                digest,
+                copy_path,
+                site_id=site_id,
+                site_name=site_name,
+                report_id=report_id,
+                report_date=report_date,
+                lock=lock,
+                total_started_at=total_started_at,
+            )
+        finally:
+            if copy_path is not None:
+                self._remove_copy(copy_path)
+
+    async def _store_upload(
+        self,
+        file: UploadFile,
+        digest: str,
+        copy_path: str | None,
+        *,
+        site_id: str,
+        site_name: str | None,
+        report_id: str,
+        report_date: date,
+        lock: Callable[[str], Awaitable[None]] | None,
+        total_started_at: float,
+    ) -> StoredPhoto:
+        key = content_key(
+            self._settings.storage_key_prefix(),
+            file.filename,
+            digest,
+            site_id=site_id,
+            site_name=site_name,
+            report_date=report_date,
         )
-        read_started_at = perf_counter()
-        content = await file.read()
-        read_elapsed = perf_counter() - read_started_at
-        upload_started_at = perf_counter()
+        if lock is not None:
+            await lock(self._public_url(key))
+        existing = await self._existing_photo(key)
+        if existing is not None:
+            if not existing.variants and copy_path is not None:
+                existing = StoredPhoto(url=existing.url, variants=await self._store_variants(key, copy_path))
+            logger.info(
+                "Reused stored photo '%s' for '%s' of report %s in %.3fs",
+                key,
+                file.filename or key,
+                report_id,
+                perf_counter() - total_started_at,
+            )
+            return existing
 
-        await asyncio.to_thread(
-            self._client.put_object,
-            Bucket=self._settings.yc_s3_bucket,
-            Key=key,
-            Body=content,
-            ContentType=file.content_type,
-            ACL="public-read",
+        if copy_path is None:
+            size = await self._io.run(self._stream_to_s3, file, key)
+            variants = {}
+        else:
+            # Variants render in the pool while the original is still uploading.
+            size, variants = await asyncio.gather(
+                self._io.run(self._stream_to_s3, file, key),
+                self._store_variants(key, copy_path),
+            )
+        logger.info(
+            "Uploaded photo '%s' (%d bytes) to key '%s' in %.3fs",
+            file.filename or key,
+            size,
+            key,
+            perf_counter() - total_started_at,
+        )
+
+        return StoredPhoto(url=self._public_url(key), variants=variants)
+
+    async def presign_upload(
+        self,
+        *,
+        filename: str,
+        content_type: str | None,
+        size: int,
+        site_id: str,
+        site_name: str | None,
+        report_id: str,
+        report_date: date,
+    ) -> PresignedUpload:
+        key = new_key(
+            self._settings.storage_key_prefix(),
+            filename,
+            site_id=site_id,
+            site_name=site_name,
+            report_id=report_id,
+            report_date=report_date,
+        )
+        headers = {"x-amz-acl": "public-read"}
+        # ContentLength makes Content-Length a signed header: the PUT must send exactly ``size`` bytes.
+        params = {"Bucket": self._settings.yc_s3_bucket, "Key": key, "ACL": "public-read", "ContentLength": size}
+        if content_type:
+            headers["Content-Type"] = content_type
+            params["ContentType"] = content_type
+        expires_in = self._settings.yc_s3_presign_expires_seconds
+        # Signing is local computation; no request reaches the bucket here.
+        url = self._client.generate_presigned_url("put_object", Params=params, ExpiresIn=expires_in)
+        return PresignedUpload(key=key, url=url, expires_in=expires_in, headers=headers)
+
+    async def confirm_upload(
+        self,
+        key: str,
+        *,
+        site_id: str,
+        report_id: str,
+        report_date: date,
+        reserve: Callable[[int], AsyncContextManager[None]] | None = None,
+    ) -> StoredPhoto | None:
+        root = self._settings.storage_key_prefix()
+        if not is_report_key(root, key, site_id=site_id, report_id=report_id, report_date=report_date):
+            return None
+        try:
+            head = await self._io.run(self._client.head_object, Bucket=self._settings.yc_s3_bucket, Key=key)
+        except ClientError as exc:
+            if self._is_not_found(exc):
+                return None
+            raise
+        if self._images is None:
+            return StoredPhoto(url=self._public_url(key))
+        # The bytes never passed through us: download them to a file (in parts) to render from,
+        # charged to ``reserve`` by the size the HEAD reported.
+        async with reserve(head["ContentLength"]) if reserve is not None else nullcontext():
+            try:
+                copy_path = await self._io.run(self._download_object, key)
+            except ClientError as exc:
+                if self._is_not_found(exc):
+                    return None
+                raise
+            try:
+                return StoredPhoto(url=self._public_url(key), variants=await self._store_variants(key, copy_path))
+            finally:
+                self._remove_copy(copy_path)
+
+    async def _existing_photo(self, key: str) -> StoredPhoto | None:
+        """The photo already stored under content ``key``, with whichever variants exist."""
+
+        # Most uploads are new photos: one HEAD for them, the variants only on a hit.
+        if not await self._exists(key):
+            return None
+        variant_keys = {spec.name: variant_key(key, spec) for spec in self._variant_specs}
+        found = await asyncio.gather(*(self._exists(item) for item in variant_keys.values()))
+        return StoredPhoto(
+            url=self._public_url(key),
+            variants={
+                name: self._public_url(item)
+                for (name, item), exists in zip(variant_keys.items(), found)
+                if exists
+            },
         )
 
-        upload_elapsed = perf_counter() - upload_started_at
-        total_elapsed = perf_counter() - total_started_at
+    async def _exists(self, key: str) -> bool:
+        try:
+            await self._io.run(self._client.head_object, Bucket=self._settings.yc_s3_bucket, Key=key)
+        except ClientError as exc:
+            if self._is_not_found(exc):
+                return False
+            raise
+        return True
+
+    @staticmethod
+    def _is_not_found(exc: ClientError) -> bool:
+        return exc.response.get("Error", {}).get("Code") in {"404", "NoSuchKey", "NotFound"}
+
+    async def _store_variants(self, key: str, path: str) -> dict[str, str]:
+        """Render the variants of ``key`` from its copy at ``path`` and upload them.
+
+        A photo Pillow cannot read keeps none.
+        """
 
+        started_at = perf_counter()
+        try:
+            rendered = await self._images.render(path)
+        except Exception:
+            logger.warning("Could not render variants of '%s'", key, exc_info=True)
+            return {}
+
+        specs = [spec for spec in self._variant_specs if spec.name in rendered]
+        await asyncio.gather(
+            *(
+                self._io.run(
+                    self._client.put_object,
+                    Bucket=self._settings.yc_s3_bucket,
+                    Key=variant_key(key, spec),
+                    Body=rendered[spec.name],
+                    ContentType=spec.content_type,
+                    ACL="public-read",
+                )
+                for spec in specs
+            )
+        )
         logger.info(
-            "Uploaded photo '%s' (%d bytes) to key '%s' in %.3fs "
-            "(read %.3fs, s3 %.3fs)",
-            file.filename or key,
-            len(content),
+            "Stored variants of '%s' (%s) in %.3fs",
+            key,
+            ", ".join(f"{spec.name} {len(rendered[spec.name])} bytes" for spec in specs),
+            perf_counter() - started_at,
+        )
+        return {spec.name: self._public_url(variant_key(key, spec)) for spec in specs}
+
+    def _scan_spool(self, file: UploadFile) -> tuple[str, str | None]:
+        """SHA-256 of the upload, read ``SPOOL_READ_SIZE`` at a time.
+
+        With variants on, the same pass also copies the upload to a temporary file for
+        the renderer and returns its path: the transfer closes the spool, and a small
+        spool lives in memory where a pool worker cannot open it. The caller removes it.
+        """
+
+        source = file.file
+        source.seek(0)
+        if self._images is None:
+            return hashlib.file_digest(source, "sha256").hexdigest(), None
+        digest = hashlib.sha256()
+        buffer = bytearray(SPOOL_READ_SIZE)
+        view = memoryview(buffer)
+        with tempfile.NamedTemporaryFile(prefix="photo-", delete=False) as target:
+            try:
+                while read := source.readinto(buffer):
+                    digest.update(view[:read])
+                    target.write(view[:read])
+            except BaseException:
+                os.unlink(target.name)
+                raise
+        return digest.hexdigest(), target.name
+
+    def _download_object(self, key: str) -> str:
+        """Download ``key`` in parts to a temporary file; the caller removes it."""
+
+        with tempfile.NamedTemporaryFile(prefix="photo-", delete=False) as target:
+            try:
+                self._client.download_fileobj(
+                    self._settings.yc_s3_bucket,
+                    key,
+                    target,
+                    Config=self._transfer_config,
+                )
+            except BaseException:
+                os.unlink(target.name)
+                raise
+        return target.name
+
+    @staticmethod
+    def _remove_copy(path: str) -> None:
+        with suppress(FileNotFoundError):
+            os.unlink(path)
+
+    def _public_url(self, key: str) -> str:
+        return f"{self._settings.storage_public_base_url}/{key}"
+
+    def _stream_to_s3(self, file: UploadFile, key: str) -> int:
+        """Stream the spooled upload to S3 (multipart above the threshold); returns its size."""
+
+        source = file.file
+        source.seek(0, 2)
+        size = source.tell()
+        source.seek(0)
+        extra_args = {"ACL": "public-read"}
+        if file.content_type:
+            extra_args["ContentType"] = file.content_type
+        self._client.upload_fileobj(
+            source,
+            self._settings.yc_s3_bucket,
             key,
-            total_elapsed,
-            read_elapsed,
-            upload_elapsed,
+            ExtraArgs=extra_args,
+            Config=self._transfer_config,
         )
+        return size
 
-        return f"https://{self._settings.yc_s3_bucket}.storage.yandexcloud.net/{key}"
+    def io_stats(self) -> Dict[str, int]:
+        return self._io.stats()
 
     async def delete(self, url: str) -> None:
-        bucket_prefix = f"https://{self._settings.yc_s3_bucket}.storage.yandexcloud.net/"
-        if not url.startswith(bucket_prefix):
-            logger.warning("Skip deleting unsupported storage url '%s'", url)
-            return
+        await self.delete_many([url])
 
-        key = url.removeprefix(bucket_prefix)
-        if not key:
+    async def delete_many(self, urls: Sequence[str]) -> None:
+        keys: List[str] = []
+        for url in urls:
+            key = self.key_of(url)
+            if key is None:
+                logger.warning("Skip deleting unsupported storage url '%s'", url)
+                continue
+            keys += [key, *self.variant_keys(key)]
+        if not keys:
             return
 
-        await asyncio.to_thread(
-            self._client.delete_object,
+        started_at = perf_counter()
+        await self.delete_keys(keys)
+        logger.info("Deleted %d object(s) for %d photo(s) in %.3fs", len(keys), len(urls), perf_counter() - started_at)
+
+    async def delete_keys(self, keys: Sequence[str]) -> None:
+        keys = list(dict.fromkeys(keys))
+        await asyncio.gather(
+            *(
+                self._io.run(self._delete_objects, keys[start : start + DELETE_OBJECTS_MAX_KEYS])
+                for start in range(0, len(keys), DELETE_OBJECTS_MAX_KEYS)
+            )
+        )
+
+    async def quarantine_keys(self, keys: Sequence[str], *, prefix: str = QUARANTINE_PREFIX) -> None:
+        """Move ``keys`` under ``prefix`` (server-side copies, then one batched delete)."""
+
+        bucket = self._settings.yc_s3_bucket
+        await asyncio.gather(
+            *(
+                self._io.run(
+                    self._client.copy_object,
+                    Bucket=bucket,
+                    Key=f"{prefix}{key}",
+                    CopySource={"Bucket": bucket, "Key": key},
+                )
+                for key in keys
+            )
+        )
+        await self.delete_keys(keys)
+
+    async def last_modified(self, key: str) -> datetime | None:
+        """When ``key`` was last written; None if it does not exist."""
+
+        try:
+            response = await self._io.run(self._client.head_object, Bucket=self._settings.yc_s3_bucket, Key=key)
+        except ClientError as exc:
+            if self._is_not_found(exc):
+                return None
+            raise
+        return response["LastModified"]
+
+    def iter_objects(self, prefix: str) -> Iterator[List[StoredObject]]:
+        """The bucket listing under ``prefix``, one ListObjectsV2 page (up to 1000 keys) at a time."""
+
+        paginator = self._client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self._settings.yc_s3_bucket, Prefix=prefix):
+            yield [
+                StoredObject(key=item["Key"], size=item["Size"], last_modified=item["LastModified"])
+                for item in page.get("Contents", [])
+            ]
+
+    def key_of(self, url: str) -> str | None:
+        """Object key of a public photo URL of this bucket; None for any other URL."""
+
+        bucket_prefix = f"{self._settings.storage_public_base_url}/"
+        if not url.startswith(bucket_prefix):
+            return None
+        return url.removeprefix(bucket_prefix) or None
+
+    def public_url(self, key: str) -> str:
+        return self._public_url(key)
+
+    def variant_keys(self, key: str) -> List[str]:
+        return [variant_key(key, spec) for spec in self._variant_specs]
+
+    def is_variant_key(self, key: str) -> bool:
+        return any(key.endswith(f".{spec.name}{spec.extension}") for spec in self._variant_specs)
+
+    def _delete_objects(self, keys: List[str]) -> None:
+        response = self._client.delete_objects(
             Bucket=self._settings.yc_s3_bucket,
-            Key=key,
+            Delete={"Objects": [{"Key": key} for key in keys], "Quiet": True},
         )
+        # Quiet mode reports failures only; missing keys count as deleted.
+        for error in response.get("Errors", []):
+            logger.warning("Could not delete '%s': %s %s", error.get("Key"), error.get("Code"), error.get("Message"))
@@ -0,0 +1,45 @@
+"""SQLAlchemy unit of work shared by every repository within one request."""
+from __future__ import annotations
+
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.ports import UnitOfWork
+from app.infrastructure.data_versions import SqlAlchemyDataVersionRepository
+from app.infrastructure.database import AsyncSessionLocal
+from app.infrastructure.reports import SqlAlchemyReportRepository
+from app.infrastructure.sites import SqlAlchemySiteRepository
+from app.infrastructure.users import SqlAlchemyUserRepository
+from app.infrastructure.work_types import SqlAlchemyWorkTypeRepository
+
+
+class SqlAlchemyUnitOfWork(UnitOfWork):
+    """Owns the request session; repositories only flush, and ``commit`` ends the transaction.
+
+    Each repository keeps a per-instance identity map, so repeated lookups of the
+    same site, user or work type within the request are served without a query.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+        self.reports = SqlAlchemyReportRepository(session)
+        self.sites = SqlAlchemySiteRepository(session)
+        self.users = SqlAlchemyUserRepository(session)
+        self.work_types = SqlAlchemyWorkTypeRepository(session)
+        self.versions = SqlAlchemyDataVersionRepository(session)
+
+    async def commit(self) -> None:
+        await self._session.commit()
+
+    async def rollback(self) -> None:
+        await self._session.rollback()
+
+
+@asynccontextmanager
+async def open_unit_of_work() -> AsyncIterator[UnitOfWork]:
+    """A unit of work with its own session, for background tasks; whatever is not committed rolls back."""
+
+    async with AsyncSessionLocal() as session:
+        yield SqlAlchemyUnitOfWork(session)
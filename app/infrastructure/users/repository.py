@@ -4,29 +4,34 @@ from __future__ import annotations
 from typing import Optional
 
 from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.domain.entities.user import User
+from app.domain.ports import USERS_SCOPE
+from app.infrastructure.data_versions import bump_data_version
 from app.infrastructure.users.models import UserModel
 
 
 class SqlAlchemyUserRepository:
-    def __init__(self, db: Session) -> None:
+    def __init__(self, db: AsyncSession) -> None:
         self._db = db
+        self._by_id: dict[str, Optional[User]] = {}
 
-    def get_by_id(self, user_id: str) -> Optional[User]:
-        row = self._db.query(UserModel).filter(UserModel.id == user_id).first()
-        if row is None:
-            return None
-        return self._to_entity(row)
+    async def get_by_id(self, user_id: str) -> Optional[User]:
+        if user_id in self._by_id:
+            return self._by_id[user_id]
+        row = await self._db.get(UserModel, user_id)
+        user = self._to_entity(row) if row is not None else None
+        self._by_id[user_id] = user
+        return user
 
-    def get_by_phone(self, phone: str) -> Optional[User]:
-        row = self._db.query(UserModel).filter(UserModel.phone == phone).first()
+    async def get_by_phone(self, phone: str) -> Optional[User]:
+        row = (await self._db.execute(select(UserModel).where(UserModel.phone == phone))).scalars().first()
         if row is None:
             return None
         return self._to_entity(row)
 
-    def add(self, user: User) -> User:
+    async def add(self, user: User) -> User:
         row = UserModel(
             id=user.id,
             name=user.name,
@@ -37,12 +42,13 @@ class SqlAlchemyUserRepository:
             is_active=user.is_active,
         )
         self._db.add(row)
-        self._db.commit()
-        self._db.refresh(row)
-        return self._to_entity(row)
+        await self._db.flush()
+        await bump_data_version(self._db, USERS_SCOPE)
+        await self._db.refresh(row)
+        return self._remember(row)
 
-    def update(self, user: User) -> User | None:
-        row = self._db.query(UserModel).filter(UserModel.id == user.id).first()
+    async def update(self, user: User) -> User | None:
+        row = await self._db.get(UserModel, user.id)
         if row is None:
             return None
 
@@ -52,42 +58,50 @@ class SqlAlchemyUserRepository:
         row.hashed_password = user.hashed_password
         row.role = user.role
         row.is_active = user.is_active
-        self._db.commit()
-        self._db.refresh(row)
-        return self._to_entity(row)
+        await self._db.flush()
+        await bump_data_version(self._db, USERS_SCOPE)
+        await self._db.refresh(row)
+        return self._remember(row)
 
-    def delete(self, user_id: str) -> bool:
-        row = self._db.query(UserModel).filter(UserModel.id == user_id).first()
+    async def delete(self, user_id: str) -> bool:
+        row = await self._db.get(UserModel, user_id)
         if row is None:
             return False
-        self._db.delete(row)
-        self._db.commit()
+        await self._db.delete(row)
+        await self._db.flush()
+        await bump_data_version(self._db, USERS_SCOPE)
+        self._by_id[user_id] = None
         return True
 
-    def list_contractors(self) -> list[User]:
-        rows = self._db.execute(
+    async def list_contractors(self) -> list[User]:
+        rows = (await self._db.execute(
             select(UserModel)
             .where(UserModel.role == "contractor", UserModel.is_active.is_(True))
             .order_by(UserModel.name.asc())
-        ).scalars().all()
+        )).scalars().all()
         return [self._to_entity(row) for row in rows]
 
-    def list_all_by_role(self, role: str) -> list[User]:
-        rows = self._db.execute(
+    async def list_all_by_role(self, role: str) -> list[User]:
+        rows = (await self._db.execute(
             select(UserModel)
             .where(UserModel.role == role)
             .order_by(UserModel.name.asc())
-        ).scalars().all()
+        )).scalars().all()
         return [self._to_entity(row) for row in rows]
 
-    def list_by_role(self, role: str) -> list[User]:
-        rows = self._db.execute(
+    async def list_by_role(self, role: str) -> list[User]:
+        rows = (await self._db.execute(
             select(UserModel)
             .where(UserModel.role == role, UserModel.is_active.is_(True))
             .order_by(UserModel.name.asc())
-        ).scalars().all()
+        )).scalars().all()
         return [self._to_entity(row) for row in rows]
 
+    def _remember(self, row: UserModel) -> User:
+        user = self._to_entity(row)
+        self._by_id[user.id] = user
+        return user
+
     @staticmethod
     def _to_entity(row: UserModel) -> User:
         return User(
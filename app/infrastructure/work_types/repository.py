@@ -4,10 +4,11 @@ from __future__ import annotations
 from typing import Iterable
 
 from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.domain.entities import WorkType
-from app.domain.ports import WorkTypeRepository
+from app.domain.ports import WORK_TYPES_SCOPE, WorkTypeRepository
+from app.infrastructure.data_versions import bump_data_version
 from app.infrastructure.work_types.models import WorkTypeModel
 
 
@@ -159,26 +160,24 @@ DEFAULT_WORK_TYPES: list[dict[str, object]] = [
 
 
 class SqlAlchemyWorkTypeRepository(WorkTypeRepository):
-    def __init__(self, session: Session) -> None:
+    def __init__(self, session: AsyncSession) -> None:
         self._session = session
+        self._by_id: dict[str, WorkType | None] = {}
 
     async def list(self) -> Iterable[WorkType]:
-        work_types = self._session.execute(
+        work_types = (await self._session.execute(
             select(WorkTypeModel).order_by(WorkTypeModel.sort_order.asc(), WorkTypeModel.name.asc())
-        ).scalars().all()
-        if not work_types:
-            self._bootstrap_defaults()
-            work_types = self._session.execute(
-                select(WorkTypeModel).order_by(WorkTypeModel.sort_order.asc(), WorkTypeModel.name.asc())
-            ).scalars().all()
-
-        return [self._to_entity(model) for model in work_types]
+        )).scalars().all()
+        return [self._remember(model) for model in work_types]
 
     async def get_by_id(self, work_type_id: str) -> WorkType | None:
-        model = self._session.get(WorkTypeModel, work_type_id)
+        if work_type_id in self._by_id:
+            return self._by_id[work_type_id]
+        model = await self._session.get(WorkTypeModel, work_type_id)
         if model is None:
+            self._by_id[work_type_id] = None
             return None
-        return self._to_entity(model)
+        return self._remember(model)
 
     async def create(self, work_type: WorkType) -> WorkType:
         model = WorkTypeModel(
@@ -193,12 +192,13 @@ class SqlAlchemyWorkTypeRepository(WorkTypeRepository):
             requires_machines=work_type.requires_machines,
         )
         self._session.add(model)
-        self._session.commit()
-        self._session.refresh(model)
-        return self._to_entity(model)
+        await self._session.flush()
+        await bump_data_version(self._session, WORK_TYPES_SCOPE)
+        await self._session.refresh(model)
+        return self._remember(model)
 
     async def update(self, work_type: WorkType) -> WorkType | None:
-        model = self._session.get(WorkTypeModel, work_type.id)
+        model = await self._session.get(WorkTypeModel, work_type.id)
         if model is None:
             return None
 
@@ -210,37 +210,49 @@ class SqlAlchemyWorkTypeRepository(WorkTypeRepository):
         model.requires_volume = work_type.requires_volume
         model.requires_people = work_type.requires_people
         model.requires_machines = work_type.requires_machines
-        self._session.commit()
-        self._session.refresh(model)
-        return self._to_entity(model)
+        await self._session.flush()
+        await bump_data_version(self._session, WORK_TYPES_SCOPE)
+        await self._session.refresh(model)
+        return self._remember(model)
 
     async def delete(self, work_type_id: str) -> bool:
-        model = self._session.get(WorkTypeModel, work_type_id)
+        model = await self._session.get(WorkTypeModel, work_type_id)
         if model is None:
             return False
 
-        self._session.delete(model)
-        self._session.commit()
+        await self._session.delete(model)
+        await self._session.flush()
+        await bump_data_version(self._session, WORK_TYPES_SCOPE)
+        self._by_id[work_type_id] = None
         return True
 
-    def _bootstrap_defaults(self) -> None:
-        existing = {item.id for item in self._session.execute(select(WorkTypeModel)).scalars().all()}
+    async def bootstrap_defaults(self) -> int:
+        """Insert ``DEFAULT_WORK_TYPES`` into an empty table; returns how many were added."""
+
+        if (await self._session.execute(select(WorkTypeModel.id).limit(1))).first() is not None:
+            return 0
         for item in DEFAULT_WORK_TYPES:
-            if item["id"] not in existing:
-                self._session.merge(
-                    WorkTypeModel(
-                        id=str(item["id"]),
-                        name=str(item["name"]),
-                        parent_id=item["parent_id"],
-                        sort_order=int(item["sort_order"]),
-                        unit=item["unit"],
-                        is_active=bool(item["is_active"]),
-                        requires_volume=bool(item["requires_volume"]),
-                        requires_people=bool(item["requires_people"]),
-                        requires_machines=bool(item["requires_machines"]),
-                    )
+            self._session.add(
+                WorkTypeModel(
+                    id=str(item["id"]),
+                    name=str(item["name"]),
+                    parent_id=item["parent_id"],
+                    sort_order=int(item["sort_order"]),
+                    unit=item["unit"],
+                    is_active=bool(item["is_active"]),
+                    requires_volume=bool(item["requires_volume"]),
+                    requires_people=bool(item["requires_people"]),
+                    requires_machines=bool(item["requires_machines"]),
                 )
-        self._session.commit()
+            )
+        await self._session.flush()
+        await bump_data_version(self._session, WORK_TYPES_SCOPE)
+        return len(DEFAULT_WORK_TYPES)
+
+    def _remember(self, model: WorkTypeModel) -> WorkType:
+        work_type = self._to_entity(model)
+        self._by_id[work_type.id] = work_type
+        return work_type
 
     @staticmethod
     def _to_entity(model: WorkTypeModel) -> WorkType:
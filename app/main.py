@@ -2,34 +2,109 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.api.routers import auth, reports, root, sites, work_types
+from app.api.compression import CompressionMiddleware
+from app.api.conditional import ETAG_HEADER
+from app.api.deps import get_upload_budget, get_work_type_catalogue
+from app.api.pagination import NEXT_CURSOR_HEADER
+from app.api.routers import auth, files, reports, root, sites, work_types
+from app.api.upload_admission import UploadAdmissionMiddleware
+from app.application.photo_deletion_queue import PhotoDeletionQueue
 from app.config import get_settings
 from app.core.logging import setup_logging
+from app.infrastructure.data_versions import SqlAlchemyDataVersionRepository
+from app.infrastructure.database import AsyncSessionLocal, async_engine
+from app.infrastructure.storage import LocalFileStorage, YandexStorage
+from app.infrastructure.unit_of_work import open_unit_of_work
+from app.infrastructure.work_types import SqlAlchemyWorkTypeRepository
+
+logger = logging.getLogger(__name__)
+
+
+async def warm_up_work_types() -> None:
+    """Seed default work types into an empty table and load the catalogue."""
+
+    async with AsyncSessionLocal() as session:
+        repository = SqlAlchemyWorkTypeRepository(session)
+        if await repository.bootstrap_defaults():
+            await session.commit()
+        snapshot = await get_work_type_catalogue().load(repository, SqlAlchemyDataVersionRepository(session))
+    logger.info("Work type catalogue v%d loaded with %d item(s)", snapshot.version, len(snapshot.items))
+
+
+def create_storage() -> LocalFileStorage | YandexStorage | None:
+    settings = get_settings()
+    if settings.storage_backend == "local":
+        logger.info("Photos are stored on disk under %s", settings.local_storage_dir)
+        return LocalFileStorage(settings)
+    try:
+        return YandexStorage(settings)
+    except ValueError as exc:
+        logger.warning("Photo storage disabled: %s", exc)
+        return None
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    app.state.storage = create_storage()
+    app.state.photo_deletion_queue = None
+    if app.state.storage is not None and get_settings().storage_delete_in_background:
+        app.state.photo_deletion_queue = PhotoDeletionQueue(app.state.storage, open_unit_of_work)
+        app.state.photo_deletion_queue.start()
+    try:
+        await warm_up_work_types()
+    except Exception:
+        # The catalogue also loads lazily on first use; do not block startup on the database.
+        logger.exception("Work type catalogue warm-up failed")
+    yield
+    if app.state.photo_deletion_queue is not None:
+        await app.state.photo_deletion_queue.close()
+    if app.state.storage is not None:
+        app.state.storage.close()
+    await async_engine.dispose()
 
 
 def create_app() -> FastAPI:
     settings = get_settings()
     setup_logging()
-    app = FastAPI(title=settings.app_title)
+    app = FastAPI(title=settings.app_title, lifespan=lifespan)
     print("DEBUG DATABASE_URL =", settings.database_url, flush=True)
-    logging.getLogger(__name__).info("CORS allow_origins: %s", settings.cors_allow_origins)
+    logger.info("CORS allow_origins: %s", settings.cors_allow_origins)
+    # Added first, so it runs inside CORS and browsers can read its 413/503 answers.
+    app.add_middleware(
+        UploadAdmissionMiddleware,
+        budget=get_upload_budget(),
+        limits={"/reports/batch": settings.reports_batch_max_bytes},
+    )
     app.add_middleware(
         CORSMiddleware,
         allow_origins=settings.cors_allow_origins,
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[NEXT_CURSOR_HEADER, ETAG_HEADER],
     )
+    if settings.compression_enabled:
+        app.add_middleware(
+            CompressionMiddleware,
+            minimum_size=settings.compression_minimum_size,
+            gzip_level=settings.compression_gzip_level,
+            brotli_quality=settings.compression_brotli_quality,
+            offload_size=settings.compression_offload_size,
+        )
 
     app.include_router(root.router)
     app.include_router(auth.router)
     app.include_router(sites.router)
     app.include_router(work_types.router)
     app.include_router(reports.router)
+    if settings.storage_backend == "local":
+        app.include_router(files.router)
 
     return app
 
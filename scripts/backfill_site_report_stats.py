@@ -0,0 +1,24 @@
+"""Rebuild the per-site report summary table from the reports table.
+
+The API keeps ``site_report_stats`` up to date on every report write; run this
+after editing reports directly in the database:
+    python -m scripts.backfill_site_report_stats
+"""
+from __future__ import annotations
+
+import sys
+
+sys.path.insert(0, ".")
+
+from app.infrastructure.database import engine
+from app.infrastructure.sites.stats import rebuild_site_report_stats
+
+
+def backfill() -> None:
+    with engine.begin() as connection:
+        rebuilt = rebuild_site_report_stats(connection)
+    print(f"Done. {rebuilt} site summary row(s) rebuilt.")
+
+
+if __name__ == "__main__":
+    backfill()
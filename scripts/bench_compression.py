@@ -0,0 +1,77 @@
+"""Bytes on the wire and CPU cost of compressing report listings.
+
+Renders synthetic ``GET /sites/{id}/reports`` and ``GET /reports`` pages (see
+``scripts.bench_json_render``) and compresses each with the encoders
+``app.api.compression`` can use. For every setting it prints the compressed
+size, the ratio, the CPU time per page and the time to send the page over a
+``--link-mbps`` link:
+    python -m scripts.bench_compression
+    python -m scripts.bench_compression --rows 100 --link-mbps 2 --rounds 50
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, ".")
+
+from app.api import compression
+from app.api.compression import compress_body
+from app.api.rendering import dumps, history_row, report_row
+from scripts.bench_json_render import make_history, make_reports
+
+SETTINGS = [
+    ("gzip", 1),
+    ("gzip", 6),
+    ("gzip", 9),
+    ("br", 1),
+    ("br", 4),
+    ("br", 6),
+    ("br", 11),
+]
+
+
+def measure(body: bytes, encoding: str, level: int, rounds: int) -> tuple[int, float]:
+    compressed = compress_body(body, encoding, gzip_level=level, brotli_quality=level)
+    started = time.process_time()
+    for _ in range(rounds):
+        compress_body(body, encoding, gzip_level=level, brotli_quality=level)
+    return len(compressed), (time.process_time() - started) / rounds
+
+
+def bench(title: str, body: bytes, args) -> None:
+    bytes_per_ms = args.link_mbps * 1_000_000 / 8 / 1000
+    print(f"{title}: {len(body)} bytes uncompressed, {len(body) / bytes_per_ms:.0f} ms at {args.link_mbps} Mbit/s")
+    print(f"  {'encoding':<10} {'bytes':>9} {'ratio':>6} {'cpu ms':>8} {'MB/s':>7} {'send ms':>8}")
+    for encoding, level in SETTINGS:
+        if encoding == "br" and compression.brotli is None:
+            continue
+        # Level 11 is far slower; fewer rounds keep the run short.
+        rounds = max(1, args.rounds // 10) if level == 11 else args.rounds
+        size, seconds = measure(body, encoding, level, rounds)
+        print(
+            f"  {encoding + ' ' + str(level):<10} {size:>9} {len(body) / size:>6.1f} "
+            f"{seconds * 1000:>8.2f} {len(body) / seconds / 1e6:>7.0f} {size / bytes_per_ms:>8.0f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=500, help="rows per page")
+    parser.add_argument("--work-items", type=int, default=3)
+    parser.add_argument("--photos", type=int, default=4)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--link-mbps", type=float, default=5.0, help="link speed for the send-time column")
+    args = parser.parse_args()
+
+    if compression.brotli is None:
+        print("Brotli is not installed: only gzip is measured")
+    reports = make_reports(SimpleNamespace(rows=args.rows, work_items=args.work_items, photos=args.photos))
+    bench("GET /sites/{id}/reports", dumps([history_row(item) for item in make_history(reports)]), args)
+    bench("GET /reports", dumps([report_row(report) for report in reports]), args)
+
+
+if __name__ == "__main__":
+    main()
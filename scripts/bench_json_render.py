@@ -0,0 +1,223 @@
+"""Microbenchmark of rendering report listings to JSON.
+
+Compares, on synthetic pages shaped like ``GET /reports`` and ``GET /sites/{id}/reports``:
+  * pydantic     the previous path: ``*Read.from_entity`` per row (``asdict`` for
+                 reports), FastAPI's ``response_model`` validation and serialization,
+                 then ``JSONResponse`` encoding;
+  * pre-encoded  ``app.api.rendering``: dict rows encoded once (orjson if installed);
+  * stdlib json  the same rows encoded with ``json``, i.e. without orjson.
+Before timing it checks that every path produces the same JSON document.
+
+    python -m scripts.bench_json_render
+    python -m scripts.bench_json_render --rows 500 --work-items 5 --photos 6 --rounds 100
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+from dataclasses import asdict
+from datetime import date, datetime, timedelta, timezone
+from typing import Callable, List
+
+sys.path.insert(0, ".")
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.api import rendering
+from app.api.rendering import dumps, history_row, report_row
+from app.api.schemas import ReportRead, SiteReportHistoryItemRead
+from app.domain.entities import Report, ReportHistoryItem, ReportWorkItem
+
+PHOTO_BASE = "https://ptobot-assets.storage.yandexcloud.net/reports/5b0c6a1e-tyumenskaya-ul/2026/04/01"
+WORDS = (
+    "укладка устройство засыпка планировка разработка грунта щебня песка асфальтобетона бортового камня "
+    "на участке по оси в районе съезда примыкания ПК10 ПК12 ПК14 слева справа нижнего верхнего слоя "
+    "выполнено частично завершено замечаний нет погодные условия простой техники"
+).split()
+# Seeded, so every run (and both benchmarks) sees the same pages; ids and hashes are random like real ones.
+rng = random.Random(42)
+
+
+def text(words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize()
+
+
+def random_hex() -> str:
+    return f"{rng.getrandbits(128):032x}"
+
+
+def work_items(index: int, count: int) -> List[ReportWorkItem]:
+    return [
+        ReportWorkItem(
+            id=f"{index}-{item}",
+            work_type_id="roadway",
+            work_type_name="Устройство дорожной одежды",
+            description=text(rng.randint(4, 14)),
+            people=f"{rng.randint(2, 20)} чел.",
+            volume=f"{rng.randint(10, 900)} м²",
+            machines="Асфальтоукладчик, каток",
+            sort_order=item,
+        )
+        for item in range(count)
+    ]
+
+
+def photos(index: int, count: int) -> tuple[List[str], dict]:
+    urls = [f"{PHOTO_BASE}/{random_hex()}{random_hex()}.jpg" for _ in range(count)]
+    # Every other photo has its variants, as after a partial backfill.
+    variants = {
+        url: {"thumb": url.replace(".jpg", ".thumb.jpg"), "medium": url.replace(".jpg", ".medium.webp")}
+        for url in urls[::2]
+    }
+    return urls, variants
+
+
+def make_reports(args) -> List[Report]:
+    now = datetime.now(timezone.utc)
+    reports = []
+    for index in range(args.rows):
+        urls, variants = photos(index, args.photos)
+        reports.append(
+            Report(
+                id=random_hex(),
+                user_id="c1",
+                site_id="5b0c6a1e",
+                work_type_id="roadway",
+                report_date=date(2026, 4, 1) - timedelta(days=index % 90),
+                description=text(rng.randint(0, 20)),
+                people=str(rng.randint(2, 30)),
+                volume=f"{rng.randint(10, 900)} м²",
+                machines="Каток",
+                created_at=now - timedelta(minutes=index, microseconds=rng.randint(0, 999_999)),
+                photo_urls=urls,
+                photo_variants=variants,
+                work_items=work_items(index, args.work_items),
+            )
+        )
+    return reports
+
+
+def make_history(reports: List[Report]) -> List[ReportHistoryItem]:
+    return [
+        ReportHistoryItem(
+            id=report.id,
+            site_id=report.site_id,
+            work_type_id=report.work_type_id,
+            work_type_name="Устройство дорожной одежды",
+            report_date=report.report_date,
+            created_at=report.created_at,
+            description=report.description,
+            people=report.people,
+            volume=report.volume,
+            machines=report.machines,
+            photo_urls=report.photo_urls,
+            photo_variants=report.photo_variants,
+            author_id=report.user_id,
+            author_name="ООО «СтройДорМонтаж», Иванов Иван Иванович",
+            work_items=report.work_items,
+        )
+        for report in reports
+    ]
+
+
+def pydantic_path(schema, from_entity: Callable) -> Callable[[list], bytes]:
+    field = create_model_field(name="Response_bench", type_=List[schema], mode="serialization")
+
+    async def render(items: list) -> bytes:
+        content = await serialize_response(field=field, response_content=[from_entity(item) for item in items])
+        return JSONResponse(content).body
+
+    return render
+
+
+def pre_encoded_path(row: Callable) -> Callable[[list], bytes]:
+    async def render(items: list) -> bytes:
+        return dumps([row(item) for item in items])
+
+    return render
+
+
+def stdlib_path(row: Callable) -> Callable[[list], bytes]:
+    async def render(items: list) -> bytes:
+        encoder, rendering.orjson = rendering.orjson, None
+        try:
+            return dumps([row(item) for item in items])
+        finally:
+            rendering.orjson = encoder
+
+    return render
+
+
+def run_sync(coroutine):
+    # serialize_response only awaits when validation runs in a thread (sync endpoints).
+    try:
+        coroutine.send(None)
+    except StopIteration as stop:
+        return stop.value
+    raise RuntimeError("unexpected suspension")
+
+
+def measure(title: str, render, items: list, rounds: int, baseline: float | None) -> float:
+    run_sync(render(items))
+    started = time.perf_counter()
+    size = 0
+    for _ in range(rounds):
+        size = len(run_sync(render(items)))
+    per_page = (time.perf_counter() - started) / rounds
+    speedup = f"  x{baseline / per_page:.1f}" if baseline else ""
+    print(f"  {title:<12} {per_page * 1000:8.2f} ms/page  {len(items) / per_page:>9.0f} rows/s  {size:>8} bytes{speedup}")
+    return per_page
+
+
+def bench(title: str, items: list, paths: dict, rounds: int) -> None:
+    outputs = {name: json.loads(run_sync(render(items))) for name, render in paths.items()}
+    reference = outputs["pydantic"]
+    for name, output in outputs.items():
+        assert output == reference, f"{title}: {name} differs from the pydantic output"
+    print(f"{title}: {len(items)} rows, outputs identical")
+    baseline = None
+    for name, render in paths.items():
+        per_page = measure(name, render, items, rounds, baseline)
+        baseline = baseline or per_page
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=500, help="rows per page")
+    parser.add_argument("--work-items", type=int, default=3, help="work items per report")
+    parser.add_argument("--photos", type=int, default=4, help="photos per report")
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+
+    if rendering.orjson is None:
+        print("orjson is not installed: pre-encoded falls back to the stdlib encoder")
+    reports = make_reports(args)
+    bench(
+        "GET /reports",
+        reports,
+        {
+            "pydantic": pydantic_path(ReportRead, lambda report: ReportRead(**asdict(report))),
+            "pre-encoded": pre_encoded_path(report_row),
+            "stdlib json": stdlib_path(report_row),
+        },
+        args.rounds,
+    )
+    bench(
+        "GET /sites/{id}/reports",
+        make_history(reports),
+        {
+            "pydantic": pydantic_path(SiteReportHistoryItemRead, SiteReportHistoryItemRead.from_entity),
+            "pre-encoded": pre_encoded_path(history_row),
+            "stdlib json": stdlib_path(history_row),
+        },
+        args.rounds,
+    )
+
+
+if __name__ == "__main__":
+    main()
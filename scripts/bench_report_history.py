@@ -0,0 +1,119 @@
+"""Microbenchmark of the site report history read path.
+
+Compares the previous ORM path (hydrate ``ReportModel`` + ``selectinload`` of work
+items, then copy into ``ReportHistoryItem``) with the column projection used by
+``SqlAlchemyReportRepository.list_history_by_site`` and prints rows/sec for both:
+    python -m scripts.bench_report_history
+    python -m scripts.bench_report_history --site bench-site --limit 500 --rounds 50
+
+Seed data first with ``python -m scripts.bench_report_indexes --seed N`` if needed.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import time
+
+sys.path.insert(0, ".")
+
+from sqlalchemy import func, select
+
+from app.api.schemas import SiteReportHistoryItemRead
+from app.domain.entities import ReportHistoryItem
+from app.infrastructure.database import AsyncSessionLocal, async_engine
+from app.infrastructure.reports.models import ReportModel
+from app.infrastructure.reports.repository import WITH_WORK_ITEMS, SqlAlchemyReportRepository
+from app.infrastructure.users.models import UserModel
+from app.infrastructure.work_types.models import WorkTypeModel
+
+
+async def orm_history(session, site_id: str, limit: int) -> list[ReportHistoryItem]:
+    stmt = (
+        select(ReportModel, WorkTypeModel.name, UserModel.name)
+        .join(WorkTypeModel, WorkTypeModel.id == ReportModel.work_type_id)
+        .join(UserModel, UserModel.id == ReportModel.user_id)
+        .where(ReportModel.site_id == site_id)
+        .options(WITH_WORK_ITEMS)
+        .order_by(ReportModel.report_date.desc(), ReportModel.created_at.desc(), ReportModel.id.desc())
+        .limit(limit)
+    )
+    items = []
+    for model, work_type_name, author_name in (await session.execute(stmt)).all():
+        items.append(
+            ReportHistoryItem(
+                id=model.id,
+                site_id=model.site_id or "",
+                work_type_id=model.work_type_id,
+                work_type_name=work_type_name,
+                report_date=model.report_date,
+                created_at=model.created_at,
+                description=model.description,
+                people=model.people,
+                volume=model.volume,
+                machines=model.machines,
+                photo_urls=list(model.photo_urls or []),
+                author_id=model.user_id,
+                author_name=author_name,
+                work_items=SqlAlchemyReportRepository._to_work_items(model, fallback_name=work_type_name),
+            )
+        )
+    return items
+
+
+async def projection_history(session, site_id: str, limit: int) -> list[ReportHistoryItem]:
+    return list(await SqlAlchemyReportRepository(session).list_history_by_site(site_id=site_id, limit=limit))
+
+
+async def measure(title: str, fetch, site_id: str, limit: int, rounds: int) -> None:
+    rows = 0
+    fetch_seconds = serialize_seconds = 0.0
+    for _ in range(rounds):
+        # A fresh session per round, like a request; otherwise the ORM path would reuse its identity map.
+        async with AsyncSessionLocal() as session:
+            started = time.perf_counter()
+            items = await fetch(session, site_id, limit)
+            fetched = time.perf_counter()
+            [SiteReportHistoryItemRead.from_entity(item) for item in items]
+            fetch_seconds += fetched - started
+            serialize_seconds += time.perf_counter() - fetched
+            rows += len(items)
+    total = fetch_seconds + serialize_seconds
+    print(
+        f"{title:<11} {rows:>7} rows  fetch {rows / fetch_seconds:>9.0f} rows/s  "
+        f"end-to-end {rows / total:>9.0f} rows/s"
+    )
+
+
+async def run(args) -> None:
+    site_id = args.site
+    if site_id is None:
+        async with AsyncSessionLocal() as session:
+            site_id = (
+                await session.execute(
+                    select(ReportModel.site_id)
+                    .where(ReportModel.site_id.is_not(None))
+                    .group_by(ReportModel.site_id)
+                    .order_by(func.count().desc())
+                    .limit(1)
+                )
+            ).scalar_one()
+    print(f"site {site_id}, limit {args.limit}, {args.rounds} round(s)")
+
+    # Warm up connections and statement caches before timing.
+    await measure("warm-up", projection_history, site_id, args.limit, 2)
+    await measure("orm", orm_history, site_id, args.limit, args.rounds)
+    await measure("projection", projection_history, site_id, args.limit, args.rounds)
+    await async_engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--site", default=None, help="site id; defaults to the site with the most reports")
+    parser.add_argument("--limit", type=int, default=500)
+    parser.add_argument("--rounds", type=int, default=20)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""Show query plans of the report listing/history queries.
+
+The queries are the ones ``SqlAlchemyReportRepository`` actually sends: each
+listing is run through the repository, every statement it issues (the report
+page, the selectin query for its work items, the history projection with its
+work items aggregate) is captured with its parameters and EXPLAIN ANALYZEd.
+
+    python -m scripts.bench_report_indexes
+    python -m scripts.bench_report_indexes --seed 50000   # dev databases only
+    python -m scripts.bench_report_indexes --drop-indexes # the same, without the indexes
+
+Without the composite indexes history and listings read through a Sort over a
+bitmap/seq scan; with them Postgres walks an Index Scan (Backward) and stops at LIMIT.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from typing import Awaitable, Callable, List
+
+sys.path.insert(0, ".")
+
+from sqlalchemy import event, func, insert, select, text
+
+from app.infrastructure.database import AsyncSessionLocal, SessionLocal, async_engine
+from app.infrastructure.reports.models import ReportModel, ReportWorkItemModel
+from app.infrastructure.reports.repository import SqlAlchemyReportRepository
+from app.infrastructure.sites.models import SiteModel
+from app.infrastructure.users.models import UserModel
+from app.infrastructure.work_types.models import WorkTypeModel
+
+BENCH_SITE_ID = "bench-site"
+# Created by migration 0008; --drop-indexes plans without them.
+LISTING_INDEXES = [
+    "ix_reports_site_id_report_date_created_at",
+    "ix_reports_user_id_created_at",
+    "ix_reports_created_at_id",
+    "ix_report_work_items_work_type_id_report_id",
+]
+
+
+def seed(db, count: int) -> None:
+    user_id = db.execute(select(UserModel.id).limit(1)).scalar_one()
+    work_type_ids = list(db.execute(select(WorkTypeModel.id)).scalars())
+    if db.get(SiteModel, BENCH_SITE_ID) is None:
+        db.add(SiteModel(id=BENCH_SITE_ID, name="Benchmark site", address="-"))
+        db.flush()
+
+    started = datetime.now(timezone.utc)
+    for offset in range(0, count, 5000):
+        reports, items = [], []
+        for index in range(offset, min(offset + 5000, count)):
+            report_id = uuid.uuid4().hex
+            work_type_id = work_type_ids[index % len(work_type_ids)]
+            reports.append(
+                {
+                    "id": report_id,
+                    "user_id": user_id,
+                    "site_id": BENCH_SITE_ID if index % 10 == 0 else None,
+                    "work_type_id": work_type_id,
+                    "report_date": date.today() - timedelta(days=index % 720),
+                    "created_at": started - timedelta(minutes=index),
+                    "photo_urls": [],
+                }
+            )
+            items.append({"id": f"{report_id}-0", "report_id": report_id, "work_type_id": work_type_id, "sort_order": 0})
+        db.execute(insert(ReportModel), reports)
+        db.execute(insert(ReportWorkItemModel), items)
+    db.commit()
+    db.execute(text("ANALYZE reports"))
+    db.execute(text("ANALYZE report_work_items"))
+    # The statistics only persist once the transaction ANALYZE ran in commits.
+    db.commit()
+    print(f"Seeded {count} report(s), every 10th on site '{BENCH_SITE_ID}'.")
+
+
+async def explain(
+    call: Callable[[SqlAlchemyReportRepository], Awaitable[object]],
+    title: str,
+    *,
+    drop_indexes: bool,
+) -> None:
+    """EXPLAIN ANALYZE every statement ``call`` sends through the repository, with its bound parameters."""
+
+    statements: List[tuple[str, object]] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany) -> None:
+        statements.append((statement, parameters))
+
+    async with AsyncSessionLocal() as session:
+        connection = await session.connection()
+        if drop_indexes:
+            # DDL is transactional in Postgres: the indexes come back on rollback.
+            for name in LISTING_INDEXES:
+                await connection.exec_driver_sql(f"DROP INDEX IF EXISTS {name}")
+        event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+        try:
+            await call(SqlAlchemyReportRepository(session))
+        finally:
+            event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+        print(f"\n=== {title}: {len(statements)} statement(s)")
+        for statement, parameters in statements:
+            result = await connection.exec_driver_sql(f"EXPLAIN (ANALYZE, BUFFERS) {statement}", parameters)
+            print(f"--- {' '.join(statement.split())[:160]}")
+            print("\n".join(result.scalars().all()))
+        await session.rollback()
+
+
+async def explain_all(args) -> None:
+    async with AsyncSessionLocal() as session:
+        site_id, user_id = (
+            await session.execute(
+                select(ReportModel.site_id, ReportModel.user_id)
+                .where(ReportModel.site_id.is_not(None))
+                .group_by(ReportModel.site_id, ReportModel.user_id)
+                .order_by(func.count().desc())
+                .limit(1)
+            )
+        ).one()
+        work_type_id = (await session.execute(select(ReportModel.work_type_id).limit(1))).scalar_one()
+
+    # The services ask for one row more than a page to learn whether there is a next one.
+    limit = args.limit + 1
+    runs = [
+        (f"history for site {site_id}", lambda repo: repo.list_history_by_site(site_id=site_id, limit=limit)),
+        (f"reports of user {user_id}", lambda repo: repo.list(user_id=user_id, limit=limit)),
+        ("all reports (admin)", lambda repo: repo.list(limit=limit)),
+        (f"reports with work type {work_type_id}", lambda repo: repo.list(work_type_id=work_type_id, limit=limit)),
+    ]
+    try:
+        for title, call in runs:
+            await explain(call, title, drop_indexes=args.drop_indexes)
+    finally:
+        await async_engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", type=int, default=0, help="insert N synthetic reports first")
+    parser.add_argument("--limit", type=int, default=100, help="page size, as the limit query parameter")
+    parser.add_argument(
+        "--drop-indexes",
+        action="store_true",
+        help="plan without the listing indexes (dropped in a transaction that is rolled back; dev databases only)",
+    )
+    args = parser.parse_args()
+
+    if args.seed:
+        db = SessionLocal()
+        try:
+            seed(db, args.seed)
+        finally:
+            db.close()
+    asyncio.run(explain_all(args))
+
+
+if __name__ == "__main__":
+    main()
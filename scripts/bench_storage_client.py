@@ -0,0 +1,110 @@
+"""Compare create-report storage latency with a per-request vs a shared S3 client.
+
+Before the change ``get_storage`` built a ``YandexStorage`` (and a boto3 client)
+for every request; now one instance is created in the app lifespan. This script
+replays the storage part of ``POST /reports`` both ways:
+    python -m scripts.bench_storage_client                       # needs YC_S3_* credentials
+    python -m scripts.bench_storage_client --requests 50 --photos 3 --size 200000
+    python -m scripts.bench_storage_client --construct-only      # offline: client construction only
+
+Uploaded benchmark objects are deleted afterwards.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import io
+import os
+import statistics
+import sys
+from datetime import date
+from time import perf_counter
+
+sys.path.insert(0, ".")
+
+from starlette.datastructures import Headers, UploadFile
+
+from app.config import get_settings
+from app.infrastructure.storage import YandexStorage
+
+BENCH_SITE_ID = "bench-site"
+
+
+def photo(size: int, index: int) -> UploadFile:
+    return UploadFile(
+        file=io.BytesIO(os.urandom(size)),
+        filename=f"bench-{index}.jpg",
+        headers=Headers({"content-type": "image/jpeg"}),
+    )
+
+
+async def create_report(storage: YandexStorage, request_no: int, photos: int, size: int) -> list[str]:
+    stored = await asyncio.gather(
+        *(
+            storage.upload(
+                photo(size, index),
+                site_id=BENCH_SITE_ID,
+                site_name="Benchmark",
+                report_id=f"bench-{request_no}",
+                report_date=date.today(),
+            )
+            for index in range(photos)
+        )
+    )
+    return [item.url for item in stored]
+
+
+def summary(title: str, samples: list[float]) -> None:
+    samples_ms = sorted(sample * 1000 for sample in samples)
+    p95 = samples_ms[max(0, int(len(samples_ms) * 0.95) - 1)]
+    print(f"{title:<12} mean {statistics.mean(samples_ms):8.1f} ms  p50 {statistics.median(samples_ms):8.1f} ms  p95 {p95:8.1f} ms")
+
+
+async def run(args) -> None:
+    settings = get_settings()
+    if args.construct_only:
+        if not settings.has_storage_credentials:
+            settings = settings.model_copy(update={"yc_s3_access_key_id": "bench", "yc_s3_secret_access_key": "bench"})
+        samples = []
+        for _ in range(args.requests):
+            started = perf_counter()
+            YandexStorage(settings).close()
+            samples.append(perf_counter() - started)
+        summary("construct", samples)
+        return
+
+    uploaded: list[str] = []
+    per_request, shared_samples = [], []
+    for request_no in range(args.requests):
+        started = perf_counter()
+        storage = YandexStorage(settings)
+        uploaded += await create_report(storage, request_no, args.photos, args.size)
+        per_request.append(perf_counter() - started)
+        storage.close()
+
+    shared = YandexStorage(settings)
+    for request_no in range(args.requests):
+        started = perf_counter()
+        uploaded += await create_report(shared, request_no, args.photos, args.size)
+        shared_samples.append(perf_counter() - started)
+
+    print(f"{args.requests} request(s) x {args.photos} photo(s) x {args.size} bytes")
+    summary("per-request", per_request)
+    summary("shared", shared_samples)
+
+    for url in uploaded:
+        await shared.delete(url)
+    shared.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--photos", type=int, default=3)
+    parser.add_argument("--size", type=int, default=100_000, help="bytes per photo")
+    parser.add_argument("--construct-only", action="store_true", help="only time client construction (no network)")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
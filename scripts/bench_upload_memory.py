@@ -0,0 +1,147 @@
+"""Peak memory of concurrent photo uploads: buffered ``put_object`` vs streaming.
+
+Runs offline against a throwaway S3 stub on localhost that discards bodies, so
+only the client-side memory is measured (Python allocations via tracemalloc):
+    python -m scripts.bench_upload_memory
+    python -m scripts.bench_upload_memory --photos 10 --size 12000000
+
+The buffered mode reproduces the old ``content = await file.read()`` +
+``put_object(Body=content)`` path; its peak grows with photos x size. The
+streaming mode is ``YandexStorage.upload``; its peak stays around photos x chunk.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import tracemalloc
+import uuid
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, ".")
+
+from starlette.datastructures import Headers, UploadFile
+
+from app.config import get_settings
+from app.infrastructure.storage import YandexStorage
+
+MIB = 1024 * 1024
+
+
+class DiscardingS3Handler(BaseHTTPRequestHandler):
+    """Just enough of PutObject and the multipart calls for boto3 to succeed."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def _drain(self) -> None:
+        if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            while True:
+                size = int(self.rfile.readline().split(b";")[0], 16)
+                self.rfile.read(size + 2)
+                if size == 0:
+                    break
+            return
+        remaining = int(self.headers.get("Content-Length") or 0)
+        while remaining:
+            remaining -= len(self.rfile.read(min(remaining, MIB)))
+
+    def _reply(self, body: bytes = b"", headers: dict[str, str] | None = None) -> None:
+        self.send_response(200)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_PUT(self) -> None:
+        self._drain()
+        self._reply(headers={"ETag": f'"{uuid.uuid4().hex}"'})
+
+    def do_POST(self) -> None:
+        self._drain()
+        if "uploads" in self.path:
+            body = (
+                "<InitiateMultipartUploadResult><Bucket>b</Bucket><Key>k</Key>"
+                f"<UploadId>{uuid.uuid4().hex}</UploadId></InitiateMultipartUploadResult>"
+            )
+        else:
+            body = '<CompleteMultipartUploadResult><ETag>"done"</ETag></CompleteMultipartUploadResult>'
+        self._reply(body.encode(), {"Content-Type": "application/xml"})
+
+
+def spooled_photo(size: int, index: int) -> UploadFile:
+    # Like Starlette's multipart parser: a spool that rolls over to disk after 1 MiB.
+    spool = tempfile.SpooledTemporaryFile(max_size=MIB)
+    for offset in range(0, size, MIB):
+        spool.write(os.urandom(min(MIB, size - offset)))
+    spool.seek(0)
+    return UploadFile(file=spool, filename=f"photo-{index}.jpg", headers=Headers({"content-type": "image/jpeg"}))
+
+
+async def buffered_upload(storage: YandexStorage, file: UploadFile, index: int) -> None:
+    content = await file.read()
+    await asyncio.to_thread(
+        storage._client.put_object,
+        Bucket=storage._settings.yc_s3_bucket,
+        Key=f"bench/{index}.jpg",
+        Body=content,
+        ContentType=file.content_type,
+    )
+
+
+async def streaming_upload(storage: YandexStorage, file: UploadFile, index: int) -> None:
+    await storage.upload(file, site_id="bench", site_name=None, report_id="bench", report_date=date.today())
+
+
+async def measure(title: str, upload, storage: YandexStorage, photos: int, size: int) -> None:
+    files = [spooled_photo(size, index) for index in range(photos)]
+    tracemalloc.start()
+    await asyncio.gather(*(upload(storage, file, index) for index, file in enumerate(files)))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    for file in files:
+        await file.close()
+    print(f"{title:<10} peak {peak / MIB:8.1f} MiB  ({peak / photos / MIB:6.1f} MiB per upload)")
+
+
+async def run(args) -> None:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), DiscardingS3Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    settings = get_settings().model_copy(
+        update={
+            "yc_s3_endpoint": f"http://127.0.0.1:{server.server_port}",
+            "yc_s3_access_key_id": "bench",
+            "yc_s3_secret_access_key": "bench",
+            "yc_s3_addressing_style": "path",
+            # Only the transfer is measured; variants need the whole photo in memory anyway.
+            "image_variants_enabled": False,
+        }
+    )
+    storage = YandexStorage(settings)
+    print(
+        f"{args.photos} concurrent upload(s) x {args.size / MIB:.1f} MiB, "
+        f"multipart above {settings.yc_s3_multipart_threshold / MIB:.0f} MiB "
+        f"in {settings.yc_s3_multipart_chunksize / MIB:.0f} MiB parts"
+    )
+    await measure("buffered", buffered_upload, storage, args.photos, args.size)
+    await measure("streaming", streaming_upload, storage, args.photos, args.size)
+    storage.close()
+    server.shutdown()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--photos", type=int, default=10)
+    parser.add_argument("--size", type=int, default=12 * 1000 * 1000, help="bytes per photo")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
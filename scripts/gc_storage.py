@@ -0,0 +1,245 @@
+"""Find photo objects no report references (orphans) and delete or quarantine them.
+
+Orphans are left when a create fails after its photos were uploaded, when a
+storage delete fails after the commit, or when a presigned upload is never
+confirmed. The job:
+  1. streams every ``photo_urls`` / ``photo_variants`` value from the database into
+     a compact set of 64-bit key hashes (8 bytes per key);
+  2. streams the bucket listing under ``reports/`` one page at a time (the
+     directory tree of ``LOCAL_STORAGE_DIR`` with ``STORAGE_BACKEND=local``);
+  3. takes objects missing from the set and older than ``--min-age-hours`` as
+     orphans, re-checks them right before each batch, then deletes them or moves
+     them under ``quarantine/``.
+
+An old object can be reused by a new report through content-hash dedup, and reuse
+does not change its last-modified time. The re-check therefore relies on the photo
+key lock of ``ReportRepository.claim_unreferenced_photo_urls``, the same lock a
+request takes before deleting: an upload holds it from the moment it looks for the
+object until its report is committed. Originals are collected only if they can be
+locked and no report references them. Variants are collected only if they can be
+locked and were not rewritten since the listing (an upload that finds its original
+gone renders them again).
+
+    python -m scripts.gc_storage                      # dry run: report only
+    python -m scripts.gc_storage --delete
+    python -m scripts.gc_storage --quarantine --min-age-hours 72
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import sys
+from array import array
+from bisect import bisect_left
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, List
+
+sys.path.insert(0, ".")
+
+from sqlalchemy import select
+
+from app.config import get_settings
+from app.infrastructure.database import AsyncSessionLocal, async_engine
+from app.infrastructure.reports.models import ReportModel
+from app.infrastructure.reports.repository import SqlAlchemyReportRepository
+from app.infrastructure.storage import LocalFileStorage, StoredObject, YandexStorage
+from app.infrastructure.storage.keys import QUARANTINE_PREFIX
+from app.infrastructure.storage.yandex import DELETE_OBJECTS_MAX_KEYS
+
+MIB = 1024 * 1024
+
+Storage = LocalFileStorage | YandexStorage
+
+
+def key_hash(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big")
+
+
+class KeyHashSet:
+    """Membership test over millions of keys at ~8 bytes each.
+
+    Hashes are kept in 256 sorted ``array('Q')`` buckets (by top byte), so sorting
+    never needs a temporary list of the whole set. A hash collision can only make an
+    orphan look referenced, never delete a referenced object.
+    """
+
+    def __init__(self) -> None:
+        self._buckets = [array("Q") for _ in range(256)]
+        self._frozen = False
+
+    def add(self, key: str) -> None:
+        value = key_hash(key)
+        self._buckets[value >> 56].append(value)
+
+    def freeze(self) -> None:
+        self._buckets = [array("Q", sorted(set(bucket))) for bucket in self._buckets]
+        self._frozen = True
+
+    def __contains__(self, key: str) -> bool:
+        assert self._frozen, "call freeze() after the last add()"
+        value = key_hash(key)
+        bucket = self._buckets[value >> 56]
+        index = bisect_left(bucket, value)
+        return index < len(bucket) and bucket[index] == value
+
+    def __len__(self) -> int:
+        return sum(len(bucket) for bucket in self._buckets)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(bucket.buffer_info()[1] * bucket.itemsize for bucket in self._buckets)
+
+
+async def load_referenced_keys(storage: Storage, batch_rows: int) -> KeyHashSet:
+    referenced = KeyHashSet()
+    stmt = select(ReportModel.photo_urls, ReportModel.photo_variants).execution_options(yield_per=batch_rows)
+    async with AsyncSessionLocal() as session:
+        # Server-side cursor: rows arrive in batches instead of one result set.
+        result = await session.stream(stmt)
+        async for photo_urls, photo_variants in result:
+            for url in photo_urls or ():
+                key = storage.key_of(url)
+                if key is not None:
+                    referenced.add(key)
+                    # Variants are derived from the original's key even when not recorded.
+                    for variant in storage.variant_keys(key):
+                        referenced.add(variant)
+            for variants in (photo_variants or {}).values():
+                for url in variants.values():
+                    key = storage.key_of(url)
+                    if key is not None:
+                        referenced.add(key)
+    referenced.freeze()
+    return referenced
+
+
+class Collector:
+    def __init__(self, storage: Storage, *, mode: str) -> None:
+        self.storage = storage
+        self.mode = mode
+        self.scanned = self.scanned_bytes = 0
+        self.young = 0
+        self.orphans = self.orphan_bytes = 0
+        self.rescued = 0
+        self._pending: List[StoredObject] = []
+        # Variants wait until every original is re-checked: a rescued original spares its variants.
+        self._variants: List[StoredObject] = []
+        self._rescued_keys: set[str] = set()
+
+    async def add(self, item: StoredObject) -> None:
+        if self.storage.is_variant_key(item.key):
+            self._variants.append(item)
+            return
+        self._pending.append(item)
+        if len(self._pending) >= DELETE_OBJECTS_MAX_KEYS:
+            await self.flush()
+
+    async def flush(self) -> None:
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        urls = [self.storage.public_url(item.key) for item in batch]
+        async with AsyncSessionLocal() as session:
+            # The locks last until the session ends, after the batch is collected.
+            unused = set(await SqlAlchemyReportRepository(session).claim_unreferenced_photo_urls(urls))
+            orphans = []
+            for item, url in zip(batch, urls):
+                if url in unused:
+                    orphans.append(item)
+                else:
+                    self.rescued += 1
+                    self._rescued_keys.update(self.storage.variant_keys(item.key))
+            await self._collect(orphans)
+
+    async def finish(self) -> None:
+        await self.flush()
+        variants = [item for item in self._variants if item.key not in self._rescued_keys]
+        self.rescued += len(self._variants) - len(variants)
+        for start in range(0, len(variants), DELETE_OBJECTS_MAX_KEYS):
+            await self._flush_variants(variants[start : start + DELETE_OBJECTS_MAX_KEYS])
+
+    async def _flush_variants(self, batch: List[StoredObject]) -> None:
+        urls = [self.storage.public_url(item.key) for item in batch]
+        async with AsyncSessionLocal() as session:
+            locked = set(await SqlAlchemyReportRepository(session).claim_unreferenced_photo_urls(urls))
+            candidates = [item for item, url in zip(batch, urls) if url in locked]
+            current = await asyncio.gather(*(self.storage.last_modified(item.key) for item in candidates))
+            orphans = [item for item, modified in zip(candidates, current) if modified == item.last_modified]
+            self.rescued += len(batch) - len(orphans)
+            await self._collect(orphans)
+
+    async def _collect(self, items: List[StoredObject]) -> None:
+        if not items:
+            return
+        keys = [item.key for item in items]
+        if self.mode == "delete":
+            await self.storage.delete_keys(keys)
+        elif self.mode == "quarantine":
+            await self.storage.quarantine_keys(keys)
+        else:
+            for key in keys[:5]:
+                print(f"  orphan {key}")
+        self.orphans += len(items)
+        self.orphan_bytes += sum(item.size for item in items)
+
+
+async def pages(storage: Storage, prefix: str) -> AsyncIterator[List[StoredObject]]:
+    # The listing is paginated lazily; fetch each page in a thread so the loop stays free.
+    iterator = storage.iter_objects(prefix)
+    while (page := await asyncio.to_thread(next, iterator, None)) is not None:
+        yield page
+
+
+async def run(args) -> None:
+    settings = get_settings()
+    backend = LocalFileStorage if settings.storage_backend == "local" else YandexStorage
+    storage = backend(settings.model_copy(update={"image_variants_enabled": False}))
+    prefix = f"{settings.storage_key_prefix()}/"
+    started_at = datetime.now(timezone.utc)
+    cutoff = started_at - timedelta(hours=args.min_age_hours)
+
+    referenced = await load_referenced_keys(storage, args.batch_rows)
+    print(f"{len(referenced)} referenced key(s) loaded into {referenced.nbytes / MIB:.1f} MiB")
+
+    mode = "delete" if args.delete else "quarantine" if args.quarantine else "dry-run"
+    collector = Collector(storage, mode=mode)
+    async for page in pages(storage, prefix):
+        for item in page:
+            collector.scanned += 1
+            collector.scanned_bytes += item.size
+            if item.key in referenced:
+                continue
+            # Uploads in flight (not committed yet, presigned but not confirmed) are young.
+            if item.last_modified > cutoff:
+                collector.young += 1
+                continue
+            await collector.add(item)
+    await collector.finish()
+    storage.close()
+    await async_engine.dispose()
+
+    verb = {"delete": "deleted", "quarantine": f"moved to {QUARANTINE_PREFIX}", "dry-run": "would be reclaimed"}[mode]
+    print(
+        f"scanned {collector.scanned} object(s), {collector.scanned_bytes} bytes "
+        f"({collector.scanned_bytes / MIB:.1f} MiB) under {prefix}\n"
+        f"orphans: {collector.orphans} object(s), {collector.orphan_bytes} bytes "
+        f"({collector.orphan_bytes / MIB:.1f} MiB) {verb}\n"
+        f"skipped: {collector.young} younger than {args.min_age_hours}h, "
+        f"{collector.rescued} referenced or in use again during the run\n"
+        f"took {(datetime.now(timezone.utc) - started_at).total_seconds():.1f}s"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    action = parser.add_mutually_exclusive_group()
+    action.add_argument("--delete", action="store_true", help="delete orphans")
+    action.add_argument("--quarantine", action="store_true", help=f"move orphans under {QUARANTINE_PREFIX}")
+    parser.add_argument("--min-age-hours", type=float, default=24.0, help="never touch objects newer than this")
+    parser.add_argument("--batch-rows", type=int, default=5000, help="report rows fetched per cursor batch")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""Security boundaries of the local storage backend: keys, signed PUT links and the PUT body cap.
+
+Needs no database: the settings are built here and no session is ever opened.
+
+    python -m pytest tests
+"""
+from __future__ import annotations
+
+import os
+from datetime import date
+from unittest import mock
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+IMPORT_ENV = {"DATABASE_URL": "postgresql+psycopg://localhost/unused", "JWT_SECRET": "test"}
+
+# Importing the app builds the (unconnected) engine from the settings; give it a URL without
+# leaving DATABASE_URL behind, so the database tests still skip when there is none.
+with mock.patch.dict(os.environ, {name: value for name, value in IMPORT_ENV.items() if name not in os.environ}):
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from app.api.routers import files
+    from app.config import Settings
+    from app.infrastructure.storage import LocalFileStorage
+    from app.infrastructure.storage import local
+
+SIZE = 100
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+@pytest.fixture
+def storage(tmp_path):
+    settings = Settings(
+        **IMPORT_ENV,
+        STORAGE_BACKEND="local",
+        LOCAL_STORAGE_DIR=tmp_path / "store",
+        LOCAL_STORAGE_PUBLIC_URL="http://testserver/files",
+        IMAGE_VARIANTS_ENABLED=False,
+    )
+    storage = LocalFileStorage(settings)
+    yield storage
+    storage.close()
+
+
+@pytest.fixture
+def client(storage):
+    app = FastAPI()
+    app.include_router(files.router)
+    app.state.storage = storage
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+async def upload(storage):
+    """A signed PUT link for ``SIZE`` bytes, with its key and query parameters."""
+
+    presigned = await storage.presign_upload(
+        filename="photo.jpg",
+        content_type="image/jpeg",
+        size=SIZE,
+        site_id="site",
+        site_name="Site",
+        report_id="0" * 32,
+        report_date=date(2026, 1, 1),
+    )
+    url = urlsplit(presigned.url)
+    query = {name: values[0] for name, values in parse_qs(url.query).items()}
+    return presigned.key, url.path, query
+
+
+def _partial_files(tmp_path) -> list:
+    return os.listdir(tmp_path / "store" / local.TMP_DIR)
+
+
+@pytest.mark.parametrize(
+    "key",
+    [
+        "",
+        "..",
+        "../outside.jpg",
+        "reports/../../outside.jpg",
+        ".tmp/partial",
+        "reports//photo.jpg",
+        "reports/./photo.jpg",
+        "reports/",
+    ],
+)
+def test_path_of_rejects_keys_outside_the_storage(storage, key: str) -> None:
+    assert storage.path_of(key) is None
+
+
+def test_path_of_accepts_report_keys(storage) -> None:
+    assert storage.path_of("reports/site/photo.jpg").name == "photo.jpg"
+
+
+@pytest.mark.anyio
+async def test_verify_upload_accepts_only_the_signed_link(storage, upload) -> None:
+    key, _, query = upload
+    size, expires, signature = int(query["size"]), int(query["expires"]), query["signature"]
+
+    assert size == SIZE
+    assert storage.verify_upload(key, size=size, expires=expires, signature=signature)
+    assert not storage.verify_upload(key, size=size + 1, expires=expires, signature=signature)
+    assert not storage.verify_upload(key, size=size, expires=expires + 1, signature=signature)
+    assert not storage.verify_upload(f"{key}x", size=size, expires=expires, signature=signature)
+    assert not storage.verify_upload(key, size=size, expires=expires, signature=f"0{signature[1:]}")
+
+
+@pytest.mark.anyio
+async def test_verify_upload_rejects_expired_links(storage, upload, monkeypatch) -> None:
+    key, _, query = upload
+    monkeypatch.setattr(local.time, "time", lambda: int(query["expires"]) + 1)
+
+    assert not storage.verify_upload(key, size=SIZE, expires=int(query["expires"]), signature=query["signature"])
+
+
+@pytest.mark.anyio
+async def test_put_stores_the_signed_size(storage, client, upload, tmp_path) -> None:
+    key, path, query = upload
+
+    assert client.put(path, params=query, content=b"x" * SIZE).status_code == 200
+    assert client.get(path).content == b"x" * SIZE
+    assert _partial_files(tmp_path) == []
+
+
+@pytest.mark.anyio
+async def test_put_rejects_tampered_links(storage, client, upload) -> None:
+    key, path, query = upload
+
+    for tampered in ({**query, "size": str(SIZE * 10)}, {**query, "signature": "0" * 64}):
+        assert client.put(path, params=tampered, content=b"x").status_code == 403
+    assert client.put("/files/.tmp/partial", params=query, content=b"x").status_code == 403
+    assert storage.path_of(key).exists() is False
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    ("body", "headers"),
+    [
+        (b"x" * (SIZE + 1), {}),
+        # Chunked: no Content-Length, so the cap is only enforced while streaming.
+        (iter([b"x" * (SIZE // 2)] * 3), {}),
+        # Understated Content-Length.
+        (b"x" * (SIZE * 2), {"Content-Length": str(SIZE)}),
+    ],
+    ids=["declared", "chunked", "understated"],
+)
+async def test_put_refuses_bodies_over_the_signed_size(storage, client, upload, tmp_path, body, headers) -> None:
+    key, path, query = upload
+
+    response = client.put(path, params=query, content=body, headers=headers)
+
+    assert response.status_code == 413
+    assert storage.path_of(key).exists() is False
+    assert _partial_files(tmp_path) == []
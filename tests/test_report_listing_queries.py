@@ -0,0 +1,130 @@
+"""Report listings cost the same number of SQL statements whether a page holds one report or many.
+
+Runs against the migrated Postgres database in ``DATABASE_URL``; everything the
+tests insert is rolled back.
+
+    DATABASE_URL=postgresql+psycopg://... python -m pytest tests
+"""
+from __future__ import annotations
+
+import os
+import uuid
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+if not os.getenv("DATABASE_URL"):
+    pytest.skip("needs a migrated Postgres database in DATABASE_URL", allow_module_level=True)
+os.environ.setdefault("JWT_SECRET", "test")
+
+from sqlalchemy import event
+
+from app.domain.entities import Report, ReportWorkItem
+from app.infrastructure.database import AsyncSessionLocal, async_engine
+from app.infrastructure.reports.repository import SqlAlchemyReportRepository
+from app.infrastructure.sites.models import SiteModel
+from app.infrastructure.users.models import UserModel
+from app.infrastructure.work_types.models import WorkTypeModel
+
+MANY = 30
+WORK_ITEMS_PER_REPORT = 3
+
+LISTINGS = {
+    "list": lambda repository, site_id: repository.list(site_id=site_id, limit=MANY + 1),
+    "list with fields": lambda repository, site_id: repository.list(
+        site_id=site_id, limit=MANY + 1, fields=frozenset({"id", "work_items"})
+    ),
+    "history": lambda repository, site_id: repository.list_history_by_site(site_id=site_id, limit=MANY + 1),
+}
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+@pytest.fixture
+async def session():
+    async with AsyncSessionLocal() as session:
+        try:
+            yield session
+        finally:
+            await session.rollback()
+    await async_engine.dispose()
+
+
+def _unique() -> str:
+    return uuid.uuid4().hex
+
+
+async def _site_with_reports(session, count: int) -> str:
+    user_id, site_id, work_type_id = _unique(), _unique(), _unique()
+    session.add(UserModel(id=user_id, name="Test", phone=f"+7{user_id[:10]}", hashed_password="-"))
+    session.add(WorkTypeModel(id=work_type_id, name=f"Test {work_type_id}"))
+    session.add(SiteModel(id=site_id, name="Test site", address="-"))
+    await session.flush()
+
+    created_at = datetime.now(timezone.utc)
+    reports = []
+    for index in range(count):
+        report_id = _unique()
+        reports.append(
+            Report(
+                id=report_id,
+                user_id=user_id,
+                site_id=site_id,
+                work_type_id=work_type_id,
+                report_date=date.today(),
+                description="",
+                people="",
+                volume="",
+                machines="",
+                created_at=created_at - timedelta(minutes=index),
+                work_items=[
+                    ReportWorkItem(
+                        id=f"{report_id}-{position}",
+                        work_type_id=work_type_id,
+                        description="",
+                        people="",
+                        volume="",
+                        machines="",
+                        sort_order=position,
+                    )
+                    for position in range(WORK_ITEMS_PER_REPORT)
+                ],
+            )
+        )
+    await SqlAlchemyReportRepository(session).add_many(reports)
+    return site_id
+
+
+async def _count_statements(session, listing, site_id: str) -> tuple[int, list]:
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany) -> None:
+        statements.append(statement)
+
+    # A fresh repository, so nothing is served from an earlier call.
+    repository = SqlAlchemyReportRepository(session)
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        rows = list(await listing(repository, site_id))
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+    return len(statements), rows
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("name", LISTINGS)
+async def test_listing_statement_count_does_not_grow_with_rows(session, name: str) -> None:
+    listing = LISTINGS[name]
+    one_site = await _site_with_reports(session, 1)
+    many_site = await _site_with_reports(session, MANY)
+
+    one_count, one_rows = await _count_statements(session, listing, one_site)
+    many_count, many_rows = await _count_statements(session, listing, many_site)
+
+    assert len(one_rows) == 1
+    assert len(many_rows) == MANY
+    assert all(len(row.work_items) == WORK_ITEMS_PER_REPORT for row in many_rows)
+    assert many_count == one_count